@@ -2,10 +2,20 @@ import pygame
 import math
 import random
 import time
+import json
+import struct
+import heapq
+from collections import OrderedDict, deque
+from contextlib import nullcontext
 from enum import Enum
 from dataclasses import dataclass
 from typing import List, Tuple
 
+try:
+    import numpy as np
+except ImportError:  # Le moteur vectorisé est optionnel
+    np = None
+
 # Initialisation
 pygame.init()
 
@@ -14,6 +24,46 @@ SCREEN_WIDTH = 1080
 SCREEN_HEIGHT = 1920
 FPS = 60
 
+# Simulation à pas fixe (indépendante de la fréquence d'affichage)
+SIM_HZ = 60
+MAX_CATCH_UP_STEPS = 5
+# Les effets multiplicatifs et probabilités "par tick" sont calibrés pour 60 ticks/s
+REFERENCE_HZ = 60
+
+# Murs: distance de contact en plus du rayon, rebonds max résolus par tick
+WALL_MARGIN = 2
+MAX_WALL_BOUNCES = 4
+
+# Rayon des balles tiré entre ces bornes (l'index des bonus en dépend)
+MIN_BALL_RADIUS = 15
+MAX_BALL_RADIUS = 25
+# Chocs entre balles: 1.0 = parfaitement élastiques (masse proportionnelle à la surface, radius²)
+BALL_RESTITUTION = 1.0
+
+# Événements planifiés: ordre d'exécution à l'intérieur d'un tick (celui de l'ancienne boucle par tick)
+PRIORITY_DISRUPTION = 0
+PRIORITY_BONUS_SPAWN = 1
+PRIORITY_BONUS_EXPIRY = 2
+PRIORITY_DISRUPTION_EXPIRY = 3
+PRIORITY_BALL_TIMER = 4
+
+# Morphing de l'arène: fondu entre l'ancienne et la nouvelle forme (s), paliers pour le rendu par zones
+MORPH_DURATION = 0.6
+MORPH_STEPS = 12
+
+# Niveaux de détail, du plus beau au plus léger (purement visuels: la simulation n'en dépend pas)
+# trail_rate: part des traînées émises, burst_cap: particules max par gerbe,
+# glow: lueurs des balles ('full', 'coarse' = sprites quantifiés plus grossièrement, 'off'),
+# point_size: les particules affichées à cette taille ou moins deviennent des points dessinés en bloc
+QUALITY_LEVELS = (
+    {'trail_rate': 1.0, 'burst_cap': None, 'glow': 'full', 'point_size': 0},
+    {'trail_rate': 0.5, 'burst_cap': 20, 'glow': 'coarse', 'point_size': 2},
+    {'trail_rate': 0.25, 'burst_cap': 10, 'glow': 'off', 'point_size': 4},
+    {'trail_rate': 0.0, 'burst_cap': 5, 'glow': 'off', 'point_size': 8},
+)
+GLOW_SIZE_STEP = 4
+GLOW_ALPHA_STEP = 32
+
 class GameState(Enum):
     MENU = "menu"
     PLAYING = "playing"
@@ -78,26 +128,835 @@ DAMAGE_MULTIPLIERS = {
     BallType.POISON: {BallType.FIRE: 2.5, BallType.LIGHTNING: 0.4, BallType.ICE: 1.2, BallType.METAL: 0.7}
 }
 
-class Arena:
+# Quantification des sprites mis en cache
+SPRITE_COLOR_STEP = 8
+SPRITE_ALPHA_STEP = 16
+
+class SurfaceCache:
+    """Cache LRU de surfaces pré-rendues, borné en mémoire, avec compteurs de succès/échecs"""
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+    def get(self, key, render):
+        """Retourne la surface associée à key, créée par render() si absente"""
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = render()
+        self.entries[key] = surface
+        self.bytes += surface.get_pitch() * surface.get_height()
+        
+        # Éviction des entrées les moins récemment utilisées
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= old.get_pitch() * old.get_height()
+            self.evictions += 1
+        return surface
+    
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+    
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.bytes
+        }
+
+sprite_cache = SurfaceCache(48 * 1024 * 1024)
+text_cache = SurfaceCache(16 * 1024 * 1024)
+fonts = {}
+
+def quantize(value, step):
+    return max(0, min(255, (int(value) + step // 2) // step * step))
+
+def per_tick_factor(factor, dt):
+    """Facteur prévu pour un tick de référence, ramené à un pas dt"""
+    return factor ** (dt * REFERENCE_HZ)
+
+def per_tick_chance(chance, dt):
+    """Probabilité prévue pour un tick de référence, ramenée à un pas dt"""
+    return 1 - (1 - chance) ** (dt * REFERENCE_HZ)
+
+def get_font(size, name=None):
+    """Police partagée par (nom, taille), créée une seule fois"""
+    font = fonts.get((name, size))
+    if font is None:
+        font = fonts[(name, size)] = pygame.font.Font(name, size)
+    return font
+
+def render_text(text, size, color, name=None):
+    """Texte pré-rendu, clé (police, taille, texte, couleur)"""
+    color = tuple(color)
+    return text_cache.get((name, size, text, color), lambda: get_font(size, name).render(text, True, color))
+
+def render_pulsed(text, size, color, pulse):
+    """Texte mis à l'échelle pour les effets de pulsation (échelle arrondie au centième)"""
+    pulse = round(pulse, 2)
+    def render():
+        surface = render_text(text, size, color)
+        return pygame.transform.scale(surface, (int(surface.get_width() * pulse),
+                                                int(surface.get_height() * pulse)))
+    return text_cache.get(('pulse', size, text, tuple(color), pulse), render)
+
+def blit_glyphs(screen, text, size, color, pos):
+    """Texte qui change à chaque trame (compte à rebours): un glyphe en cache par caractère"""
+    x, y = pos
+    for char in text:
+        glyph = render_text(char, size, color)
+        screen.blit(glyph, (x, y))
+        x += glyph.get_width()
+    return x
+
+def highlight_panel(width, height):
+    """Fond lumineux semi-transparent des options sélectionnées"""
+    def render():
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(panel, (50, 100, 255, 100), (0, 0, width, height))
+        return panel
+    return text_cache.get(('highlight', width, height), render)
+
+def circle_sprite(rgb, radius, alpha):
+    """Disque semi-transparent pré-rendu (clé quantifiée: couleur, taille, alpha)"""
+    key = (
+        quantize(rgb[0], SPRITE_COLOR_STEP),
+        quantize(rgb[1], SPRITE_COLOR_STEP),
+        quantize(rgb[2], SPRITE_COLOR_STEP),
+        radius,
+        quantize(alpha, SPRITE_ALPHA_STEP)
+    )
+    return sprite_cache.get(key, lambda: render_circle_sprite(key))
+
+def render_circle_sprite(key):
+    r, g, b, radius, alpha = key
+    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (r, g, b, alpha), (radius, radius), radius)
+    return surface
+
+class GradientBackground:
+    """Fond dégradé vertical avec vague animée, pré-calculé.
+    
+    Le dégradé ne varie qu'en y: chaque phase de la vague est une tuile étroite
+    pleine hauteur, répétée en largeur par quelques blits. Les tuiles ne sont
+    recalculées que si la couleur de base change au-delà du seuil.
+    """
+    TILE_WIDTH = 90
+    
+    def __init__(self, base_color, strip_height, time_speed, wave_scale,
+                 phase_frames=16, threshold=3):
+        self.strip_height = strip_height
+        self.time_speed = time_speed
+        self.wave_scale = wave_scale
+        self.phase_frames = phase_frames
+        self.threshold = threshold
+        self.base_color = None
+        self.frames = []
+        self.rebuilds = 0
+        self.set_color(base_color)
+        
+    def set_color(self, color):
+        """Change la couleur de base; recalcul seulement au-delà du seuil"""
+        if self.base_color is not None and max(
+                abs(color.r - self.base_color.r),
+                abs(color.g - self.base_color.g),
+                abs(color.b - self.base_color.b)) <= self.threshold:
+            return
+        self.base_color = Color(color.r, color.g, color.b)
+        self.rebuild()
+    
+    def rebuild(self):
+        """Invalide les phases: chacune est recalculée au moment où elle est affichée"""
+        self.frames = [None] * self.phase_frames
+        self.rebuilds += 1
+    
+    def render_frame(self, frame):
+        base = self.base_color
+        phase = 2 * math.pi * frame / self.phase_frames
+        column = pygame.Surface((1, SCREEN_HEIGHT))
+        for y in range(0, SCREEN_HEIGHT, self.strip_height):
+            gradient_factor = y / SCREEN_HEIGHT
+            wave = math.sin(phase + y * self.wave_scale) * 0.1
+            
+            color_r = max(0, min(255, int(base.r * (1 - gradient_factor * 0.4 + wave))))
+            color_g = max(0, min(255, int(base.g * (1 - gradient_factor * 0.3 + wave))))
+            color_b = max(0, min(255, int(base.b * (1 + gradient_factor * 0.6 + wave))))
+            column.fill((color_r, color_g, color_b), (0, y, 1, self.strip_height))
+        return pygame.transform.scale(column, (self.TILE_WIDTH, SCREEN_HEIGHT))
+    
+    def draw(self, screen, t):
+        phase = (t * self.time_speed) % (2 * math.pi)
+        frame = int(phase / (2 * math.pi) * self.phase_frames) % self.phase_frames
+        tile = self.frames[frame]
+        if tile is None:
+            tile = self.frames[frame] = self.render_frame(frame)
+        screen.blits([(tile, (x, 0)) for x in range(0, screen.get_width(), self.TILE_WIDTH)], False)
+
+class DirtyRenderer:
+    """Rendu par zones modifiées sur une grille de tuiles.
+    
+    Le fond (figé sur une phase de la vague) et l'arène forment une couche statique
+    en cache. À chaque trame, seules les tuiles touchées par les objets mobiles
+    (trame courante et précédente) et par les couches d'interface qui ont changé
+    sont restaurées depuis cette couche, redessinées puis envoyées à l'écran avec
+    display.update(). Au-delà de FULL_THRESHOLD de l'écran, retour à une trame complète,
+    décidé pendant le marquage des objets pour ne pas payer les tuiles d'une grosse scène.
+    """
+    TILE = 60
+    FULL_THRESHOLD = 0.45
+    
+    def __init__(self, width, height):
+        self.cols = (width + self.TILE - 1) // self.TILE
+        self.rows = (height + self.TILE - 1) // self.TILE
+        self.screen_area = width * height
+        self.full_tiles = self.FULL_THRESHOLD * self.cols * self.rows
+        self.static = None
+        self.static_key = None
+        self.previous = set()  # tuiles des objets dessinés à la trame précédente (None: inconnues)
+        self.layers = {}       # nom -> (clé, rectangle) des couches d'interface affichées
+        self.needs_full = True
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.pushed_area = 0
+    
+    def invalidate(self):
+        """Le contenu de l'écran est inconnu (autre écran affiché): prochaine trame complète"""
+        self.needs_full = True
+        self.layers = {}
+    
+    def set_static(self, key, build):
+        """Reconstruit la couche statique si sa clé a changé (trame complète dans ce cas)"""
+        if key != self.static_key:
+            self.static = build()
+            self.static_key = key
+            self.needs_full = True
+    
+    def mark_rect(self, tiles, rect):
+        tile = self.TILE
+        col0 = max(0, rect.left // tile)
+        col1 = min(self.cols - 1, (rect.right - 1) // tile)
+        row0 = max(0, rect.top // tile)
+        row1 = min(self.rows - 1, (rect.bottom - 1) // tile)
+        for row in range(row0, row1 + 1):
+            base = row * self.cols
+            tiles.update(range(base + col0, base + col1 + 1))
+    
+    def object_tiles(self, particles, bonuses, balls, alpha):
+        """Tuiles des objets mobiles, ou None dès qu'elles dépassent FULL_THRESHOLD de l'écran"""
+        tiles = set(particles.dirty_tiles(self.TILE, self.cols, self.rows))
+        if len(tiles) > self.full_tiles:
+            return None
+        for bonus in bonuses:
+            if not bonus.collected:
+                self.mark_rect(tiles, bonus.bounds())
+        for ball in balls:
+            self.mark_rect(tiles, ball.bounds(alpha))
+            if len(tiles) > self.full_tiles:
+                return None
+        return tiles
+    
+    def intersects(self, tiles, rect):
+        tile = self.TILE
+        col0 = max(0, rect.left // tile)
+        col1 = min(self.cols - 1, (rect.right - 1) // tile)
+        row0 = max(0, rect.top // tile)
+        row1 = min(self.rows - 1, (rect.bottom - 1) // tile)
+        for row in range(row0, row1 + 1):
+            base = row * self.cols
+            for index in range(base + col0, base + col1 + 1):
+                if index in tiles:
+                    return True
+        return False
+    
+    def rects(self, tiles):
+        """Tuiles fusionnées en rectangles: segments par ligne, prolongés vers le bas si identiques"""
+        tile, cols = self.TILE, self.cols
+        open_runs = {}
+        result = []
+        for row in range(self.rows):
+            base = row * cols
+            runs = {}
+            col = 0
+            while col < cols:
+                if base + col in tiles:
+                    start = col
+                    while col < cols and base + col in tiles:
+                        col += 1
+                    span = (start, col)
+                    rect = open_runs.get(span)
+                    if rect is not None:
+                        rect.height += tile
+                    else:
+                        rect = pygame.Rect(start * tile, row * tile, (col - start) * tile, tile)
+                        result.append(rect)
+                    runs[span] = rect
+                col += 1
+            open_runs = runs
+        return result
+    
+    def select_layers(self, tiles, layers):
+        """Marque les couches d'interface modifiées et retourne les noms de celles à redessiner.
+        
+        Une couche changée (clé ou position) salit son ancienne et sa nouvelle zone;
+        une couche touchée par une zone sale est redessinée entière (et salit toute sa zone).
+        Sans tuiles (trame complète), les couches sont seulement mémorisées.
+        """
+        current = {}
+        for name, key, surface, position in layers:
+            current[name] = (key, surface.get_rect(topleft=position))
+        if tiles is None:
+            self.layers = current
+            return set()
+        for name, (key, rect) in current.items():
+            old = self.layers.get(name)
+            if old != (key, rect):
+                if old:
+                    self.mark_rect(tiles, old[1])
+                self.mark_rect(tiles, rect)
+        for name, (_, rect) in self.layers.items():
+            if name not in current:
+                self.mark_rect(tiles, rect)
+        self.layers = current
+        
+        redraw = set()
+        changed = True
+        while changed:
+            changed = False
+            for name, (_, rect) in current.items():
+                if name not in redraw and self.intersects(tiles, rect):
+                    self.mark_rect(tiles, rect)
+                    redraw.add(name)
+                    changed = True
+        return redraw
+    
+    def prepare(self, screen, tiles):
+        """Remet la couche statique sous les zones sales et retourne leurs rectangles.
+        
+        Trame complète (None) si l'écran est à redessiner entièrement ou si trop de tuiles ont
+        changé (tiles vaut None quand le marquage s'est arrêté en route).
+        """
+        if self.needs_full or tiles is None or len(tiles) > self.full_tiles:
+            screen.blit(self.static, (0, 0))
+            self.needs_full = False
+            self.full_frames += 1
+            self.pushed_area += self.screen_area
+            return None
+        rects = self.rects(tiles)
+        screen.blits([(self.static, rect, rect) for rect in rects], False)
+        self.partial_frames += 1
+        self.pushed_area += sum(rect.width * rect.height for rect in rects)
+        return rects
+    
+    def stats(self):
+        frames = self.full_frames + self.partial_frames
+        return {
+            'full_frames': self.full_frames,
+            'partial_frames': self.partial_frames,
+            'pushed_ratio': self.pushed_area / (frames * self.screen_area) if frames else 0.0
+        }
+
+class ProfilerSection:
+    """Chronomètre d'une section; le temps s'ajoute à la trame en cours (ms)"""
+    __slots__ = ('frame', 'name', 'start')
+    
+    def __init__(self, frame, name):
+        self.frame = frame
+        self.name = name
+        
+    def __enter__(self):
+        self.start = time.perf_counter()
+        
+    def __exit__(self, *exc):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        self.frame[self.name] = self.frame.get(self.name, 0.0) + elapsed
+
+class FrameProfiler:
+    """Temps par section et par trame, percentiles glissants et nombre d'entités.
+    
+    Désactivé (par défaut), section() renvoie un contexte vide partagé: le coût se
+    limite à un test et un appel. Les trames récentes restent en mémoire pour le
+    panneau à l'écran et l'export CSV/JSON; les statistiques enregistrées par
+    add_report (caches...) sont ajoutées au JSON.
+    """
+    NULL_SECTION = nullcontext()
+    COUNTERS = ('balls', 'particles', 'bonuses', 'disruptions', 'quality')
+    
+    def __init__(self, window=600):
+        self.enabled = False
+        self.window = window
+        self.history = deque(maxlen=window)
+        self.sections = []  # ordre de première apparition, pour l'affichage
+        self.current = {}
+        self.frame_start = None
+        self.overlay = None
+        self.overlay_age = 0
+        self.reports = {}  # nom -> fonction retournant un dict de statistiques
+        
+    def add_report(self, name, stats):
+        self.reports[name] = stats
+        
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.history.clear()
+        self.current = {}
+        self.frame_start = None
+        self.overlay = None
+    
+    def section(self, name):
+        if not self.enabled:
+            return self.NULL_SECTION
+        if name not in self.current and name not in self.sections:
+            self.sections.append(name)
+        return ProfilerSection(self.current, name)
+    
+    def end_frame(self, **counts):
+        """Clôt la trame: temps des sections et compteurs d'entités"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            if 'frame' not in self.sections:
+                self.sections.insert(0, 'frame')
+            self.current['frame'] = (now - self.frame_start) * 1000
+            self.current.update(counts)
+            self.history.append(self.current)
+        self.frame_start = now
+        self.current = {}
+        
+    def percentiles(self, name):
+        values = sorted(frame.get(name, 0.0) for frame in self.history)
+        if not values:
+            return 0.0, 0.0, 0.0
+        last = len(values) - 1
+        return tuple(values[round(last * q)] for q in (0.5, 0.95, 0.99))
+    
+    def summary(self):
+        return {
+            'frames': len(self.history),
+            'sections': {name: dict(zip(('p50', 'p95', 'p99'), self.percentiles(name)))
+                         for name in self.sections},
+            'counts': {name: dict(zip(('p50', 'p95', 'p99'), self.percentiles(name)))
+                       for name in self.COUNTERS},
+            'reports': {name: stats() for name, stats in self.reports.items()}
+        }
+    
+    def dump(self, prefix):
+        """Écrit les trames brutes (prefix.csv) et les percentiles (prefix.json)"""
+        columns = self.sections + list(self.COUNTERS)
+        with open(prefix + ".csv", 'w') as f:
+            f.write("index," + ",".join(columns) + "\n")
+            for index, frame in enumerate(self.history):
+                values = (frame.get(name, 0) for name in columns)
+                f.write(f"{index}," + ",".join(f"{value:.4f}" if isinstance(value, float) else str(value)
+                                             for value in values) + "\n")
+        with open(prefix + ".json", 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        
+    def overlay_layer(self):
+        """Panneau des percentiles et sa position (rafraîchi deux fois par seconde environ), None si désactivé"""
+        if not self.enabled:
+            return None
+        self.overlay_age -= 1
+        if self.overlay is None or self.overlay_age <= 0:
+            self.overlay = self.render_overlay(get_font(30))
+            self.overlay_age = 30
+        return self.overlay, (20, SCREEN_HEIGHT - self.overlay.get_height() - 20)
+    
+    def draw(self, screen):
+        layer = self.overlay_layer()
+        if layer:
+            screen.blit(*layer)
+    
+    def render_overlay(self, font):
+        # Une cellule par valeur: colonnes alignées même avec une police proportionnelle
+        rows = [("section", "p50", "p95", "p99 ms")]
+        for name in self.sections:
+            rows.append((name,) + tuple(f"{value:.2f}" for value in self.percentiles(name)))
+        rendered = [[font.render(cell, True, (200, 255, 200)) for cell in row] for row in rows]
+        
+        name_width = max(row[0].get_width() for row in rendered) + 20
+        column_width = max(cell.get_width() for row in rendered for cell in row[1:]) + 20
+        line_height = font.get_linesize()
+        counts = None
+        if self.history:
+            latest = self.history[-1]
+            counts = font.render("  ".join(f"{name}: {latest.get(name, 0)}" for name in self.COUNTERS),
+                                 True, (255, 255, 150))
+        
+        width = max(name_width + 3 * column_width, counts.get_width() if counts else 0) + 20
+        height = line_height * (len(rows) + (1 if counts else 0)) + 20
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        for i, row in enumerate(rendered):
+            y = 10 + i * line_height
+            panel.blit(row[0], (10, y))
+            for j, cell in enumerate(row[1:]):
+                right = 10 + name_width + (j + 1) * column_width - 20
+                panel.blit(cell, (right - cell.get_width(), y))
+        if counts:
+            panel.blit(counts, (10, 10 + len(rows) * line_height))
+        return panel
+
+class QualityGovernor:
+    """Choisit le niveau de détail (QUALITY_LEVELS) d'après le temps de calcul mesuré des trames.
+    
+    Moyenne glissante exponentielle, deux seuils distincts et des durées de maintien
+    asymétriques: on dégrade vite quand le budget est dépassé, on ne rétablit qu'après
+    une longue marge. Si la qualité rétablie fait aussitôt redéborder, le maintien
+    avant le prochain rétablissement double (jusqu'à max_hold): pas de clignotement.
+    """
+    def __init__(self, budget_ms=1000 / FPS, degrade_above=0.9, restore_below=0.6,
+                 degrade_frames=15, restore_frames=120, max_hold=8, smoothing=0.1):
+        self.enabled = True
+        self.budget_ms = budget_ms
+        self.degrade_above = degrade_above
+        self.restore_below = restore_below
+        self.degrade_frames = degrade_frames
+        self.restore_frames = restore_frames
+        self.max_hold = max_hold
+        self.smoothing = smoothing
+        self.reset()
+    
+    def reset(self):
+        self.level = 0
+        self.average = None
+        self.over = 0
+        self.under = 0
+        self.hold = 1
+        self.since_restore = None
+        self.changes = 0
+    
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.reset()
+    
+    @property
+    def settings(self):
+        return QUALITY_LEVELS[self.level]
+    
+    def observe(self, work_ms):
+        """Prend en compte le temps d'une trame (ms) et retourne les réglages à appliquer"""
+        if not self.enabled:
+            return self.settings
+        if self.average is None:
+            self.average = work_ms
+        else:
+            self.average += (work_ms - self.average) * self.smoothing
+        if self.since_restore is not None:
+            self.since_restore += 1
+        
+        if self.average > self.budget_ms * self.degrade_above:
+            self.over += 1
+            self.under = 0
+        elif self.average < self.budget_ms * self.restore_below:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = 0
+            self.under = 0
+        
+        if self.over >= self.degrade_frames and self.level < len(QUALITY_LEVELS) - 1:
+            # Rechute juste après un rétablissement: attendre plus longtemps la prochaine fois
+            if self.since_restore is not None and self.since_restore < self.restore_frames * self.hold:
+                self.hold = min(self.max_hold, self.hold * 2)
+            self.level += 1
+            self.over = 0
+            self.since_restore = None
+            self.changes += 1
+        elif self.under >= self.restore_frames * self.hold and self.level > 0:
+            self.level -= 1
+            self.under = 0
+            self.since_restore = 0
+            self.changes += 1
+        elif self.since_restore is not None and self.since_restore >= self.restore_frames * self.hold * 4:
+            # Longtemps stable après un rétablissement: maintien normal
+            self.hold = 1
+            self.since_restore = None
+        return self.settings
+
+class SimulationClock:
+    """Horloge de simulation, avancée par dt au lieu de lire l'heure système"""
+    def __init__(self):
+        self.now = 0.0
+        
+    def advance(self, dt):
+        self.now += dt
+        
+    def reset(self):
+        self.now = 0.0
+
+class EventScheduler:
+    """File de priorité (heapq) d'événements datés en temps de simulation.
+    
+    Un tick ne traite que les événements échus: le coût suit le nombre d'événements,
+    pas le nombre d'entités x minuteries. Les événements échus d'un même tick
+    s'exécutent par (priorité, temps, ordre d'insertion), donc de façon déterministe.
+    Avec la tolérance, un événement peut partir un tick trop tôt à cause des arrondis:
+    les gestionnaires revérifient leur condition exacte et se replanifient sinon.
+    """
+    def __init__(self, tolerance=1e-9):
+        self.tolerance = tolerance
+        self.queue = []
+        self.sequence = 0
+        self.fired = 0
+    
+    def __len__(self):
+        return len(self.queue)
+    
+    def clear(self):
+        self.queue = []
+        self.sequence = 0
+    
+    def schedule(self, time, priority, callback, *args):
+        heapq.heappush(self.queue, (time, priority, self.sequence, callback, args))
+        self.sequence += 1
+    
+    def run_due(self, now):
+        """Exécute les événements échus à now (ceux qu'ils planifient attendent leur propre échéance)"""
+        queue = self.queue
+        limit = now + self.tolerance
+        if not queue or queue[0][0] > limit:
+            return
+        due = []
+        while queue and queue[0][0] <= limit:
+            due.append(heapq.heappop(queue))
+        due.sort(key=lambda event: (event[1], event[0], event[2]))
+        for _, _, _, callback, args in due:
+            callback(*args)
+        self.fired += len(due)
+
+class SpatialGrid:
+    """Grille uniforme pour les requêtes de voisinage entre balles"""
+    def __init__(self, cell_size=100):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.balls = []
+        self.ball_cells = []
+        self.indices = {}
+        self.max_radius = 0
+        
+    def cell_of(self, x, y):
+        return (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+    
+    def rebuild(self, balls):
+        """Reconstruit la grille (une fois par tick)"""
+        self.cells = {}
+        self.balls = balls
+        self.ball_cells = []
+        self.indices = {}
+        self.max_radius = 0
+        
+        for i, ball in enumerate(balls):
+            cell = self.cell_of(ball.x, ball.y)
+            self.cells.setdefault(cell, []).append(i)
+            self.ball_cells.append(cell)
+            self.indices[id(ball)] = i
+            if ball.radius > self.max_radius:
+                self.max_radius = ball.radius
+    
+    def move(self, ball):
+        """Met à jour la cellule d'une balle qui vient de se déplacer"""
+        i = self.indices.get(id(ball))
+        if i is None:
+            return
+        cell = self.cell_of(ball.x, ball.y)
+        old_cell = self.ball_cells[i]
+        if cell != old_cell:
+            self.cells[old_cell].remove(i)
+            self.cells.setdefault(cell, []).append(i)
+            self.ball_cells[i] = cell
+    
+    def query(self, x, y, radius):
+        """Balles candidates dans le rayon, dans l'ordre de la liste d'origine"""
+        min_cx, min_cy = self.cell_of(x - radius, y - radius)
+        max_cx, max_cy = self.cell_of(x + radius, y + radius)
+        
+        found = []
+        cells = self.cells
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found.extend(cell)
+        
+        # Même ordre que le parcours complet pour des résultats identiques
+        found.sort()
+        balls = self.balls
+        return [balls[i] for i in found]
+
+class SweepAndPrune:
+    """Phase large des chocs entre balles: tri des balles par bord gauche (x - radius) puis balayage.
+    
+    L'ordre du tick précédent est conservé et retrié: les balles bougent peu d'un tick
+    à l'autre, le tri (Timsort, qui exploite les séquences déjà triées) est quasi linéaire.
+    À bord égal, l'ordre de la liste des balles départage: l'ordre obtenu ne dépend que
+    de l'état, une simulation restaurée retrouve exactement les mêmes paires.
+    """
     def __init__(self):
-        self.center_x = SCREEN_WIDTH // 2
-        self.center_y = SCREEN_HEIGHT // 2
-        self.shape_type = "hexagon"  # hexagon, octagon, diamond
+        self.order = []
+    
+    def clear(self):
+        self.order = []
+    
+    def sort(self, balls):
+        positions = {id(ball): i for i, ball in enumerate(balls)}
+        # Balles retirées du combat écartées, nouvelles (clones) ajoutées en fin de liste
+        order = [ball for ball in self.order if id(ball) in positions]
+        if len(order) < len(balls):
+            known = set(map(id, order))
+            order.extend(ball for ball in balls if id(ball) not in known)
+        order.sort(key=lambda ball: (ball.x - ball.radius, positions[id(ball)]))
+        self.order = order
+        return order
+    
+    def candidate_pairs(self, balls):
+        """Paires dont les intervalles en x et en y se chevauchent, dans l'ordre du balayage"""
+        order = self.sort(balls)
+        count = len(order)
+        for a in range(count):
+            ball = order[a]
+            right = ball.x + ball.radius
+            for b in range(a + 1, count):
+                other = order[b]
+                if other.x - other.radius > right:
+                    break
+                if abs(other.y - ball.y) < ball.radius + other.radius:
+                    yield ball, other
+
+class BonusIndex:
+    """Grille des bonus posés: chaque bonus est inscrit dans toutes les cellules d'où
+    le centre d'une balle peut l'atteindre, une balle ne consulte donc que sa propre cellule."""
+    KEY_STRIDE = 1 << 20
+    
+    def __init__(self, cell_size=64, max_ball_radius=MAX_BALL_RADIUS):
+        self.cell_size = cell_size
+        self.max_ball_radius = max_ball_radius
+        self.cells = {}       # clé de cellule -> {bonus: None}, dans l'ordre d'apparition
+        self.bonus_keys = {}  # bonus -> clés de ses cellules
+        
+    def __len__(self):
+        return len(self.bonus_keys)
+    
+    def key_of(self, x, y):
+        return math.floor(x / self.cell_size) * self.KEY_STRIDE + math.floor(y / self.cell_size)
+    
+    def clear(self):
+        self.cells = {}
+        self.bonus_keys = {}
+    
+    def add(self, bonus):
+        reach = bonus.radius + self.max_ball_radius
+        size = self.cell_size
+        min_cx, max_cx = math.floor((bonus.x - reach) / size), math.floor((bonus.x + reach) / size)
+        min_cy, max_cy = math.floor((bonus.y - reach) / size), math.floor((bonus.y + reach) / size)
+        keys = [cx * self.KEY_STRIDE + cy for cx in range(min_cx, max_cx + 1) for cy in range(min_cy, max_cy + 1)]
+        for key in keys:
+            self.cells.setdefault(key, {})[bonus] = None
+        self.bonus_keys[bonus] = keys
+    
+    def remove(self, bonus):
+        for key in self.bonus_keys.pop(bonus):
+            cell = self.cells[key]
+            del cell[bonus]
+            if not cell:
+                del self.cells[key]
+    
+    def candidates(self, x, y):
+        """Bonus atteignables depuis (x, y), dans l'ordre d'apparition (copie: on peut retirer en parcourant)"""
+        cell = self.cells.get(self.key_of(x, y))
+        return list(cell) if cell else ()
+    
+    def occupied(self, x, y):
+        """Indices des positions (tableaux NumPy) dont la cellule contient au moins un bonus"""
+        size = self.cell_size
+        keys = np.floor(x / size).astype(np.int64) * self.KEY_STRIDE + np.floor(y / size).astype(np.int64)
+        return np.nonzero(np.isin(keys, np.fromiter(self.cells, dtype=np.int64, count=len(self.cells))))[0]
+
+class Arena:
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        # Centre de l'aire de jeu (écran par défaut, aire quelconque pour un monde sans affichage)
+        self.center_x = width // 2
+        self.center_y = height // 2
+        # Les formes prédéfinies sont dessinées pour l'écran par défaut: même mise en page réduite ailleurs
+        self.scale = min(width / SCREEN_WIDTH, height / SCREEN_HEIGHT)
+        self.shape_type = "hexagon"  # hexagon, octagon, diamond, custom
+        self.custom_vertices = []
         self.walls = []
+        self.version = 0  # Incrémenté à chaque changement de murs (couches d'affichage en cache)
+        
+        # Murs pré-rendus (créés au premier affichage) et ancienne forme pendant le fondu
+        self.layer = None
+        self.previous_layer = None
+        self.morph_start = None
+        self.display_time = time.time  # Horloge des animations (temps vidéo à l'export)
         self.generate_shape()
         
     def generate_shape(self):
+        # L'ancienne forme déjà affichée reste visible le temps du fondu
+        if self.layer is not None:
+            self.previous_layer = self.layer
+            self.morph_start = None
+        self.layer = None
+        
         self.walls = []
+        self.version += 1
         if self.shape_type == "hexagon":
             self.create_hexagon()
         elif self.shape_type == "octagon":
             self.create_octagon()
         elif self.shape_type == "diamond":
             self.create_diamond()
+        elif self.shape_type == "custom":
+            self.create_custom()
+        self.compute_wall_geometry()
+    
+    def set_custom_shape(self, vertices):
+        """Arène polygonale convexe quelconque (sommets en coordonnées écran, dans l'ordre)"""
+        vertices = [(float(x), float(y)) for x, y in vertices]
+        if len(vertices) < 3:
+            raise ValueError("Une arène doit avoir au moins 3 sommets")
+        if any(vertices[i - 1] == vertices[i] for i in range(len(vertices))):
+            raise ValueError("Deux sommets consécutifs de l'arène sont confondus")
+        
+        # Convexe: tous les virages dans le même sens, et un seul tour complet
+        # (une étoile comme le pentagramme tourne toujours du même côté, mais deux fois)
+        turns = set()
+        total_turn = 0.0
+        for i in range(len(vertices)):
+            (x1, y1), (x2, y2), (x3, y3) = vertices[i - 2], vertices[i - 1], vertices[i]
+            cross = (x2 - x1) * (y3 - y2) - (y2 - y1) * (x3 - x2)
+            dot = (x2 - x1) * (x3 - x2) + (y2 - y1) * (y3 - y2)
+            if cross != 0:
+                turns.add(cross > 0)
+            total_turn += math.atan2(cross, dot)
+        if len(turns) != 1 or abs(abs(total_turn) - 2 * math.pi) > 1e-6:
+            raise ValueError("L'arène doit être un polygone convexe")
+        
+        self.custom_vertices = vertices
+        self.shape_type = "custom"
+        self.generate_shape()
+    
+    @property
+    def shape_center(self):
+        """Centre des formes prédéfinies (le champ magnétique attire vers le centroïde, valable aussi en forme libre)"""
+        return self.center_x, self.center_y + 200 * self.scale
     
     def create_hexagon(self):
-        radius = 400
-        center_x, center_y = self.center_x, self.center_y + 200
+        radius = 400 * self.scale
+        center_x, center_y = self.shape_center
         for i in range(6):
             angle1 = i * math.pi / 3
             angle2 = (i + 1) * math.pi / 3
@@ -108,8 +967,8 @@ class Arena:
             self.walls.append(((x1, y1), (x2, y2)))
     
     def create_octagon(self):
-        radius = 380
-        center_x, center_y = self.center_x, self.center_y + 200
+        radius = 380 * self.scale
+        center_x, center_y = self.shape_center
         for i in range(8):
             angle1 = i * math.pi / 4
             angle2 = (i + 1) * math.pi / 4
@@ -120,176 +979,232 @@ class Arena:
             self.walls.append(((x1, y1), (x2, y2)))
     
     def create_diamond(self):
-        center_x, center_y = self.center_x, self.center_y + 200
-        width, height = 600, 800
+        center_x, center_y = self.shape_center
+        width, height = 600 * self.scale, 800 * self.scale
         # Diamond shape (4 walls)
         self.walls = [
-            ((center_x, center_y - height//2), (center_x + width//2, center_y)),  # Top-right
-            ((center_x + width//2, center_y), (center_x, center_y + height//2)),  # Bottom-right
-            ((center_x, center_y + height//2), (center_x - width//2, center_y)),  # Bottom-left
-            ((center_x - width//2, center_y), (center_x, center_y - height//2))   # Top-left
+            ((center_x, center_y - height/2), (center_x + width/2, center_y)),  # Top-right
+            ((center_x + width/2, center_y), (center_x, center_y + height/2)),  # Bottom-right
+            ((center_x, center_y + height/2), (center_x - width/2, center_y)),  # Bottom-left
+            ((center_x - width/2, center_y), (center_x, center_y - height/2))   # Top-left
         ]
     
-    def check_collision(self, ball):
-        """Amélioration majeure de la détection de collision pour éviter que les balles traversent les murs"""
-        collided = False
-        collision_count = 0
-        
-        # Vérifier plusieurs fois pour éviter les traversées
-        for _ in range(3):  # Multiple passes pour une meilleure détection
-            for wall in self.walls:
-                if self.ball_wall_collision(ball, wall):
-                    collided = True
-                    collision_count += 1
-                    
-        # Si trop de collisions, repositionner vers le centre
-        if collision_count > 1:
-            center_x, center_y = self.center_x, self.center_y + 200
-            dx = center_x - ball.x
-            dy = center_y - ball.y
-            dist = math.sqrt(dx*dx + dy*dy)
-            if dist > 0:
-                # Pousser vers le centre
-                ball.x += (dx / dist) * 5
-                ball.y += (dy / dist) * 5
-                
-        return collided
+    def create_custom(self):
+        vertices = self.custom_vertices
+        for i in range(len(vertices)):
+            self.walls.append((vertices[i - 1], vertices[i]))
     
-    def ball_wall_collision(self, ball, wall):
-        """Détection de collision améliorée avec prédiction de position"""
-        (x1, y1), (x2, y2) = wall
-        
-        # Position actuelle et future de la balle
-        future_x = ball.x + ball.vx * 0.016  # Prédiction 1 frame ahead
-        future_y = ball.y + ball.vy * 0.016
-        
-        # Vérifier la collision avec la position future
-        for pos_x, pos_y in [(ball.x, ball.y), (future_x, future_y)]:
-            # Vecteur du mur
+    def compute_wall_geometry(self):
+        """Pré-calcule, une fois par forme, les demi-plans intérieurs de chaque mur.
+        
+        planes[i] = (nx, ny, c): normale unitaire vers l'intérieur et constante telle que
+        nx*x + ny*y >= c à l'intérieur du mur i. L'arène étant convexe, un point est
+        dedans si et seulement s'il vérifie tous les demi-plans.
+        """
+        # Le centroïde des sommets est toujours à l'intérieur d'un polygone convexe
+        vertices = [start for start, _ in self.walls]
+        self.centroid_x = sum(x for x, _ in vertices) / len(vertices)
+        self.centroid_y = sum(y for _, y in vertices) / len(vertices)
+        
+        self.planes = []
+        self.wall_lengths = []
+        for (x1, y1), (x2, y2) in self.walls:
             wall_dx = x2 - x1
             wall_dy = y2 - y1
             wall_length = math.sqrt(wall_dx*wall_dx + wall_dy*wall_dy)
             
-            if wall_length == 0:
-                continue
-            
-            # Distance du centre de la balle au mur
-            to_ball_x = pos_x - x1
-            to_ball_y = pos_y - y1
-            
-            # Projection sur le mur
-            wall_projection = (to_ball_x * wall_dx + to_ball_y * wall_dy) / wall_length
-            
-            # Point le plus proche sur le mur
-            if wall_projection < 0:
-                closest_x, closest_y = x1, y1
-            elif wall_projection > wall_length:
-                closest_x, closest_y = x2, y2
-            else:
-                closest_x = x1 + (wall_projection / wall_length) * wall_dx
-                closest_y = y1 + (wall_projection / wall_length) * wall_dy
-            
-            # Distance à ce point
-            dist_x = pos_x - closest_x
-            dist_y = pos_y - closest_y
-            distance = math.sqrt(dist_x*dist_x + dist_y*dist_y)
+            # Normale orientée vers l'intérieur de l'arène
+            norm_x = -wall_dy / wall_length
+            norm_y = wall_dx / wall_length
+            if norm_x * (self.centroid_x - x1) + norm_y * (self.centroid_y - y1) < 0:
+                norm_x, norm_y = -norm_x, -norm_y
+            self.planes.append((norm_x, norm_y, norm_x * x1 + norm_y * y1))
+            self.wall_lengths.append(wall_length)
+        
+        # Copie en tableau pour le moteur NumPy
+        self.plane_array = np.array(self.planes) if np is not None else None
+    
+    def move_ball(self, ball, dt):
+        """Déplace la balle pendant dt avec détection continue des collisions.
+        
+        Le centre d'une balle de rayon r ne peut pas sortir du polygone rétréci de
+        r + WALL_MARGIN: on calcule le temps d'impact du centre sur ce polygone,
+        on rebondit et on repart avec le temps restant, plusieurs fois si besoin.
+        """
+        planes = self.planes
+        inset = ball.radius + WALL_MARGIN
+        collided = self.push_inside(ball, planes, inset)
+        
+        remaining = dt
+        for _ in range(MAX_WALL_BOUNCES):
+            hit_time = remaining
+            hit_plane = None
+            for plane in planes:
+                norm_x, norm_y, offset = plane
+                approach = -(ball.vx * norm_x + ball.vy * norm_y)
+                if approach <= 0:
+                    continue
+                distance = max(0.0, norm_x * ball.x + norm_y * ball.y - offset - inset)
+                impact_time = distance / approach
+                if impact_time < hit_time:
+                    hit_time, hit_plane = impact_time, plane
             
-            if distance <= ball.radius + 2:  # Petite marge de sécurité
-                # Collision détectée - repositionner d'abord
-                if distance > 0:
-                    # Normaliser le vecteur de collision
-                    norm_x = dist_x / distance
-                    norm_y = dist_y / distance
-                    
-                    # Repositionner la balle avec marge de sécurité
-                    safety_margin = 3
-                    ball.x = closest_x + norm_x * (ball.radius + safety_margin)
-                    ball.y = closest_y + norm_y * (ball.radius + safety_margin)
-                    
-                    # Calculer la nouvelle vitesse (réflexion)
-                    dot_product = ball.vx * norm_x + ball.vy * norm_y
-                    ball.vx = ball.vx - 2 * dot_product * norm_x
-                    ball.vy = ball.vy - 2 * dot_product * norm_y
-                    
-                    # Réduire l'accélération à chaque rebond
-                    speed_multiplier = 1.05  # Réduit de 1.15 à 1.05
-                    ball.vx *= speed_multiplier
-                    ball.vy *= speed_multiplier
-                    
-                    # Limiter la vitesse maximale
-                    max_speed = 600  # Réduit de 800 à 600
-                    current_speed = math.sqrt(ball.vx*ball.vx + ball.vy*ball.vy)
-                    if current_speed > max_speed:
-                        ball.vx = (ball.vx / current_speed) * max_speed
-                        ball.vy = (ball.vy / current_speed) * max_speed
-                    
-                    return True
+            ball.x += ball.vx * hit_time
+            ball.y += ball.vy * hit_time
+            if hit_plane is None:
+                break
+            remaining -= hit_time
+            self.bounce(ball, hit_plane[0], hit_plane[1])
+            collided = True
         
-        return False
+        return collided
     
-    def is_point_inside(self, x, y):
-        """Vérifie si un point est à l'intérieur de l'arène"""
-        center_x, center_y = self.center_x, self.center_y + 200
+    def push_inside(self, ball, planes, inset):
+        """Ramène une balle déjà hors du polygone rétréci (morphing, clone) au point le plus proche.
         
-        if self.shape_type == "hexagon":
-            radius = 380  # Un peu plus petit pour la vérification
-        elif self.shape_type == "octagon":
-            radius = 360
-        elif self.shape_type == "diamond":
-            # Vérification spéciale pour le diamant
-            dx = abs(x - center_x)
-            dy = abs(y - center_y)
-            return dx/300 + dy/400 < 1
-        else:
-            radius = 350
+        D'abord projection sur le mur le plus franchi; si un second mur reste franchi,
+        la balle est dans un coin et va au sommet commun des deux murs rétrécis.
+        """
+        collided = False
+        previous = None
+        for _ in range(len(planes)):
+            depth = -1e-9
+            deepest = None
+            for plane in planes:
+                distance = plane[0] * ball.x + plane[1] * ball.y - plane[2] - inset
+                if distance < depth:
+                    depth, deepest = distance, plane
+            if deepest is None:
+                break
             
-        dx = x - center_x
-        dy = y - center_y
-        return math.sqrt(dx*dx + dy*dy) < radius
+            norm_x, norm_y, offset = deepest
+            det = previous[0] * norm_y - previous[1] * norm_x if previous else 0.0
+            if abs(det) > 1e-9:
+                # Sommet du coin
+                offset_a = previous[2] + inset
+                offset_b = offset + inset
+                ball.x = (offset_a * norm_y - previous[1] * offset_b) / det
+                ball.y = (previous[0] * offset_b - offset_a * norm_x) / det
+            else:
+                ball.x -= norm_x * depth
+                ball.y -= norm_y * depth
+            if ball.vx * norm_x + ball.vy * norm_y < 0:
+                self.bounce(ball, norm_x, norm_y)
+            previous = deepest
+            collided = True
+        return collided
     
-    def draw(self, screen):
+    def bounce(self, ball, norm_x, norm_y):
+        """Réflexion sur le mur de normale (norm_x, norm_y)"""
+        dot_product = ball.vx * norm_x + ball.vy * norm_y
+        ball.vx = ball.vx - 2 * dot_product * norm_x
+        ball.vy = ball.vy - 2 * dot_product * norm_y
+        
+        # Réduire l'accélération à chaque rebond
+        speed_multiplier = 1.05  # Réduit de 1.15 à 1.05
+        ball.vx *= speed_multiplier
+        ball.vy *= speed_multiplier
+        
+        # Limiter la vitesse maximale
+        max_speed = 600  # Réduit de 800 à 600
+        current_speed = math.sqrt(ball.vx*ball.vx + ball.vy*ball.vy)
+        if current_speed > max_speed:
+            ball.vx = (ball.vx / current_speed) * max_speed
+            ball.vy = (ball.vy / current_speed) * max_speed
+    
+    def is_point_inside(self, x, y, margin=0):
+        """Vérifie si un point est à l'intérieur de l'arène (à au moins margin de chaque mur)"""
+        for norm_x, norm_y, offset in self.planes:
+            if norm_x * x + norm_y * y - offset <= margin:
+                return False
+        return True
+    
+    def render_layer(self):
+        """Murs et coins pré-rendus sur une surface à clé de couleur (RLE) limitée à l'arène"""
+        xs = [x for wall in self.walls for x, _ in wall]
+        ys = [y for wall in self.walls for _, y in wall]
+        pad = 12  # Demi-épaisseur de la lueur la plus large, coins compris
+        left, top = int(min(xs)) - pad, int(min(ys)) - pad
+        surface = pygame.Surface((int(max(xs)) - left + pad + 1, int(max(ys)) - top + pad + 1))
+        
         # Dessiner l'arène avec un effet de lueur
         for wall in self.walls:
             (x1, y1), (x2, y2) = wall
+            start = (int(x1) - left, int(y1) - top)
+            end = (int(x2) - left, int(y2) - top)
             
             # Ligne principale épaisse
-            pygame.draw.line(screen, (255, 255, 255), (int(x1), int(y1)), (int(x2), int(y2)), 8)
+            pygame.draw.line(surface, (255, 255, 255), start, end, 8)
             
             # Effet de lueur
             glow_colors = [(100, 150, 255), (150, 200, 255), (200, 230, 255)]
             for i, color in enumerate(glow_colors):
-                pygame.draw.line(screen, color, (int(x1), int(y1)), (int(x2), int(y2)), 8 + i * 4)
+                pygame.draw.line(surface, color, start, end, 8 + i * 4)
         
         # Dessiner les coins avec des cercles lumineux
         for wall in self.walls:
             (x1, y1), (x2, y2) = wall
-            pygame.draw.circle(screen, (255, 255, 100), (int(x1), int(y1)), 6)
+            pygame.draw.circle(surface, (255, 255, 100), (int(x1) - left, int(y1) - top), 6)
+        
+        surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        return surface, (left, top)
+    
+    def morph_progress(self):
+        """Avancement du fondu de morphing (0 à 1), 1 hors transition"""
+        if self.previous_layer is None:
+            return 1.0
+        if self.morph_start is None:
+            self.morph_start = self.display_time()
+        progress = (self.display_time() - self.morph_start) / MORPH_DURATION
+        if progress >= 1.0:
+            self.previous_layer = None
+            return 1.0
+        return progress
+    
+    def draw(self, screen, progress=None):
+        """Murs en cache; pendant un morphing, fondu entre l'ancienne et la nouvelle forme"""
+        if self.layer is None:
+            self.layer = self.render_layer()
+        if progress is None:
+            progress = self.morph_progress()
+        
+        surface, position = self.layer
+        if progress < 1.0 and self.previous_layer is not None:
+            old_surface, old_position = self.previous_layer
+            old_surface.set_alpha(int(255 * (1 - progress)))
+            screen.blit(old_surface, old_position)
+            surface.set_alpha(int(255 * progress))
+            screen.blit(surface, position)
+            surface.set_alpha(None)
+        else:
+            screen.blit(surface, position)
 
 class Bonus:
-    def __init__(self, x, y, bonus_type: BonusType):
+    def __init__(self, x, y, bonus_type: BonusType, clock: SimulationClock):
         self.x = x
         self.y = y
         self.type = bonus_type
         self.color = BONUS_COLORS[bonus_type]
         self.radius = 20
-        self.pulse = 0
         self.collected = False
         self.life_time = 15.0  # Disparaît après 15 secondes
-        self.spawn_time = time.time()
-        
-    def update(self, dt):
-        self.pulse += dt * 5
-        current_time = time.time()
-        if current_time - self.spawn_time > self.life_time:
-            return False
-        return True
+        self.clock = clock
+        self.spawn_time = clock.now
+    
+    @property
+    def pulse(self):
+        # Phase de pulsation déduite de l'âge: aucune mise à jour par tick
+        return (self.clock.now - self.spawn_time) * 5
+    
+    def is_expired(self):
+        return self.clock.now - self.spawn_time > self.life_time
     
     def check_collision(self, ball):
         dx = ball.x - self.x
         dy = ball.y - self.y
-        distance = math.sqrt(dx*dx + dy*dy)
+        reach = ball.radius + self.radius
         
-        if distance < ball.radius + self.radius:
+        if dx*dx + dy*dy < reach * reach:
             self.apply_effect(ball)
             self.collected = True
             return True
@@ -299,13 +1214,13 @@ class Bonus:
         if self.type == BonusType.SPEED_BOOST:
             ball.vx *= 1.5
             ball.vy *= 1.5
-            ball.speed_boost_time = time.time() + 5.0
+            ball.speed_boost_time = self.clock.now + 5.0
             
         elif self.type == BonusType.HEALTH_KIT:
             ball.health = min(ball.max_health, ball.health + 50)
             
         elif self.type == BonusType.SHIELD:
-            ball.shield_time = time.time() + 8.0
+            ball.shield_time = self.clock.now + 8.0
             ball.shield_strength = 3
             
         elif self.type == BonusType.MULTIPLY:
@@ -313,12 +1228,17 @@ class Bonus:
             pass
             
         elif self.type == BonusType.RAGE:
-            ball.rage_time = time.time() + 10.0
+            ball.rage_time = self.clock.now + 10.0
             ball.damage_multiplier = 3.0
             
         elif self.type == BonusType.FREEZE_BLAST:
             ball.freeze_blast_ready = True
     
+    def bounds(self):
+        """Zone couverte par draw() (lueur comprise)"""
+        extent = int((self.radius + math.sin(self.pulse) * 5) * 2) + 2
+        return pygame.Rect(int(self.x) - extent, int(self.y) - extent, 2 * extent + 1, 2 * extent + 1)
+    
     def draw(self, screen):
         if self.collected:
             return
@@ -327,9 +1247,8 @@ class Bonus:
         pulse_size = self.radius + math.sin(self.pulse) * 5
         
         # Lueur
-        glow_surf = pygame.Surface((int(pulse_size * 4), int(pulse_size * 4)), pygame.SRCALPHA)
-        glow_color = (*self.color.to_tuple(), 100)
-        pygame.draw.circle(glow_surf, glow_color, (int(pulse_size * 2), int(pulse_size * 2)), int(pulse_size * 2))
+        glow_radius = int(pulse_size * 2)
+        glow_surf = circle_sprite(self.color.to_tuple(), glow_radius, 100)
         screen.blit(glow_surf, (int(self.x - pulse_size * 2), int(self.y - pulse_size * 2)))
         
         # Corps principal
@@ -393,8 +1312,9 @@ class Particle:
         self.life -= dt
         
         # Friction
-        self.vx *= 0.98
-        self.vy *= 0.98
+        friction = per_tick_factor(0.98, dt)
+        self.vx *= friction
+        self.vy *= friction
         
         return self.life > 0
     
@@ -405,29 +1325,301 @@ class Particle:
         alpha = max(0, min(1, self.life / self.max_life))
         size = int(self.size * alpha)
         if size > 0:
-            color = (
-                max(0, min(255, self.color.r)),
-                max(0, min(255, self.color.g)),
-                max(0, min(255, self.color.b)),
-                int(255 * alpha)
-            )
-            surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, color, (size, size), size)
+            rgb = (self.color.r, self.color.g, self.color.b)
+            surf = circle_sprite(rgb, size, int(255 * alpha))
             screen.blit(surf, (int(self.x - size), int(self.y - size)))
 
+class ParticlePool:
+    """Pool de particules à capacité fixe, stocké dans des tableaux NumPy.
+    
+    Les cases libérées sont réutilisées (pile de cases libres) et la mise à jour
+    (position, friction, durée de vie) est vectorisée: aucun objet par particule.
+    """
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.max_life = np.ones(capacity)
+        self.size = np.zeros(capacity)
+        self.colors = np.zeros((capacity, 3), dtype=np.uint8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Réglés par le niveau de détail (QualityGovernor)
+        self.trail_rate = 1.0
+        self.burst_cap = None
+        self.clear()
+    
+    def clear(self):
+        self.alive[:] = False
+        # Les petits indices sortent en premier pour garder la zone active compacte
+        self.free = np.arange(self.capacity - 1, -1, -1)
+        self.free_count = self.capacity
+        self.high_water = 0
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def emit(self, x, y, count, speed, color, life, spread=0.0):
+        """Émet count particules en (x, y), vitesse uniforme dans [-speed, speed].
+        
+        x, y et spread peuvent être des tableaux de longueur count, color une Color
+        ou un tableau (count, 3); life est un intervalle (min, max). Au-delà de la
+        capacité, les particules en trop sont ignorées. Une gerbe en un seul point
+        est limitée à burst_cap particules.
+        """
+        if self.burst_cap is not None and count > self.burst_cap and np.ndim(x) == 0:
+            count = self.burst_cap
+        if count > self.free_count:
+            # Pool plein: les tableaux par particule sont tronqués comme le nombre
+            count = self.free_count
+            if np.ndim(x) > 0:
+                x, y = x[:count], y[:count]
+            if np.ndim(spread) > 0:
+                spread = spread[:count]
+            if not isinstance(color, Color):
+                color = color[:count]
+        if count <= 0:
+            return
+        if count == 1 and isinstance(color, Color):
+            self.emit_one(x, y, speed, color, life, spread)
+            return
+        slots = self.free[self.free_count - count:self.free_count]
+        self.free_count -= count
+        
+        rng = np.random
+        self.x[slots] = x + rng.uniform(-1, 1, count) * spread
+        self.y[slots] = y + rng.uniform(-1, 1, count) * spread
+        self.vx[slots] = rng.uniform(-speed, speed, count)
+        self.vy[slots] = rng.uniform(-speed, speed, count)
+        lifetimes = rng.uniform(life[0], life[1], count)
+        self.life[slots] = lifetimes
+        self.max_life[slots] = lifetimes
+        self.size[slots] = rng.uniform(2, 8, count)
+        if isinstance(color, Color):
+            color = color.to_tuple()
+        self.colors[slots] = np.clip(color, 0, 255)
+        self.alive[slots] = True
+        
+        self.count += count
+        self.high_water = max(self.high_water, int(slots.max()) + 1)
+    
+    def emit_one(self, x, y, speed, color, life, spread):
+        """Chemin rapide pour une particule isolée (traînées): pas d'appel vectorisé"""
+        self.free_count -= 1
+        slot = int(self.free[self.free_count])
+        self.x[slot] = x + random.uniform(-spread, spread)
+        self.y[slot] = y + random.uniform(-spread, spread)
+        self.vx[slot] = random.uniform(-speed, speed)
+        self.vy[slot] = random.uniform(-speed, speed)
+        lifetime = random.uniform(life[0], life[1])
+        self.life[slot] = lifetime
+        self.max_life[slot] = lifetime
+        self.size[slot] = random.uniform(2, 8)
+        self.colors[slot] = (min(255, max(0, color.r)), min(255, max(0, color.g)), min(255, max(0, color.b)))
+        self.alive[slot] = True
+        
+        self.count += 1
+        if slot >= self.high_water:
+            self.high_water = slot + 1
+    
+    def update(self, dt):
+        high = self.high_water
+        if high == 0:
+            return
+        
+        # Mise à jour vectorisée de toute la zone active (les cases mortes sont inoffensives)
+        self.x[:high] += self.vx[:high] * dt
+        self.y[:high] += self.vy[:high] * dt
+        self.life[:high] -= dt
+        
+        # Friction
+        friction = per_tick_factor(0.98, dt)
+        self.vx[:high] *= friction
+        self.vy[:high] *= friction
+        
+        # Libérer les particules mortes
+        alive = self.alive[:high]
+        expired = np.nonzero(alive & (self.life[:high] <= 0))[0]
+        if len(expired):
+            alive[expired] = False
+            self.free[self.free_count:self.free_count + len(expired)] = expired[::-1]
+            self.free_count += len(expired)
+            self.count -= len(expired)
+            
+            remaining = np.nonzero(alive)[0]
+            self.high_water = int(remaining[-1]) + 1 if len(remaining) else 0
+    
+    def dirty_tiles(self, tile, cols, rows):
+        """Indices des tuiles (ligne * cols + colonne) couvertes par les particules vivantes"""
+        indices = np.nonzero(self.alive[:self.high_water])[0]
+        if len(indices) == 0:
+            return []
+        x, y, size = self.x[indices], self.y[indices], self.size[indices] + 1
+        col0 = np.clip((x - size) // tile, 0, cols - 1).astype(int)
+        col1 = np.clip((x + size) // tile, 0, cols - 1).astype(int)
+        row0 = np.clip((y - size) // tile, 0, rows - 1).astype(int)
+        row1 = np.clip((y + size) // tile, 0, rows - 1).astype(int)
+        # Une particule (8 px au plus) couvre au plus 2x2 tuiles
+        covered = np.zeros(cols * rows, dtype=bool)
+        for row in (row0, row1):
+            for col in (col0, col1):
+                covered[row * cols + col] = True
+        return np.flatnonzero(covered).tolist()
+    
+    def draw(self, screen, point_size=0):
+        """Dessine les particules; celles de taille <= point_size deviennent des points posés en bloc"""
+        high = self.high_water
+        indices = np.nonzero(self.alive[:high])[0]
+        if len(indices) == 0:
+            return
+        
+        alpha = np.clip(self.life[indices] / self.max_life[indices], 0, 1)
+        sizes = (self.size[indices] * alpha).astype(int)
+        visible = sizes > 0
+        indices, sizes, alpha = indices[visible], sizes[visible], alpha[visible]
+        
+        if point_size > 0:
+            points = sizes <= point_size
+            if points.any():
+                self.draw_points(screen, indices[points], alpha[points])
+                keep = ~points
+                indices, sizes, alpha = indices[keep], sizes[keep], alpha[keep]
+        
+        # Clés de sprites quantifiées en bloc, puis conversion en listes Python une seule fois
+        colors = self.colors[indices].astype(int)
+        colors = np.clip((colors + SPRITE_COLOR_STEP // 2) // SPRITE_COLOR_STEP * SPRITE_COLOR_STEP, 0, 255)
+        alphas = (alpha * 255).astype(int)
+        alphas = np.clip((alphas + SPRITE_ALPHA_STEP // 2) // SPRITE_ALPHA_STEP * SPRITE_ALPHA_STEP, 0, 255)
+        keys = zip(colors[:, 0].tolist(), colors[:, 1].tolist(), colors[:, 2].tolist(),
+                   sizes.tolist(), alphas.tolist())
+        positions = zip((self.x[indices] - sizes).astype(int).tolist(),
+                        (self.y[indices] - sizes).astype(int).tolist())
+        
+        # Boucle de blits avec recherche directe dans le cache
+        entries = sprite_cache.entries
+        touch = entries.move_to_end
+        blit = screen.blit
+        hits = 0
+        for key, position in zip(keys, positions):
+            surf = entries.get(key)
+            if surf is None:
+                surf = sprite_cache.get(key, lambda: render_circle_sprite(key))
+            else:
+                touch(key)
+                hits += 1
+            blit(surf, position)
+        sprite_cache.hits += hits
+    
+    def draw_points(self, screen, indices, alpha):
+        """Un pixel par particule, mélangé à l'écran selon son alpha, en une seule écriture vectorisée"""
+        x = self.x[indices].astype(int)
+        y = self.y[indices].astype(int)
+        width, height = screen.get_size()
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        x, y, alpha = x[inside], y[inside], alpha[inside, None]
+        pixels = pygame.surfarray.pixels3d(screen)
+        under = pixels[x, y].astype(float)
+        pixels[x, y] = under + (self.colors[indices[inside]] - under) * alpha
+        del pixels  # Déverrouille l'écran
+
+class ParticleList:
+    """Même interface que ParticlePool avec des objets Particle (sans NumPy)"""
+    def __init__(self):
+        self.particles = []
+        self.trail_rate = 1.0
+        self.burst_cap = None
+    
+    def clear(self):
+        self.particles = []
+    
+    def __len__(self):
+        return len(self.particles)
+    
+    def emit(self, x, y, count, speed, color, life, spread=0.0):
+        if self.burst_cap is not None:
+            count = min(count, self.burst_cap)
+        for _ in range(count):
+            self.particles.append(Particle(
+                x + random.uniform(-spread, spread),
+                y + random.uniform(-spread, spread),
+                random.uniform(-speed, speed),
+                random.uniform(-speed, speed),
+                color,
+                random.uniform(life[0], life[1])
+            ))
+    
+    def update(self, dt):
+        self.particles = [p for p in self.particles if p.update(dt)]
+    
+    def dirty_tiles(self, tile, cols, rows):
+        tiles = set()
+        for p in self.particles:
+            size = p.size + 1
+            col0 = min(cols - 1, max(0, int((p.x - size) // tile)))
+            col1 = min(cols - 1, max(0, int((p.x + size) // tile)))
+            row0 = min(rows - 1, max(0, int((p.y - size) // tile)))
+            row1 = min(rows - 1, max(0, int((p.y + size) // tile)))
+            tiles.update((row0 * cols + col0, row0 * cols + col1, row1 * cols + col0, row1 * cols + col1))
+        return tiles
+    
+    def draw(self, screen, point_size=0):
+        if point_size <= 0:
+            for particle in self.particles:
+                particle.draw(screen)
+            return
+        
+        points = []
+        for particle in self.particles:
+            alpha = max(0, min(1, particle.life / particle.max_life))
+            size = int(particle.size * alpha)
+            if size <= 0:
+                continue  # Invisible, comme dans Particle.draw
+            if size <= point_size:
+                points.append((particle, alpha))
+            else:
+                particle.draw(screen)
+        
+        # Points posés sous un seul verrou de l'écran
+        screen.lock()
+        width, height = screen.get_size()
+        for particle, alpha in points:
+            x, y = int(particle.x), int(particle.y)
+            if 0 <= x < width and 0 <= y < height:
+                under = screen.get_at((x, y))
+                color = particle.color
+                screen.set_at((x, y), (under.r + (min(255, max(0, color.r)) - under.r) * alpha,
+                                       under.g + (min(255, max(0, color.g)) - under.g) * alpha,
+                                       under.b + (min(255, max(0, color.b)) - under.b) * alpha))
+        screen.unlock()
+
+def create_particle_system(capacity=65536):
+    """Pool vectorisé si NumPy est disponible, liste d'objets sinon"""
+    if np is not None:
+        return ParticlePool(capacity)
+    return ParticleList()
+
 class Ball:
-    def __init__(self, x, y, ball_type: BallType):
+    alive = True  # Passe à False quand la balle est retirée du combat
+    
+    def __init__(self, x, y, ball_type: BallType, clock: SimulationClock, rng=random):
+        self.clock = clock
+        self.rng = rng
         self.x = x
         self.y = y
-        self.vx = random.uniform(-150, 150)
-        self.vy = random.uniform(-150, 150)
+        self.prev_x = x
+        self.prev_y = y
+        self.vx = rng.uniform(-150, 150)
+        self.vy = rng.uniform(-150, 150)
         self.type = ball_type
         self.color = COLORS[ball_type]
-        self.radius = random.uniform(15, 25)
+        self.radius = rng.uniform(MIN_BALL_RADIUS, MAX_BALL_RADIUS)
         self.health = 100.0
         self.max_health = 100.0
-        self.last_attack = 0
         self.attack_cooldown = 0.8
+        self.last_attack = -self.attack_cooldown
         self.glow_intensity = 0
         
         # Effets des bonus
@@ -438,65 +1630,82 @@ class Ball:
         self.damage_multiplier = 1.0
         self.freeze_blast_ready = False
         
-    def update(self, dt, balls, particles, disruptions, arena):
-        # Mouvement de base
-        self.x += self.vx * dt
-        self.y += self.vy * dt
+    def update(self, dt, balls, particles, disruptions, arena, grid=None):
+        # Position du pas précédent, pour l'interpolation à l'affichage
+        self.prev_x = self.x
+        self.prev_y = self.y
         
-        # Vérifier les collisions avec l'arène
-        arena.check_collision(self)
+        # Mouvement de base, avec rebonds sur les murs de l'arène
+        arena.move_ball(self, dt)
         
-        # Vérifier si la balle est encore dans l'arène et la repositionner si nécessaire
-        if not arena.is_point_inside(self.x, self.y):
-            center_x, center_y = arena.center_x, arena.center_y + 200
-            dx = center_x - self.x
-            dy = center_y - self.y
-            dist = math.sqrt(dx*dx + dy*dy)
-            if dist > 0:
-                # Repositionner vers le centre
-                self.x = center_x + (dx / dist) * 200
-                self.y = center_y + (dy / dist) * 200
-                # Inverser la vitesse
-                self.vx *= -0.5
-                self.vy *= -0.5
-        
-        # Effets des perturbations
-        for disruption in disruptions:
-            disruption.apply_to_ball(self)
-        
-        # Gestion des effets de bonus
-        current_time = time.time()
+        if grid:
+            grid.move(self)
         
-        # Speed boost
-        if current_time > self.speed_boost_time:
-            self.speed_boost_time = 0
-            
-        # Shield
-        if current_time > self.shield_time:
-            self.shield_time = 0
-            self.shield_strength = 0
-            
-        # Rage
-        if current_time > self.rage_time:
-            self.rage_time = 0
-            self.damage_multiplier = 1.0
+        # Effets des perturbations (les expirées sont retirées par le planificateur)
+        for disruption in disruptions:
+            disruption.apply_to_ball(self, dt, arena)
         
         # Comportements spécifiques au type
-        self.apply_type_behavior(dt, balls)
+        self.apply_type_behavior(dt, balls, grid)
         
         # Attaquer les autres balles
-        self.attack_nearby_balls(balls, particles)
+        self.attack_nearby_balls(balls, particles, grid)
         
         # Particules de traînée
-        self.create_trail_particles(particles)
+        self.create_trail_particles(particles, dt)
         
         # Mise à jour de l'effet de lueur
-        self.glow_intensity = (math.sin(time.time() * 5) + 1) * 0.5
+        self.glow_intensity = (math.sin(self.clock.now * 5) + 1) * 0.5
+        
+    @property
+    def mass(self):
+        return self.radius * self.radius
+    
+    def collide_with(self, other):
+        """Choc élastique cercle-cercle: séparation selon les masses puis échange d'impulsion"""
+        dx = other.x - self.x
+        dy = other.y - self.y
+        reach = self.radius + other.radius
+        distance_sq = dx*dx + dy*dy
+        if distance_sq >= reach * reach:
+            return False
         
-    def apply_type_behavior(self, dt, balls):
+        distance = math.sqrt(distance_sq)
+        if distance > 0:
+            nx, ny = dx / distance, dy / distance
+        else:
+            nx, ny = 1.0, 0.0  # Centres confondus: direction arbitraire mais fixe
+        inverse_mass = 1 / self.mass
+        other_inverse_mass = 1 / other.mass
+        total_inverse = inverse_mass + other_inverse_mass
+        
+        # Séparation: chaque balle recule à proportion de l'inverse de sa masse
+        overlap = (reach - distance) / total_inverse
+        self.x -= nx * overlap * inverse_mass
+        self.y -= ny * overlap * inverse_mass
+        other.x += nx * overlap * other_inverse_mass
+        other.y += ny * overlap * other_inverse_mass
+        
+        # Impulsion seulement si les balles se rapprochent encore
+        approach = (other.vx - self.vx) * nx + (other.vy - self.vy) * ny
+        if approach < 0:
+            impulse = -(1 + BALL_RESTITUTION) * approach / total_inverse
+            self.vx -= impulse * inverse_mass * nx
+            self.vy -= impulse * inverse_mass * ny
+            other.vx += impulse * other_inverse_mass * nx
+            other.vy += impulse * other_inverse_mass * ny
+        return True
+    
+    def nearby_balls(self, balls, grid, radius):
+        """Candidats dans le rayon (toutes les balles sans grille)"""
+        if grid:
+            return grid.query(self.x, self.y, radius)
+        return balls
+    
+    def apply_type_behavior(self, dt, balls, grid=None):
         if self.type == BallType.FIRE:
             # Accélération vers les balles de glace
-            for ball in balls:
+            for ball in self.nearby_balls(balls, grid, 200):
                 if ball != self and ball.type == BallType.ICE:
                     dx = ball.x - self.x
                     dy = ball.y - self.y
@@ -508,12 +1717,13 @@ class Ball:
                         
         elif self.type == BallType.ICE:
             # Ralentissement graduel (mais pas trop avec les rebonds qui accélèrent)
-            self.vx *= 0.999
-            self.vy *= 0.999
+            slowdown = per_tick_factor(0.999, dt)
+            self.vx *= slowdown
+            self.vy *= slowdown
             
         elif self.type == BallType.METAL:
             # Attraction mutuelle avec autres métaux
-            for ball in balls:
+            for ball in self.nearby_balls(balls, grid, 150):
                 if ball != self and ball.type == BallType.METAL:
                     dx = ball.x - self.x
                     dy = ball.y - self.y
@@ -525,23 +1735,24 @@ class Ball:
                         
         elif self.type == BallType.LIGHTNING:
             # Mouvement erratique
-            if random.random() < 0.08:
-                self.vx += random.uniform(-80, 80)
-                self.vy += random.uniform(-80, 80)
+            if self.rng.random() < per_tick_chance(0.08, dt):
+                self.vx += self.rng.uniform(-80, 80)
+                self.vy += self.rng.uniform(-80, 80)
                 
         elif self.type == BallType.POISON:
             # Empoisonne les balles proches
-            for ball in balls:
+            for ball in self.nearby_balls(balls, grid, 100):
                 if ball != self and self.distance_to(ball) < 100:
                     if ball.shield_strength <= 0:
                         ball.health -= 8 * dt
     
-    def attack_nearby_balls(self, balls, particles):
-        current_time = time.time()
+    def attack_nearby_balls(self, balls, particles, grid=None):
+        current_time = self.clock.now
         if current_time - self.last_attack < self.attack_cooldown:
             return
-            
-        for ball in balls:
+        
+        contact_range = self.radius + (grid.max_radius if grid else 0) + 15
+        for ball in self.nearby_balls(balls, grid, contact_range):
             if ball != self and self.distance_to(ball) < self.radius + ball.radius + 15:
                 damage = self.calculate_damage(ball)
                 
@@ -555,30 +1766,25 @@ class Ball:
                 
                 # Freeze blast
                 if self.freeze_blast_ready:
-                    self.freeze_blast(balls, particles)
+                    self.freeze_blast(balls, particles, grid)
                     self.freeze_blast_ready = False
                 
                 # Effet visuel d'attaque
                 self.create_attack_particles(ball, particles)
                 break
     
-    def freeze_blast(self, balls, particles):
+    def freeze_blast(self, balls, particles, grid=None):
         # Geler toutes les balles dans un rayon
-        for ball in balls:
+        for ball in self.nearby_balls(balls, grid, 200):
             if ball != self and self.distance_to(ball) < 200:
                 ball.vx *= 0.1
                 ball.vy *= 0.1
                 
+        self.create_freeze_particles(particles)
+    
+    def create_freeze_particles(self, particles):
         # Effet visuel spectaculaire
-        for _ in range(30):
-            particles.append(Particle(
-                self.x,
-                self.y,
-                random.uniform(-400, 400),
-                random.uniform(-400, 400),
-                Color(150, 255, 255),
-                random.uniform(1.0, 2.5)
-            ))
+        particles.emit(self.x, self.y, 30, 400, Color(150, 255, 255), (1.0, 2.5))
     
     def calculate_damage(self, target):
         base_damage = 25
@@ -594,8 +1800,8 @@ class Ball:
         dy = self.y - other.y
         return math.sqrt(dx*dx + dy*dy)
     
-    def create_trail_particles(self, particles):
-        if random.random() < 0.4:
+    def create_trail_particles(self, particles, dt):
+        if random.random() < per_tick_chance(0.4 * particles.trail_rate, dt):
             # Particules spéciales selon les bonus actifs
             trail_color = self.color
             if self.speed_boost_time > 0:
@@ -603,28 +1809,13 @@ class Ball:
             elif self.rage_time > 0:
                 trail_color = Color(255, 100, 100)
                 
-            particles.append(Particle(
-                self.x + random.uniform(-self.radius, self.radius),
-                self.y + random.uniform(-self.radius, self.radius),
-                random.uniform(-80, 80),
-                random.uniform(-80, 80),
-                trail_color,
-                random.uniform(0.5, 1.8)
-            ))
+            particles.emit(self.x, self.y, 1, 80, trail_color, (0.5, 1.8), spread=self.radius)
     
     def create_attack_particles(self, target, particles):
         mid_x = (self.x + target.x) / 2
         mid_y = (self.y + target.y) / 2
         
-        for _ in range(12):
-            particles.append(Particle(
-                mid_x,
-                mid_y,
-                random.uniform(-200, 200),
-                random.uniform(-200, 200),
-                Color(255, 255, 255),
-                random.uniform(0.3, 1.0)
-            ))
+        particles.emit(mid_x, mid_y, 12, 200, Color(255, 255, 255), (0.3, 1.0))
     
     def explode(self, particles):
         # Explosion spectaculaire
@@ -632,17 +1823,22 @@ class Ball:
         if self.rage_time > 0:
             explosion_count = 40  # Plus de particules si en rage
             
-        for _ in range(explosion_count):
-            particles.append(Particle(
-                self.x,
-                self.y,
-                random.uniform(-400, 400),
-                random.uniform(-400, 400),
-                self.color,
-                random.uniform(1.5, 4.0)
-            ))
+        particles.emit(self.x, self.y, explosion_count, 400, self.color, (1.5, 4.0))
     
-    def draw(self, screen):
+    def bounds(self, alpha=1.0):
+        """Zone couverte par draw(): lueur, bouclier et barre de vie"""
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        glow_multiplier = 2.5 if self.rage_time > 0 else 2.0 if self.speed_boost_time > 0 else 1.0
+        glow_size = int(self.radius * (1 + self.glow_intensity * 0.5) * glow_multiplier)
+        extent = max(glow_size * 2, int(self.radius) + 13) + 2
+        return pygame.Rect(int(x) - extent, int(y) - extent, 2 * extent + 1, 2 * extent + 1)
+    
+    def draw(self, screen, alpha=1.0, glow='full'):
+        # Position interpolée entre les deux derniers pas de simulation
+        x = self.prev_x + (self.x - self.prev_x) * alpha
+        y = self.prev_y + (self.y - self.prev_y) * alpha
+        
         # Effets visuels des bonus
         glow_multiplier = 1.0
         if self.speed_boost_time > 0:
@@ -652,7 +1848,6 @@ class Ball:
         
         # Lueur
         glow_size = int(self.radius * (1 + self.glow_intensity * 0.5) * glow_multiplier)
-        glow_surf = pygame.Surface((glow_size * 4, glow_size * 4), pygame.SRCALPHA)
         
         glow_color = self.color
         if self.rage_time > 0:
@@ -660,15 +1855,21 @@ class Ball:
         elif self.speed_boost_time > 0:
             glow_color = Color(255, 255, 100)
         
-        glow_alpha = int(120 * self.glow_intensity * glow_multiplier)
-        glow_surf.set_alpha(glow_alpha)
+        glow_alpha = min(255, int(120 * self.glow_intensity * glow_multiplier))
         glow_rgb = (
             max(0, min(255, glow_color.r)),
             max(0, min(255, glow_color.g)),
             max(0, min(255, glow_color.b))
         )
-        pygame.draw.circle(glow_surf, glow_rgb, (glow_size * 2, glow_size * 2), glow_size * 2)
-        screen.blit(glow_surf, (int(self.x - glow_size * 2), int(self.y - glow_size * 2)))
+        glow_radius = glow_size * 2
+        if glow == 'coarse':
+            # Halo plus serré (moitié moins de pixels mélangés), tailles et alphas quantifiés:
+            # le cache de sprites sert presque toujours
+            glow_radius = glow_size * 3 // 2 // GLOW_SIZE_STEP * GLOW_SIZE_STEP
+            glow_alpha = glow_alpha // GLOW_ALPHA_STEP * GLOW_ALPHA_STEP
+        if glow != 'off' and glow_radius > 0 and glow_alpha > 0:
+            glow_surf = circle_sprite(glow_rgb, glow_radius, glow_alpha)
+            screen.blit(glow_surf, (int(x - glow_radius), int(y - glow_radius)))
         
         # Corps principal
         main_color = (
@@ -676,19 +1877,19 @@ class Ball:
             max(0, min(255, self.color.g)),
             max(0, min(255, self.color.b))
         )
-        pygame.draw.circle(screen, main_color, (int(self.x), int(self.y)), int(self.radius))
+        pygame.draw.circle(screen, main_color, (int(x), int(y)), int(self.radius))
         
         # Bouclier
         if self.shield_strength > 0:
             shield_radius = int(self.radius + 8)
-            pygame.draw.circle(screen, (100, 200, 255), (int(self.x), int(self.y)), shield_radius, 4)
+            pygame.draw.circle(screen, (100, 200, 255), (int(x), int(y)), shield_radius, 4)
         
         # Barre de vie
         if self.health < self.max_health:
             bar_width = int(self.radius * 2.2)
             bar_height = 5
-            bar_x = int(self.x - bar_width // 2)
-            bar_y = int(self.y - self.radius - 12)
+            bar_x = int(x - bar_width // 2)
+            bar_y = int(y - self.radius - 12)
             
             # Fond de la barre
             pygame.draw.rect(screen, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
@@ -704,44 +1905,589 @@ class Ball:
             pygame.draw.rect(screen, health_color, (bar_x, bar_y, health_width, bar_height))
 
 class Disruption:
-    def __init__(self, disruption_type, duration):
+    def __init__(self, disruption_type, duration, clock: SimulationClock, rng=random):
         self.type = disruption_type
         self.duration = duration
-        self.start_time = time.time()
+        self.clock = clock
+        self.rng = rng
+        self.start_time = clock.now
         
     def is_active(self):
-        return time.time() - self.start_time < self.duration
+        return self.clock.now - self.start_time < self.duration
     
-    def apply_to_ball(self, ball):
-        if not self.is_active():
-            return
-            
+    def apply_to_ball(self, ball, dt, arena):
         if self.type == "gravity_flip":
-            ball.vy += 300 * (1/60)  # Gravité inversée plus forte
+            ball.vy += 300 * dt  # Gravité inversée plus forte
         elif self.type == "magnetic_field":
             # Attraction vers le centre de l'arène
-            center_x, center_y = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 200
+            center_x, center_y = arena.centroid_x, arena.centroid_y
             dx = center_x - ball.x
             dy = center_y - ball.y
             dist = math.sqrt(dx*dx + dy*dy)
             if dist > 0:
                 force = 150 / (dist + 1)
-                ball.vx += (dx / dist) * force * (1/60)
-                ball.vy += (dy / dist) * force * (1/60)
+                ball.vx += (dx / dist) * force * dt
+                ball.vy += (dy / dist) * force * dt
         elif self.type == "speed_boost":
-            ball.vx *= 1.03
-            ball.vy *= 1.03
+            boost = per_tick_factor(1.03, dt)
+            ball.vx *= boost
+            ball.vy *= boost
         elif self.type == "chaos":
-            if random.random() < 0.06:
-                ball.vx += random.uniform(-100, 100)
-                ball.vy += random.uniform(-100, 100)
+            if self.rng.random() < per_tick_chance(0.06, dt):
+                ball.vx += self.rng.uniform(-100, 100)
+                ball.vy += self.rng.uniform(-100, 100)
+
+BALL_TYPE_ORDER = list(BallType)
+BONUS_TYPE_ORDER = list(BonusType)
+DISRUPTION_TYPES = ["gravity_flip", "magnetic_field", "speed_boost", "chaos", "shape_morph"]
+DISRUPTION_NAMES = {
+    "gravity_flip": "🌀 GRAVITÉ INVERSÉE",
+    "magnetic_field": "🧲 CHAMP MAGNÉTIQUE",
+    "speed_boost": "⚡ ACCÉLÉRATION",
+    "chaos": "💥 CHAOS TOTAL",
+    "shape_morph": "🔄 MORPHING ARÈNE"
+}
+
+# Minuterie de balle réglée par chaque bonus à durée limitée
+BONUS_TIMERS = {
+    BonusType.SPEED_BOOST: 'speed_boost_time',
+    BonusType.SHIELD: 'shield_time',
+    BonusType.RAGE: 'rage_time'
+}
+
+# Événements de simulation (enregistrement des replays)
+EVENT_BONUS = 1        # type de bonus, x, y
+EVENT_DISRUPTION = 2   # type de perturbation, durée, forme de l'arène
+EVENT_CLONE = 3        # type de balle, x, y
+
+# Instantané: en-tête JSON (scalaires, config, stats) puis enregistrements binaires
+SNAPSHOT_MAGIC = b"ACS2"
+SNAPSHOT_HEADER = struct.Struct("<4sI")
+RNG_STATE = struct.Struct("<625I")
+BALL_RECORD = struct.Struct("<B13di?")
+
+class NumpyBallEngine:
+    """Moteur physique vectorisé: toutes les balles dans des tableaux contigus (structure de tableaux).
+    
+    Un tick complet (intégration, murs, perturbations, comportements, attaques)
+    s'exécute en opérations NumPy; les balles du jeu sont des vues EngineBall.
+    """
+    FIELDS = (
+        ('x', 'f8'), ('y', 'f8'), ('prev_x', 'f8'), ('prev_y', 'f8'), ('vx', 'f8'), ('vy', 'f8'),
+        ('radius', 'f8'), ('health', 'f8'), ('type_index', 'i1'),
+        ('last_attack', 'f8'), ('speed_boost_time', 'f8'), ('shield_time', 'f8'),
+        ('shield_strength', 'i4'), ('rage_time', 'f8'), ('damage_multiplier', 'f8'),
+        ('freeze_blast_ready', '?')
+    )
+    
+    def __init__(self, clock: SimulationClock, seed, capacity=256):
+        self.clock = clock
+        self.np_rng = np.random.default_rng(seed)
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.views = []
+        self.sweep_order = np.zeros(0, dtype=np.int64)  # Ordre du balayage au tick précédent
+        self.glow_intensity = 0.0
+        self.attack_cooldown = 0.8
+        
+        self.type_colors = np.array([COLORS[ball_type].to_tuple() for ball_type in BALL_TYPE_ORDER])
+        
+        # Table des multiplicateurs de dégâts [attaquant, cible]
+        self.damage_table = np.ones((len(BALL_TYPE_ORDER), len(BALL_TYPE_ORDER)))
+        for attacker, targets in DAMAGE_MULTIPLIERS.items():
+            for target, multiplier in targets.items():
+                self.damage_table[BALL_TYPE_ORDER.index(attacker), BALL_TYPE_ORDER.index(target)] = multiplier
+    
+    def add_ball(self, x, y, ball_type, rng):
+        if self.count == self.capacity:
+            self.capacity *= 2
+            for name, _ in self.FIELDS:
+                array = getattr(self, name)
+                grown = np.zeros(self.capacity, dtype=array.dtype)
+                grown[:self.count] = array[:self.count]
+                setattr(self, name, grown)
+        
+        # Mêmes tirages, dans le même ordre, que Ball.__init__
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.prev_x[i] = x
+        self.prev_y[i] = y
+        self.vx[i] = rng.uniform(-150, 150)
+        self.vy[i] = rng.uniform(-150, 150)
+        self.radius[i] = rng.uniform(MIN_BALL_RADIUS, MAX_BALL_RADIUS)
+        self.health[i] = 100.0
+        self.type_index[i] = BALL_TYPE_ORDER.index(ball_type)
+        self.last_attack[i] = -self.attack_cooldown
+        self.speed_boost_time[i] = 0
+        self.shield_time[i] = 0
+        self.shield_strength[i] = 0
+        self.rage_time[i] = 0
+        self.damage_multiplier[i] = 1.0
+        self.freeze_blast_ready[i] = False
+        self.count += 1
+        
+        view = EngineBall(self, i, ball_type)
+        self.views.append(view)
+        return view
+    
+    def pairs_within(self, sources, targets, radius):
+        """Paires (source, cible) distinctes à moins de radius.
+        
+        Petits ensembles: matrice de distances complète. Sinon hachage spatial
+        vectorisé avec des cellules de radius/3 (moins de candidats que 3x3 cellules de radius).
+        Retourne (i, j, dx, dy, dist) avec dx, dy orientés de i vers j.
+        """
+        x, y = self.x, self.y
+        radius_sq = radius * radius
+        
+        if len(sources) * len(targets) <= 65536:
+            dx = x[targets][None, :] - x[sources][:, None]
+            dy = y[targets][None, :] - y[sources][:, None]
+            dist_sq = dx * dx + dy * dy
+            rows, cols = np.nonzero(dist_sq < radius_sq)
+            i, j = sources[rows], targets[cols]
+            distinct = i != j
+            rows, cols = rows[distinct], cols[distinct]
+            return (i[distinct], j[distinct], dx[rows, cols], dy[rows, cols],
+                    np.sqrt(dist_sq[rows, cols]))
+        
+        subdivisions = 3
+        inv_cell = subdivisions / radius
+        offset = 1 << 20
+        stride = offset * 2
+        
+        # Cibles triées par cellule
+        keys = ((np.floor(x[targets] * inv_cell).astype(np.int64) + offset) * stride
+                + np.floor(y[targets] * inv_cell).astype(np.int64) + offset)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        sorted_targets = targets[order]
+        target_x = x[sorted_targets]
+        target_y = y[sorted_targets]
+        
+        # Sources triées aussi, pour des accès mémoire contigus
+        source_cx = np.floor(x[sources] * inv_cell).astype(np.int64) + offset
+        source_cy = np.floor(y[sources] * inv_cell).astype(np.int64) + offset
+        order = np.argsort(source_cx * stride + source_cy, kind='stable')
+        sources, source_cx, source_cy = sources[order], source_cx[order], source_cy[order]
+        source_x = x[sources]
+        source_y = y[sources]
+        source_slots = np.arange(len(sources))
+        
+        found = []
+        for ox in range(-subdivisions, subdivisions + 1):
+            for oy in range(-subdivisions, subdivisions + 1):
+                cell_keys = (source_cx + ox) * stride + source_cy + oy
+                starts = np.searchsorted(sorted_keys, cell_keys, 'left')
+                counts = np.searchsorted(sorted_keys, cell_keys, 'right') - starts
+                total = int(counts.sum())
+                if total == 0:
+                    continue
+                pair_source = np.repeat(source_slots, counts)
+                pair_target = np.arange(total) - np.repeat(np.cumsum(counts) - counts - starts, counts)
+                dx = target_x[pair_target] - source_x[pair_source]
+                dy = target_y[pair_target] - source_y[pair_source]
+                dist_sq = dx * dx + dy * dy
+                close = np.nonzero(dist_sq < radius_sq)[0]
+                found.append((sources[pair_source[close]], sorted_targets[pair_target[close]],
+                              dx[close], dy[close], dist_sq[close]))
+        
+        if not found:
+            empty = np.empty(0)
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), empty, empty, empty
+        
+        i, j, dx, dy, dist_sq = (np.concatenate(column) for column in zip(*found))
+        distinct = i != j
+        return i[distinct], j[distinct], dx[distinct], dy[distinct], np.sqrt(dist_sq[distinct])
+    
+    def step(self, dt, disruptions, arena, particles):
+        """Un tick complet pour toutes les balles; retourne les vues des balles mortes"""
+        n = self.count
+        if n == 0:
+            return []
+        now = self.clock.now
+        
+        # Positions du pas précédent, pour l'interpolation à l'affichage
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        
+        # Mouvement de base, avec rebonds sur les murs de l'arène
+        self.move_balls(arena, dt, n)
+        
+        # Effets des perturbations (expirations des perturbations et des bonus: planificateur)
+        for disruption in disruptions:
+            self.apply_disruption(disruption, n, dt, arena)
+        
+        # Comportements spécifiques au type
+        self.apply_type_behaviors(dt, n)
+        
+        # Attaques
+        self.attack(now, n, particles)
+        
+        # Particules de traînée
+        self.create_trail_particles(n, particles, dt)
+        
+        self.glow_intensity = (math.sin(now * 5) + 1) * 0.5
+        
+        dead = self.remove_dead(particles)
+        
+        # Chocs entre les balles restantes
+        self.resolve_collisions(self.count, arena)
+        return dead
+    
+    def sweep(self, n):
+        """Ordre des balles par bord gauche, retrié à partir de celui du tick précédent"""
+        order = self.sweep_order
+        if len(order) < n:
+            order = np.concatenate((order, np.arange(len(order), n)))
+        left = self.x[:n] - self.radius[:n]
+        # Tri stable (Timsort pour les flottants): quasi linéaire sur un ordre presque trié
+        order = order[np.argsort(left[order], kind='stable')]
+        sorted_left = left[order]
+        if len(order) > 1 and not (sorted_left[1:] > sorted_left[:-1]).all():
+            # Bords égaux: l'indice départage, comme SweepAndPrune
+            order = np.lexsort((np.arange(n), left))
+            sorted_left = left[order]
+        self.sweep_order = order
+        return order, sorted_left
+    
+    def resolve_collisions(self, n, arena):
+        """Version vectorisée de Ball.collide_with, toutes les paires en contact à la fois.
+        
+        La séparation peut repousser une balle dans un mur: les balles sont ensuite
+        ramenées dans le polygone rétréci, comme après Arena.move_ball.
+        """
+        if n < 2:
+            self.sweep_order = np.arange(n)
+            return
+        order, sorted_left = self.sweep(n)
+        x, y, radius = self.x, self.y, self.radius
+        
+        # Balayage: pour chaque balle, les suivantes dont le bord gauche précède son bord droit
+        right = x[order] + radius[order]
+        ends = np.searchsorted(sorted_left, right, side='right')
+        counts = np.maximum(ends - np.arange(n) - 1, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return
+        first = np.repeat(np.arange(n), counts)
+        second = first + 1 + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        i, j = order[first], order[second]
+        
+        dx = x[j] - x[i]
+        dy = y[j] - y[i]
+        reach = radius[i] + radius[j]
+        distance_sq = dx * dx + dy * dy
+        touching = distance_sq < reach * reach
+        if not touching.any():
+            return
+        i, j, dx, dy, reach, distance_sq = (i[touching], j[touching], dx[touching], dy[touching],
+                                            reach[touching], distance_sq[touching])
+        
+        distance = np.sqrt(distance_sq)
+        safe = np.where(distance > 0, distance, 1.0)
+        nx = np.where(distance > 0, dx / safe, 1.0)
+        ny = np.where(distance > 0, dy / safe, 0.0)
+        inverse_i = 1 / (radius[i] * radius[i])
+        inverse_j = 1 / (radius[j] * radius[j])
+        total_inverse = inverse_i + inverse_j
+        
+        # Séparation et impulsions cumulées sur toutes les paires (calculées sur l'état avant le choc)
+        overlap = (reach - distance) / total_inverse
+        approach = (self.vx[j] - self.vx[i]) * nx + (self.vy[j] - self.vy[i]) * ny
+        impulse = np.where(approach < 0, -(1 + BALL_RESTITUTION) * approach / total_inverse, 0.0)
+        
+        push_i, push_j = overlap * inverse_i, overlap * inverse_j
+        kick_i, kick_j = impulse * inverse_i, impulse * inverse_j
+        self.x[:n] += np.bincount(j, weights=nx * push_j, minlength=n) - np.bincount(i, weights=nx * push_i, minlength=n)
+        self.y[:n] += np.bincount(j, weights=ny * push_j, minlength=n) - np.bincount(i, weights=ny * push_i, minlength=n)
+        self.vx[:n] += np.bincount(j, weights=nx * kick_j, minlength=n) - np.bincount(i, weights=nx * kick_i, minlength=n)
+        self.vy[:n] += np.bincount(j, weights=ny * kick_j, minlength=n) - np.bincount(i, weights=ny * kick_i, minlength=n)
+        self.push_inside(arena, n)
+    
+    def move_balls(self, arena, dt, n):
+        """Version vectorisée de Arena.move_ball (mêmes règles, mêmes rebonds)"""
+        x, y = self.x[:n], self.y[:n]
+        vx, vy = self.vx[:n], self.vy[:n]
+        planes = arena.plane_array
+        norm_x, norm_y, offset = planes[:, 0], planes[:, 1], planes[:, 2]
+        inset = self.radius[:n] + WALL_MARGIN
+        
+        self.push_inside(arena, n)
+        
+        remaining = np.full(n, float(dt))
+        active = np.arange(n)
+        for _ in range(MAX_WALL_BOUNCES):
+            active_vx, active_vy = vx[active], vy[active]
+            approach = -(active_vx[:, None] * norm_x + active_vy[:, None] * norm_y)
+            distance = np.maximum(0.0, x[active][:, None] * norm_x + y[active][:, None] * norm_y
+                                  - offset - inset[active][:, None])
+            impact_time = np.full(approach.shape, np.inf)
+            np.divide(distance, approach, out=impact_time, where=approach > 0)
+            
+            wall = np.argmin(impact_time, axis=1)
+            hit_time = impact_time[np.arange(len(active)), wall]
+            hit = hit_time < remaining[active]
+            travel = np.where(hit, hit_time, remaining[active])
+            x[active] += active_vx * travel
+            y[active] += active_vy * travel
+            
+            active = active[hit]
+            if len(active) == 0:
+                break
+            remaining[active] -= hit_time[hit]
+            wall = wall[hit]
+            self.bounce(active, norm_x[wall], norm_y[wall])
+    
+    def push_inside(self, arena, n):
+        """Version vectorisée de Arena.push_inside sur les n premières balles"""
+        x, y = self.x[:n], self.y[:n]
+        vx, vy = self.vx[:n], self.vy[:n]
+        planes = arena.plane_array
+        norm_x, norm_y, offset = planes[:, 0], planes[:, 1], planes[:, 2]
+        inset = self.radius[:n] + WALL_MARGIN
+        
+        # Balles hors du polygone rétréci: projection, puis sommet du coin
+        previous = np.full(n, -1)
+        for _ in range(len(planes)):
+            depth = x[:, None] * norm_x + y[:, None] * norm_y - offset - inset[:, None]
+            wall = np.argmin(depth, axis=1)
+            deepest = depth[np.arange(n), wall]
+            indices = np.nonzero(deepest < -1e-9)[0]
+            if len(indices) == 0:
+                break
+            wall = wall[indices]
+            depth = deepest[indices]
+            first = previous[indices]
+            det = np.where(first >= 0, norm_x[first] * norm_y[wall] - norm_y[first] * norm_x[wall], 0.0)
+            corner = np.abs(det) > 1e-9
+            
+            side = indices[~corner]
+            x[side] -= norm_x[wall[~corner]] * depth[~corner]
+            y[side] -= norm_y[wall[~corner]] * depth[~corner]
+            
+            corners = indices[corner]
+            a, b, det = first[corner], wall[corner], det[corner]
+            offset_a = offset[a] + inset[corners]
+            offset_b = offset[b] + inset[corners]
+            x[corners] = (offset_a * norm_y[b] - norm_y[a] * offset_b) / det
+            y[corners] = (norm_x[a] * offset_b - offset_a * norm_x[b]) / det
+            
+            outward = vx[indices] * norm_x[wall] + vy[indices] * norm_y[wall] < 0
+            self.bounce(indices[outward], norm_x[wall][outward], norm_y[wall][outward])
+            previous[indices] = wall
+    
+    def bounce(self, indices, norm_x, norm_y):
+        """Version vectorisée de Arena.bounce"""
+        vx, vy = self.vx, self.vy
+        dot_product = vx[indices] * norm_x + vy[indices] * norm_y
+        new_vx = (vx[indices] - 2 * dot_product * norm_x) * 1.05
+        new_vy = (vy[indices] - 2 * dot_product * norm_y) * 1.05
+        speed = np.sqrt(new_vx * new_vx + new_vy * new_vy)
+        fast = speed > 600
+        new_vx[fast] = new_vx[fast] / speed[fast] * 600
+        new_vy[fast] = new_vy[fast] / speed[fast] * 600
+        vx[indices] = new_vx
+        vy[indices] = new_vy
+    
+    def apply_disruption(self, disruption, n, dt, arena):
+        vx, vy = self.vx[:n], self.vy[:n]
+        if disruption.type == "gravity_flip":
+            vy += 300 * dt
+        elif disruption.type == "magnetic_field":
+            center_x, center_y = arena.centroid_x, arena.centroid_y
+            dx = center_x - self.x[:n]
+            dy = center_y - self.y[:n]
+            dist = np.sqrt(dx * dx + dy * dy)
+            pulled = dist > 0
+            force = 150 / (dist[pulled] + 1)
+            vx[pulled] += dx[pulled] / dist[pulled] * force * dt
+            vy[pulled] += dy[pulled] / dist[pulled] * force * dt
+        elif disruption.type == "speed_boost":
+            boost = per_tick_factor(1.03, dt)
+            vx *= boost
+            vy *= boost
+        elif disruption.type == "chaos":
+            hit = self.np_rng.random(n) < per_tick_chance(0.06, dt)
+            count = int(hit.sum())
+            vx[hit] += self.np_rng.uniform(-100, 100, count)
+            vy[hit] += self.np_rng.uniform(-100, 100, count)
+    
+    def apply_type_behaviors(self, dt, n):
+        vx, vy = self.vx[:n], self.vy[:n]
+        types = self.type_index[:n]
+        fire = np.nonzero(types == BALL_TYPE_ORDER.index(BallType.FIRE))[0]
+        ice = np.nonzero(types == BALL_TYPE_ORDER.index(BallType.ICE))[0]
+        metal = np.nonzero(types == BALL_TYPE_ORDER.index(BallType.METAL))[0]
+        lightning = np.nonzero(types == BALL_TYPE_ORDER.index(BallType.LIGHTNING))[0]
+        poison = np.nonzero(types == BALL_TYPE_ORDER.index(BallType.POISON))[0]
+        
+        # Le feu accélère vers la glace, les métaux s'attirent
+        for sources, targets, radius, strength in ((fire, ice, 200, 80), (metal, metal, 150, 50)):
+            i, j, dx, dy, dist = self.pairs_within(sources, targets, radius)
+            pulled = dist > 0
+            i, dx, dy, dist = i[pulled], dx[pulled], dy[pulled], dist[pulled]
+            force = strength / (dist + 1) * dt
+            vx += np.bincount(i, weights=dx / dist * force, minlength=n)
+            vy += np.bincount(i, weights=dy / dist * force, minlength=n)
+        
+        # Ralentissement de la glace
+        slowdown = per_tick_factor(0.999, dt)
+        vx[ice] *= slowdown
+        vy[ice] *= slowdown
+        
+        # Mouvement erratique de la foudre
+        jolted = lightning[self.np_rng.random(len(lightning)) < per_tick_chance(0.08, dt)]
+        vx[jolted] += self.np_rng.uniform(-80, 80, len(jolted))
+        vy[jolted] += self.np_rng.uniform(-80, 80, len(jolted))
+        
+        # Aura de poison
+        everyone = np.arange(n)
+        _, j, _, _, _ = self.pairs_within(poison, everyone, 100)
+        j = j[self.shield_strength[j] <= 0]
+        self.health[:n] -= np.bincount(j, minlength=n) * (8 * dt)
+    
+    def attack(self, now, n, particles):
+        """Chaque balle prête frappe la première balle au contact (même ordre que Ball.attack_nearby_balls)"""
+        ready = np.nonzero(now - self.last_attack[:n] >= self.attack_cooldown)[0]
+        if len(ready) == 0:
+            return
+        
+        radius = self.radius
+        max_radius = radius[:n].max()
+        i, j, _, _, dist = self.pairs_within(ready, np.arange(n), max_radius * 2 + 15)
+        contact = dist < radius[i] + radius[j] + 15
+        i, j = i[contact], j[contact]
+        if len(i) == 0:
+            return
+        
+        # Première cible (indice le plus bas) de chaque attaquant
+        order = np.lexsort((j, i))
+        i, j = i[order], j[order]
+        _, first = np.unique(i, return_index=True)
+        attackers, targets = i[first], j[first]
+        
+        damage = (25 * self.damage_table[self.type_index[attackers], self.type_index[targets]]
+                  * self.damage_multiplier[attackers])
+        
+        # Le bouclier absorbe les premiers coups reçus (dans l'ordre des attaquants)
+        order = np.lexsort((attackers, targets))
+        attackers, targets, damage = attackers[order], targets[order], damage[order]
+        unique_targets, first_hit, hits = np.unique(targets, return_index=True, return_counts=True)
+        rank = np.arange(len(targets)) - np.repeat(first_hit, hits)
+        shielded = rank < self.shield_strength[targets]
+        damage[shielded] *= 0.3
+        self.shield_strength[unique_targets] = np.maximum(0, self.shield_strength[unique_targets] - hits)
+        
+        self.health[:n] -= np.bincount(targets, weights=damage, minlength=n)
+        self.last_attack[attackers] = now
+        
+        # Freeze blast
+        freezers = attackers[self.freeze_blast_ready[attackers]]
+        if len(freezers):
+            _, frozen, _, _, _ = self.pairs_within(freezers, np.arange(n), 200)
+            np.multiply.at(self.vx, frozen, 0.1)
+            np.multiply.at(self.vy, frozen, 0.1)
+            self.freeze_blast_ready[freezers] = False
+            for k in freezers:
+                self.views[k].create_freeze_particles(particles)
+        
+        # Effet visuel d'attaque
+        for a, t in zip(attackers, targets):
+            self.views[a].create_attack_particles(self.views[t], particles)
+    
+    def create_trail_particles(self, n, particles, dt):
+        emitters = np.nonzero(np.random.random(n) < per_tick_chance(0.4 * particles.trail_rate, dt))[0]
+        if len(emitters) == 0:
+            return
+        
+        # Couleur du type, remplacée par celle des bonus actifs
+        colors = self.type_colors[self.type_index[emitters]]
+        colors[self.rage_time[emitters] > 0] = (255, 100, 100)
+        colors[self.speed_boost_time[emitters] > 0] = (255, 255, 100)
+        
+        particles.emit(self.x[emitters], self.y[emitters], len(emitters), 80, colors, (0.5, 1.8),
+                       spread=self.radius[emitters])
+    
+    def remove_dead(self, particles):
+        n = self.count
+        alive = self.health[:n] > 0
+        if alive.all():
+            return []
+        
+        dead = [view for view, keep in zip(self.views, alive) if not keep]
+        for view in dead:
+            view.explode(particles)
+        
+        # Ordre du balayage ramené aux indices après compactage
+        self.sweep_order = (np.cumsum(alive) - 1)[self.sweep_order[alive[self.sweep_order]]]
+        
+        # Compactage des tableaux (l'ordre des balles est conservé)
+        remaining = int(alive.sum())
+        for name, _ in self.FIELDS:
+            array = getattr(self, name)
+            array[:remaining] = array[:n][alive]
+        self.count = remaining
+        
+        self.views = [view for view, keep in zip(self.views, alive) if keep]
+        for index, view in enumerate(self.views):
+            view.index = index
+        for view in dead:
+            view.engine = None
+        return dead
+
+def _engine_field(name):
+    """Propriété qui lit/écrit la case de la balle dans les tableaux du moteur"""
+    def getter(self):
+        return getattr(self.engine, name)[self.index].item()
+    
+    def setter(self, value):
+        getattr(self.engine, name)[self.index] = value
+    
+    return property(getter, setter)
+
+class EngineBall(Ball):
+    """Vue d'une balle du moteur NumPy, pour le dessin et les statistiques"""
+    x = _engine_field('x')
+    y = _engine_field('y')
+    prev_x = _engine_field('prev_x')
+    prev_y = _engine_field('prev_y')
+    vx = _engine_field('vx')
+    vy = _engine_field('vy')
+    radius = _engine_field('radius')
+    health = _engine_field('health')
+    last_attack = _engine_field('last_attack')
+    speed_boost_time = _engine_field('speed_boost_time')
+    shield_time = _engine_field('shield_time')
+    shield_strength = _engine_field('shield_strength')
+    rage_time = _engine_field('rage_time')
+    damage_multiplier = _engine_field('damage_multiplier')
+    freeze_blast_ready = _engine_field('freeze_blast_ready')
+    
+    def __init__(self, engine, index, ball_type: BallType):
+        self.engine = engine
+        self.index = index
+        self.clock = engine.clock
+        self.type = ball_type
+        self.color = COLORS[ball_type]
+        self.max_health = 100.0
+        self.attack_cooldown = engine.attack_cooldown
+    
+    @property
+    def glow_intensity(self):
+        return self.engine.glow_intensity
+    
+    @property
+    def alive(self):
+        return self.engine is not None
 
 class Menu:
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font(None, 72)
-        self.menu_font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 36)
+        self.background = GradientBackground(Color(20, 30, 60), 5, 2, 0.01)
         
         # Configuration du jeu
         self.ball_count = 8
@@ -804,28 +2550,20 @@ class Menu:
     
     def draw(self):
         # Fond dégradé
-        for y in range(0, SCREEN_HEIGHT, 5):
-            gradient_factor = y / SCREEN_HEIGHT
-            wave = math.sin(time.time() * 2 + y * 0.01) * 0.1
-            
-            color_r = max(0, min(255, int(20 * (1 - gradient_factor * 0.4 + wave))))
-            color_g = max(0, min(255, int(30 * (1 - gradient_factor * 0.3 + wave))))
-            color_b = max(0, min(255, int(60 * (1 + gradient_factor * 0.6 + wave))))
-            
-            pygame.draw.rect(self.screen, (color_r, color_g, color_b), (0, y, SCREEN_WIDTH, 5))
+        self.background.draw(self.screen, time.time())
         
         # Titre principal
-        title_text = self.font.render("🔥 ARENA COMBAT 🔥", True, (255, 255, 100))
+        title_text = render_text("🔥 ARENA COMBAT 🔥", 72, (255, 255, 100))
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
         
         # Effet d'ombre pour le titre
-        shadow_text = self.font.render("🔥 ARENA COMBAT 🔥", True, (100, 50, 0))
+        shadow_text = render_text("🔥 ARENA COMBAT 🔥", 72, (100, 50, 0))
         shadow_rect = shadow_text.get_rect(center=(title_rect.centerx + 3, title_rect.centery + 3))
         self.screen.blit(shadow_text, shadow_rect)
         self.screen.blit(title_text, title_rect)
         
         # Sous-titre
-        subtitle_text = self.small_font.render("Configurez votre bataille épique", True, (200, 200, 200))
+        subtitle_text = render_text("Configurez votre bataille épique", 36, (200, 200, 200))
         subtitle_rect = subtitle_text.get_rect(center=(SCREEN_WIDTH // 2, 220))
         self.screen.blit(subtitle_text, subtitle_rect)
         
@@ -852,23 +2590,20 @@ class Menu:
             elif option == "Quitter":
                 option_text = "❌ " + option
             
-            text = self.menu_font.render(option_text, True, color)
+            text = render_text(option_text, 48, color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, menu_start_y + i * 80))
             
             # Surbrillance de l'option sélectionnée
             if i == self.selected_option:
                 # Effet de pulsation
                 pulse = math.sin(time.time() * 6) * 0.1 + 0.9
-                scaled_text = pygame.transform.scale(text, 
-                    (int(text.get_width() * pulse), int(text.get_height() * pulse)))
+                scaled_text = render_pulsed(option_text, 48, color, pulse)
                 scaled_rect = scaled_text.get_rect(center=text_rect.center)
                 
                 # Fond lumineux
                 glow_rect = pygame.Rect(scaled_rect.left - 20, scaled_rect.top - 10, 
                                       scaled_rect.width + 40, scaled_rect.height + 20)
-                glow_surf = pygame.Surface((glow_rect.width, glow_rect.height), pygame.SRCALPHA)
-                pygame.draw.rect(glow_surf, (50, 100, 255, 100), (0, 0, glow_rect.width, glow_rect.height))
-                self.screen.blit(glow_surf, glow_rect.topleft)
+                self.screen.blit(highlight_panel(glow_rect.width, glow_rect.height), glow_rect.topleft)
                 
                 self.screen.blit(scaled_text, scaled_rect)
             else:
@@ -890,7 +2625,7 @@ class Menu:
             if i >= 2:  # Info sur les types
                 color = (150, 255, 150)
             
-            text = self.small_font.render(instruction, True, color)
+            text = render_text(instruction, 36, color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, instructions_start_y + i * 30))
             self.screen.blit(text, text_rect)
     
@@ -904,12 +2639,11 @@ class Menu:
         }
 
 class GameOverScreen:
-    def __init__(self, screen, game_stats):
+    def __init__(self, screen, game_stats, display_time=time.time):
         self.screen = screen
-        self.font = pygame.font.Font(None, 72)
-        self.menu_font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 36)
         self.stats = game_stats
+        self.display_time = display_time
+        self.background = GradientBackground(Color(40, 20, 60), 5, 1.5, 0.005)
         self.selected_option = 0
         self.options = ["Rejouer", "Menu Principal", "Quitter"]
         
@@ -936,22 +2670,14 @@ class GameOverScreen:
     
     def draw(self):
         # Fond sombre avec particules
-        for y in range(0, SCREEN_HEIGHT, 5):
-            gradient_factor = y / SCREEN_HEIGHT
-            wave = math.sin(time.time() * 1.5 + y * 0.005) * 0.1
-            
-            color_r = max(0, min(255, int(40 * (1 - gradient_factor * 0.4 + wave))))
-            color_g = max(0, min(255, int(20 * (1 - gradient_factor * 0.3 + wave))))
-            color_b = max(0, min(255, int(60 * (1 + gradient_factor * 0.6 + wave))))
-            
-            pygame.draw.rect(self.screen, (color_r, color_g, color_b), (0, y, SCREEN_WIDTH, 5))
+        self.background.draw(self.screen, self.display_time())
         
         # Titre
-        title_text = self.font.render("💥 BATAILLE TERMINÉE! 💥", True, (255, 150, 150))
+        title_text = render_text("💥 BATAILLE TERMINÉE! 💥", 72, (255, 150, 150))
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
         
         # Effet d'ombre
-        shadow_text = self.font.render("💥 BATAILLE TERMINÉE! 💥", True, (100, 50, 50))
+        shadow_text = render_text("💥 BATAILLE TERMINÉE! 💥", 72, (100, 50, 50))
         shadow_rect = shadow_text.get_rect(center=(title_rect.centerx + 3, title_rect.centery + 3))
         self.screen.blit(shadow_text, shadow_rect)
         self.screen.blit(title_text, title_rect)
@@ -970,7 +2696,7 @@ class GameOverScreen:
         for i, stat_line in enumerate(stat_lines):
             color = (255, 255, 100) if i < 3 else (200, 200, 200)  # Highlight key stats
             
-            text = self.menu_font.render(stat_line, True, color)
+            text = render_text(stat_line, 48, color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, stats_start_y + i * 50))
             self.screen.blit(text, text_rect)
         
@@ -985,8 +2711,8 @@ class GameOverScreen:
                 BallType.POISON: "☠️ POISON"
             }
             
-            winner_text = self.menu_font.render(f"🥇 Type dominant: {type_names.get(most_common, 'INCONNU')}", 
-                                              True, (255, 255, 0))
+            winner_text = render_text(f"🥇 Type dominant: {type_names.get(most_common, 'INCONNU')}",
+                                      48, (255, 255, 0))
             winner_rect = winner_text.get_rect(center=(SCREEN_WIDTH // 2, stats_start_y + len(stat_lines) * 50 + 30))
             self.screen.blit(winner_text, winner_rect)
         
@@ -1003,48 +2729,55 @@ class GameOverScreen:
             elif option == "Quitter":
                 option_text = "❌ " + option
             
-            text = self.menu_font.render(option_text, True, color)
+            text = render_text(option_text, 48, color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH // 2, menu_start_y + i * 60))
             
             # Surbrillance
             if i == self.selected_option:
-                pulse = math.sin(time.time() * 6) * 0.1 + 0.9
-                scaled_text = pygame.transform.scale(text, 
-                    (int(text.get_width() * pulse), int(text.get_height() * pulse)))
+                pulse = math.sin(self.display_time() * 6) * 0.1 + 0.9
+                scaled_text = render_pulsed(option_text, 48, color, pulse)
                 scaled_rect = scaled_text.get_rect(center=text_rect.center)
                 
                 glow_rect = pygame.Rect(scaled_rect.left - 20, scaled_rect.top - 10, 
                                       scaled_rect.width + 40, scaled_rect.height + 20)
-                glow_surf = pygame.Surface((glow_rect.width, glow_rect.height), pygame.SRCALPHA)
-                pygame.draw.rect(glow_surf, (50, 100, 255, 100), (0, 0, glow_rect.width, glow_rect.height))
-                self.screen.blit(glow_surf, glow_rect.topleft)
+                self.screen.blit(highlight_panel(glow_rect.width, glow_rect.height), glow_rect.topleft)
                 
                 self.screen.blit(scaled_text, scaled_rect)
             else:
                 self.screen.blit(text, text_rect)
         
         # Instructions
-        instruction_text = self.small_font.render("↑↓ Naviguer  ENTRÉE Sélectionner", True, (200, 200, 200))
+        instruction_text = render_text("↑↓ Naviguer  ENTRÉE Sélectionner", 36, (200, 200, 200))
         instruction_rect = instruction_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
         self.screen.blit(instruction_text, instruction_rect)
 
-class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("🔥 ARENA COMBAT - Battle Royale! 🔥")
-        self.clock = pygame.time.Clock()
-        
-        # État du jeu
+class BattleSimulation:
+    """Simulation du combat seule: arène, balles, bonus et perturbations, sans affichage ni polices.
+    
+    Tout l'état (horloge, hasard, arène, planificateur) appartient à l'instance: plusieurs
+    mondes indépendants peuvent tourner dans le même processus (voir worlds.py).
+    width et height donnent l'aire de jeu où l'arène est centrée; particle_capacity borne
+    le pool de particules (purement visuelles, un petit pool suffit sans affichage).
+    """
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, particle_capacity=65536):
         self.state = GameState.MENU
-        self.menu = Menu(self.screen)
-        self.game_over_screen = None
+        self.width = width
+        self.height = height
+        self.particle_capacity = particle_capacity
         
         # Objets du jeu
         self.balls = []
-        self.particles = []
+        self.particles = create_particle_system(particle_capacity)
         self.disruptions = []
-        self.bonuses = []
-        self.arena = Arena()
+        self.bonuses = {}  # ensemble ordonné (ordre d'apparition), retrait en O(1)
+        self.bonus_index = BonusIndex()
+        self.arena = Arena(width, height)
+        self.grid = SpatialGrid()
+        self.sweep = SweepAndPrune()
+        self.engine = None
+        
+        # Instrumentation (désactivée par défaut)
+        self.profiler = FrameProfiler()
         
         # Configuration
         self.config = {}
@@ -1052,21 +2785,29 @@ class Game:
         # Statistiques
         self.game_stats = {}
         
-        # Temps
+        # Temps et hasard de la simulation (les particules restent sur le hasard global)
+        self.sim_clock = SimulationClock()
+        self.seed = None
+        self.rng = random.Random()
         self.start_time = 0
         self.last_disruption = 0
         self.last_bonus_spawn = 0
-        self.paused = False
         
-        # Interface
+        # Enregistreur de replay éventuel (événements et images clés)
+        self.recorder = None
+        
+        # Apparitions et expirations planifiées
+        self.scheduler = EventScheduler()
+        
+        # Pas fixe: temps réel accumulé pas encore simulé, fraction pour l'interpolation
+        self.sim_dt = 1.0 / SIM_HZ
+        self.accumulator = 0.0
+        self.render_alpha = 1.0
+        
+        # Intensité du combat
         self.bg_color = Color(15, 15, 30)
         self.combat_intensity = 0
         
-        # Polices
-        self.font = pygame.font.Font(None, 48)
-        self.big_font = pygame.font.Font(None, 84)
-        self.small_font = pygame.font.Font(None, 36)
-        
     def start_new_game(self, config):
         """Démarre une nouvelle partie avec la configuration donnée"""
         self.config = config
@@ -1074,19 +2815,42 @@ class Game:
         
         # Réinitialiser les objets
         self.balls = []
-        self.particles = []
+        self.particles.clear()
         self.disruptions = []
-        self.bonuses = []
+        self.bonuses = {}
+        self.bonus_index.clear()
+        self.sweep.clear()
+        
+        # Même graine + même configuration = même bataille
+        self.seed = config.get('seed')
+        if self.seed is None:
+            self.seed = random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.sim_clock.reset()
+        self.sim_dt = 1.0 / config.get('sim_hz', SIM_HZ)
+        self.accumulator = 0.0
+        self.render_alpha = 1.0
+        
+        # Moteur physique: objets Python (défaut) ou tableaux NumPy
+        self.engine = None
+        if config.get('engine', 'objects') == 'numpy':
+            if np is None:
+                raise RuntimeError("Le moteur 'numpy' nécessite NumPy (pip install numpy)")
+            self.engine = NumpyBallEngine(self.sim_clock, self.rng.getrandbits(64))
+            self.balls = self.engine.views
         
         # Configurer l'arène
-        self.arena.shape_type = config['arena_shape']
-        self.arena.generate_shape()
+        if config.get('arena_vertices'):
+            self.arena.set_custom_shape(config['arena_vertices'])
+        else:
+            self.arena.shape_type = config['arena_shape']
+            self.arena.generate_shape()
         
         # Créer les balles initiales (plus de spawn aléatoire!)
         self.spawn_initial_balls(config['ball_count'])
         
         # Initialiser les temps
-        self.start_time = time.time()
+        self.start_time = self.sim_clock.now
         self.last_disruption = 0
         self.last_bonus_spawn = 0
         
@@ -1097,94 +2861,206 @@ class Game:
             'disruptions_triggered': 0,
             'duration': 0,
             'survivors': 0,
-            'survivor_types': {}
+            'survivor_types': {},
+            'seed': self.seed
         }
-        
+        self.rebuild_schedule()
+        
+    def rebuild_schedule(self):
+        """Replanifie tous les événements à partir de l'état (début de partie, restauration)"""
+        self.scheduler.clear()
+        self.scheduler.schedule(self.start_time + self.last_disruption + self.config['disruption_interval'],
+                                PRIORITY_DISRUPTION, self.disruption_due)
+        self.scheduler.schedule(self.start_time + self.last_bonus_spawn + self.config['bonus_spawn_interval'],
+                                PRIORITY_BONUS_SPAWN, self.bonus_spawn_due)
+        for bonus in self.bonuses:
+            self.scheduler.schedule(bonus.spawn_time + bonus.life_time, PRIORITY_BONUS_EXPIRY, self.expire_bonus, bonus)
+        for disruption in self.disruptions:
+            self.scheduler.schedule(disruption.start_time + disruption.duration, PRIORITY_DISRUPTION_EXPIRY,
+                                    self.expire_disruption, disruption)
+        for ball in self.balls:
+            for timer in ('speed_boost_time', 'shield_time', 'rage_time'):
+                self.schedule_ball_timer(ball, timer)
+    
+    def retry_next_tick(self, priority, callback, *args):
+        """Condition exacte pas encore vraie (arrondi): nouvel essai au tick suivant"""
+        self.scheduler.schedule(self.sim_clock.now + 2 * self.scheduler.tolerance, priority, callback, *args)
+    
+    def disruption_due(self):
+        elapsed_time = self.sim_clock.now - self.start_time
+        if elapsed_time - self.last_disruption < self.config['disruption_interval']:
+            self.retry_next_tick(PRIORITY_DISRUPTION, self.disruption_due)
+            return
+        self.add_disruption()
+        self.last_disruption = elapsed_time
+        self.scheduler.schedule(self.start_time + elapsed_time + self.config['disruption_interval'],
+                                PRIORITY_DISRUPTION, self.disruption_due)
+    
+    def bonus_spawn_due(self):
+        elapsed_time = self.sim_clock.now - self.start_time
+        if elapsed_time - self.last_bonus_spawn < self.config['bonus_spawn_interval']:
+            self.retry_next_tick(PRIORITY_BONUS_SPAWN, self.bonus_spawn_due)
+            return
+        self.spawn_bonus()
+        self.last_bonus_spawn = elapsed_time
+        self.scheduler.schedule(self.start_time + elapsed_time + self.config['bonus_spawn_interval'],
+                                PRIORITY_BONUS_SPAWN, self.bonus_spawn_due)
+    
+    def expire_bonus(self, bonus):
+        if bonus.collected:
+            return  # Ramassé entre-temps
+        if not bonus.is_expired():
+            self.retry_next_tick(PRIORITY_BONUS_EXPIRY, self.expire_bonus, bonus)
+            return
+        self.remove_bonus(bonus)
+    
+    def add_bonus(self, bonus):
+        self.bonuses[bonus] = None
+        self.bonus_index.add(bonus)
+    
+    def remove_bonus(self, bonus):
+        del self.bonuses[bonus]
+        self.bonus_index.remove(bonus)
+    
+    def expire_disruption(self, disruption):
+        if disruption.is_active():
+            self.retry_next_tick(PRIORITY_DISRUPTION_EXPIRY, self.expire_disruption, disruption)
+            return
+        self.disruptions.remove(disruption)
+    
+    def schedule_ball_timer(self, ball, timer):
+        """Planifie la fin d'un effet de bonus (vitesse, bouclier, rage) à son échéance actuelle"""
+        deadline = getattr(ball, timer)
+        if deadline > 0:
+            self.scheduler.schedule(deadline, PRIORITY_BALL_TIMER, self.expire_ball_timer, ball, timer, deadline)
+    
+    def expire_ball_timer(self, ball, timer, deadline):
+        # Balle morte, ou effet prolongé par un nouveau bonus: un autre événement porte la nouvelle échéance
+        if not ball.alive or getattr(ball, timer) != deadline:
+            return
+        if self.sim_clock.now <= deadline:
+            self.retry_next_tick(PRIORITY_BALL_TIMER, self.expire_ball_timer, ball, timer, deadline)
+            return
+        setattr(ball, timer, 0)
+        if timer == 'shield_time':
+            ball.shield_strength = 0
+        elif timer == 'rage_time':
+            ball.damage_multiplier = 1.0
+    
+    def create_ball(self, x, y, ball_type):
+        """Crée une balle (objet Python ou vue sur le moteur NumPy) et l'ajoute au combat"""
+        if self.engine:
+            return self.engine.add_ball(x, y, ball_type, self.rng)
+        ball = Ball(x, y, ball_type, self.sim_clock, self.rng)
+        self.balls.append(ball)
+        return ball
+    
     def spawn_initial_balls(self, count):
         """Spawn les balles au début du jeu uniquement"""
         ball_types = list(BallType)
-        arena_center_x = self.arena.center_x
-        arena_center_y = self.arena.center_y + 200
+        arena_center_x = self.arena.centroid_x
+        arena_center_y = self.arena.centroid_y
         
         for _ in range(count):
             # Spawn dans l'arène de façon plus contrôlée
             attempts = 0
             while attempts < 20:  # Éviter les boucles infinies
-                angle = random.uniform(0, 2 * math.pi)
-                radius = random.uniform(50, 200)
+                angle = self.rng.uniform(0, 2 * math.pi)
+                radius = self.rng.uniform(50, 200) * self.arena.scale
                 x = arena_center_x + radius * math.cos(angle)
                 y = arena_center_y + radius * math.sin(angle)
                 
                 # Vérifier que la position est valide
                 if self.arena.is_point_inside(x, y):
-                    ball_type = random.choice(ball_types)
-                    self.balls.append(Ball(x, y, ball_type))
+                    ball_type = self.rng.choice(ball_types)
+                    self.create_ball(x, y, ball_type)
                     break
                 attempts += 1
     
     def spawn_bonus(self):
         """Spawn un bonus dans l'arène"""
-        arena_center_x = self.arena.center_x
-        arena_center_y = self.arena.center_y + 200
+        arena_center_x = self.arena.centroid_x
+        arena_center_y = self.arena.centroid_y
         
         attempts = 0
         while attempts < 10:
-            angle = random.uniform(0, 2 * math.pi)
-            radius = random.uniform(80, 250)
+            angle = self.rng.uniform(0, 2 * math.pi)
+            radius = self.rng.uniform(80, 250) * self.arena.scale
             x = arena_center_x + radius * math.cos(angle)
             y = arena_center_y + radius * math.sin(angle)
             
             if self.arena.is_point_inside(x, y):
                 bonus_types = list(BonusType)
-                bonus_type = random.choice(bonus_types)
-                self.bonuses.append(Bonus(x, y, bonus_type))
+                bonus_type = self.rng.choice(bonus_types)
+                bonus = Bonus(x, y, bonus_type, self.sim_clock)
+                self.add_bonus(bonus)
+                self.scheduler.schedule(bonus.spawn_time + bonus.life_time, PRIORITY_BONUS_EXPIRY,
+                                        self.expire_bonus, bonus)
+                self.record_event(EVENT_BONUS, BONUS_TYPE_ORDER.index(bonus_type), x, y)
                 break
             attempts += 1
     
-    def add_disruption(self):
-        """Ajoute une perturbation (mais plus de balles aléatoires!)"""
-        disruption_types = ["gravity_flip", "magnetic_field", "speed_boost", "chaos", "shape_morph"]
-        disruption_type = random.choice(disruption_types)
-        duration = random.uniform(4, 10)
+    def add_disruption(self, disruption_type=None):
+        """Ajoute une perturbation (mais plus de balles aléatoires!), tirée au hasard si le type n'est pas imposé"""
+        if disruption_type is None:
+            disruption_type = self.rng.choice(DISRUPTION_TYPES)
+        duration = self.rng.uniform(4, 10)
         
         # Shape morph change la forme de l'arène
         if disruption_type == "shape_morph":
             shapes = ["hexagon", "octagon", "diamond"]
             current_shape = self.arena.shape_type
             new_shapes = [s for s in shapes if s != current_shape]
-            self.arena.shape_type = random.choice(new_shapes)
+            self.arena.shape_type = self.rng.choice(new_shapes)
             self.arena.generate_shape()
             duration = 15.0  # Plus long pour que ce soit visible
         
-        self.disruptions.append(Disruption(disruption_type, duration))
+        disruption = Disruption(disruption_type, duration, self.sim_clock, self.rng)
+        self.disruptions.append(disruption)
+        self.scheduler.schedule(disruption.start_time + duration, PRIORITY_DISRUPTION_EXPIRY,
+                                self.expire_disruption, disruption)
         self.game_stats['disruptions_triggered'] += 1
+        self.record_event(EVENT_DISRUPTION, disruption_type, duration, self.arena.shape_type)
         
         # PAS DE BALLES SUPPLÉMENTAIRES - c'était le comportement indésirable!
     
     def handle_bonus_effects(self):
-        """Gérer les effets spéciaux des bonus collectés"""
-        for ball in self.balls[:]:
-            for bonus in self.bonuses[:]:
+        """Gérer les effets spéciaux des bonus collectés.
+        
+        Seules les balles dont la cellule touche un bonus sont testées. Même ordre que le
+        parcours complet: balles dans l'ordre de la liste, puis bonus dans l'ordre d'apparition;
+        à égalité la première balle de la liste ramasse le bonus, les clones créés ce tick ne ramassent rien.
+        """
+        index = self.bonus_index
+        if not index:
+            return
+        
+        if self.engine:
+            views = self.engine.views
+            balls = [views[i] for i in index.occupied(self.engine.x[:self.engine.count],
+                                                        self.engine.y[:self.engine.count])]
+        else:
+            balls = self.balls[:]
+        
+        for ball in balls:
+            for bonus in index.candidates(ball.x, ball.y):
                 if bonus.check_collision(ball):
                     if bonus.type == BonusType.MULTIPLY:
                         # Dupliquer la balle
-                        new_ball = Ball(ball.x + 30, ball.y + 30, ball.type)
+                        new_ball = self.create_ball(ball.x + 30, ball.y + 30, ball.type)
                         new_ball.vx = -ball.vx * 0.8
                         new_ball.vy = -ball.vy * 0.8
-                        self.balls.append(new_ball)
+                        self.record_event(EVENT_CLONE, BALL_TYPE_ORDER.index(ball.type), new_ball.x, new_ball.y)
+                    
+                    # Fin de l'effet planifiée
+                    timer = BONUS_TIMERS.get(bonus.type)
+                    if timer:
+                        self.schedule_ball_timer(ball, timer)
                     
                     # Créer des particules d'effet
-                    for _ in range(15):
-                        self.particles.append(Particle(
-                            bonus.x,
-                            bonus.y,
-                            random.uniform(-200, 200),
-                            random.uniform(-200, 200),
-                            bonus.color,
-                            random.uniform(1.0, 2.0)
-                        ))
+                    self.particles.emit(bonus.x, bonus.y, 15, 200, bonus.color, (1.0, 2.0))
                     
-                    self.bonuses.remove(bonus)
+                    self.remove_bonus(bonus)
                     self.game_stats['bonuses_collected'] += 1
     
     def update_background_intensity(self):
@@ -1201,53 +3077,94 @@ class Game:
         intense_color = Color(80, 30, 60)  # Plus violet/rouge pour l'intensité
         self.bg_color = base_color.lerp(intense_color, self.combat_intensity)
     
+    def step(self, dt):
+        """Avance l'horloge de simulation de dt puis exécute un tick"""
+        self.sim_clock.advance(dt)
+        self.update_game_logic(dt, self.sim_clock.now - self.start_time)
+        if self.recorder:
+            self.recorder.on_step(self)
+    
+    def record_event(self, kind, *values):
+        if self.recorder:
+            self.recorder.record_event(self.sim_clock.now - self.start_time, kind, values)
+    
+    def advance(self, frame_time):
+        """Consomme le temps réel écoulé par pas fixes de sim_dt.
+        
+        Le reste non simulé est gardé pour la trame suivante; retourne la fraction
+        de pas (0-1) qui sert à interpoler l'affichage. Au-delà de MAX_CATCH_UP_STEPS
+        pas dans une trame, le retard est abandonné: la partie ralentit au lieu de
+        s'enliser sur une machine trop lente.
+        """
+        self.accumulator += frame_time
+        steps = 0
+        while self.accumulator >= self.sim_dt and self.state == GameState.PLAYING:
+            if steps == MAX_CATCH_UP_STEPS:
+                self.accumulator %= self.sim_dt
+                break
+            self.step(self.sim_dt)
+            self.accumulator -= self.sim_dt
+            steps += 1
+        
+        self.render_alpha = min(1.0, self.accumulator / self.sim_dt)
+        return self.render_alpha
+    
     def update_game_logic(self, dt, elapsed_time):
         """Logique principale du jeu"""
         # Vérifier la fin du jeu
         if elapsed_time >= self.config['game_duration']:
-            self.end_game()
+            self.end_game(elapsed_time)
             return
         
-        # Ajouter des perturbations
-        if elapsed_time - self.last_disruption >= self.config['disruption_interval']:
-            self.add_disruption()
-            self.last_disruption = elapsed_time
+        # Événements échus: perturbations, bonus, expirations (bonus, perturbations, effets des balles)
+        self.scheduler.run_due(self.sim_clock.now)
         
-        # Spawn des bonus
-        if elapsed_time - self.last_bonus_spawn >= self.config['bonus_spawn_interval']:
-            self.spawn_bonus()
-            self.last_bonus_spawn = elapsed_time
-        
-        # Mise à jour des bonus
-        self.bonuses = [b for b in self.bonuses if b.update(dt)]
+        # Ramassage des bonus
         self.handle_bonus_effects()
         
         # Mise à jour des balles
-        dead_balls = []
-        for ball in self.balls[:]:
-            ball.update(dt, self.balls, self.particles, self.disruptions, self.arena)
-            if ball.health <= 0:
-                ball.explode(self.particles)
-                dead_balls.append(ball)
-        
-        for ball in dead_balls:
-            self.balls.remove(ball)
+        with self.profiler.section('balls_update'):
+            if self.engine:
+                self.engine.step(dt, self.disruptions, self.arena, self.particles)
+                self.balls = self.engine.views
+            else:
+                # Grille de voisinage reconstruite une fois par tick
+                self.grid.rebuild(self.balls)
+                dead_balls = []
+                for ball in self.balls[:]:
+                    ball.update(dt, self.balls, self.particles, self.disruptions, self.arena, self.grid)
+                    if ball.health <= 0:
+                        ball.explode(self.particles)
+                        ball.alive = False
+                        dead_balls.append(ball)
+                
+                for ball in dead_balls:
+                    self.balls.remove(ball)
+                
+                # Chocs entre les balles restantes (phase large par tri et balayage)
+                pushed = set()
+                for ball, other in self.sweep.candidate_pairs(self.balls):
+                    if ball.collide_with(other):
+                        pushed.add(ball)
+                        pushed.add(other)
+                
+                # La séparation ne doit pas laisser une balle dans un mur
+                for ball in pushed:
+                    self.arena.push_inside(ball, self.arena.planes, ball.radius + WALL_MARGIN)
         
         # Mise à jour des particules
-        self.particles = [p for p in self.particles if p.update(dt)]
-        
-        # Nettoyer les perturbations expirées
-        self.disruptions = [d for d in self.disruptions if d.is_active()]
+        with self.profiler.section('particles_update'):
+            self.particles.update(dt)
         
         # Mise à jour de l'intensité du fond
         self.update_background_intensity()
     
-    def end_game(self):
+    def end_game(self, elapsed_time):
         """Terminer le jeu et calculer les statistiques"""
         self.state = GameState.GAME_OVER
         
         # Calculer les statistiques finales
-        self.game_stats['duration'] = time.time() - self.start_time
+        self.game_stats['duration'] = elapsed_time
         self.game_stats['survivors'] = len(self.balls)
         
         # Compter les types de survivants
@@ -1258,40 +3175,232 @@ class Game:
             else:
                 survivor_types[ball.type] = 1
         self.game_stats['survivor_types'] = survivor_types
-        
-        # Créer l'écran de fin
-        self.game_over_screen = GameOverScreen(self.screen, self.game_stats)
-        
-        # Explosion finale
-        self.final_explosion()
     
     def final_explosion(self):
         """Explosion finale spectaculaire"""
         for ball in self.balls:
-            for _ in range(50):  # Plus de particules
-                self.particles.append(Particle(
-                    ball.x,
-                    ball.y,
-                    random.uniform(-800, 800),
-                    random.uniform(-800, 800),
-                    ball.color,
-                    random.uniform(3.0, 8.0)  # Durée plus longue
-                ))
+            # Plus de particules, durée plus longue
+            self.particles.emit(ball.x, ball.y, 50, 800, ball.color, (3.0, 8.0))
         
         # Explosion des bonus restants
         for bonus in self.bonuses:
-            for _ in range(20):
-                self.particles.append(Particle(
-                    bonus.x,
-                    bonus.y,
-                    random.uniform(-500, 500),
-                    random.uniform(-500, 500),
-                    bonus.color,
-                    random.uniform(2.0, 5.0)
-                ))
-    
-    def draw_hud(self, elapsed_time):
-        """Interface utilisateur pendant le jeu"""
+            self.particles.emit(bonus.x, bonus.y, 20, 500, bonus.color, (2.0, 5.0))
+
+    def snapshot(self):
+        """État complet de la simulation en octets (sans particules ni couleur de fond, purement visuelles)"""
+        rng_version, rng_words, gauss_next = self.rng.getstate()
+        stats = dict(self.game_stats)
+        stats['survivor_types'] = {ball_type.value: count
+                                   for ball_type, count in stats.get('survivor_types', {}).items()}
+        meta = {
+            'state': self.state.value,
+            'config': self.config,
+            'seed': self.seed,
+            'now': self.sim_clock.now,
+            'start_time': self.start_time,
+            'last_disruption': self.last_disruption,
+            'last_bonus_spawn': self.last_bonus_spawn,
+            'sim_dt': self.sim_dt,
+            'rng': [rng_version, gauss_next],
+            'np_rng': self.engine.np_rng.bit_generator.state if self.engine else None,
+            'arena': [self.arena.shape_type, self.arena.custom_vertices, self.arena.center_x, self.arena.center_y,
+                      self.arena.scale],
+            'stats': stats,
+            'bonuses': [[BONUS_TYPE_ORDER.index(b.type), b.x, b.y, b.spawn_time, b.collected]
+                        for b in self.bonuses],
+            'disruptions': [[d.type, d.duration, d.start_time] for d in self.disruptions],
+            'balls': len(self.balls)
+        }
+        header = json.dumps(meta, separators=(',', ':')).encode()
+        
+        parts = [SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(header)), header, RNG_STATE.pack(*rng_words)]
+        for ball in self.balls:
+            parts.append(BALL_RECORD.pack(
+                BALL_TYPE_ORDER.index(ball.type), ball.x, ball.y, ball.prev_x, ball.prev_y,
+                ball.vx, ball.vy, ball.radius, ball.health, ball.last_attack,
+                ball.speed_boost_time, ball.shield_time, ball.rage_time, ball.damage_multiplier,
+                int(ball.shield_strength), bool(ball.freeze_blast_ready)))
+        return b"".join(parts)
+    
+    def restore(self, data):
+        """Remplace l'état courant par un instantané de snapshot()"""
+        magic, header_length = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Instantané de simulation invalide")
+        offset = SNAPSHOT_HEADER.size
+        meta = json.loads(data[offset:offset + header_length])
+        offset += header_length
+        rng_words = RNG_STATE.unpack_from(data, offset)
+        offset += RNG_STATE.size
+        
+        self.config = meta['config']
+        self.state = GameState(meta['state'])
+        self.seed = meta['seed']
+        self.sim_clock.now = meta['now']
+        self.start_time = meta['start_time']
+        self.last_disruption = meta['last_disruption']
+        self.last_bonus_spawn = meta['last_bonus_spawn']
+        self.sim_dt = meta['sim_dt']
+        self.accumulator = 0.0
+        self.render_alpha = 1.0
+        self.rng = random.Random()
+        self.particles.clear()
+        
+        shape_type, vertices, *center = meta['arena']
+        if center:
+            self.arena.center_x, self.arena.center_y = center[:2]
+            self.arena.scale = center[2] if len(center) > 2 else 1.0
+        if shape_type == "custom":
+            self.arena.set_custom_shape(vertices)
+        else:
+            self.arena.shape_type = shape_type
+            self.arena.generate_shape()
+        
+        # Balles (les tirages de create_ball sont écrasés puis le hasard est restauré)
+        self.balls = []
+        self.engine = None
+        if meta['np_rng'] is not None:
+            self.engine = NumpyBallEngine(self.sim_clock, 0)
+            self.balls = self.engine.views
+        for _ in range(meta['balls']):
+            (type_index, x, y, prev_x, prev_y, vx, vy, radius, health, last_attack, speed_boost_time,
+             shield_time, rage_time, damage_multiplier, shield_strength, freeze_blast_ready) = \
+                BALL_RECORD.unpack_from(data, offset)
+            offset += BALL_RECORD.size
+            ball = self.create_ball(x, y, BALL_TYPE_ORDER[type_index])
+            ball.prev_x, ball.prev_y = prev_x, prev_y
+            ball.vx, ball.vy = vx, vy
+            ball.radius = radius
+            ball.health = health
+            ball.last_attack = last_attack
+            ball.speed_boost_time = speed_boost_time
+            ball.shield_time = shield_time
+            ball.shield_strength = shield_strength
+            ball.rage_time = rage_time
+            ball.damage_multiplier = damage_multiplier
+            ball.freeze_blast_ready = freeze_blast_ready
+        
+        glow_intensity = (math.sin(self.sim_clock.now * 5) + 1) * 0.5
+        if self.engine:
+            self.engine.np_rng.bit_generator.state = meta['np_rng']
+            self.engine.glow_intensity = glow_intensity
+        else:
+            for ball in self.balls:
+                ball.glow_intensity = glow_intensity
+        
+        self.bonuses = {}
+        self.bonus_index.clear()
+        self.sweep.clear()
+        for type_index, x, y, spawn_time, collected in meta['bonuses']:
+            bonus = Bonus(x, y, BONUS_TYPE_ORDER[type_index], self.sim_clock)
+            bonus.spawn_time = spawn_time
+            bonus.collected = collected
+            self.add_bonus(bonus)
+        
+        self.disruptions = []
+        for disruption_type, duration, start_time in meta['disruptions']:
+            disruption = Disruption(disruption_type, duration, self.sim_clock, self.rng)
+            disruption.start_time = start_time
+            self.disruptions.append(disruption)
+        
+        rng_version, gauss_next = meta['rng']
+        self.rng.setstate((rng_version, rng_words, gauss_next))
+        
+        stats = meta['stats']
+        stats['survivor_types'] = {BallType(name): count for name, count in stats['survivor_types'].items()}
+        self.game_stats = stats
+        self.rebuild_schedule()
+
+    def reseed(self, seed):
+        """Nouvelle graine à partir de l'état courant: la suite de la bataille diverge"""
+        self.seed = seed
+        self.rng.seed(seed)  # Même objet: les balles et perturbations le partagent
+        if self.engine:
+            self.engine.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+    
+    def fork(self, seed=None):
+        """Copie sans affichage de la bataille en cours; identique pour seed=None, sinon divergente"""
+        branch = BattleSimulation(self.width, self.height, self.particle_capacity)
+        branch.restore(self.snapshot())
+        if seed is not None:
+            branch.reseed(seed)
+        return branch
+
+def run_headless_battle(config, dt=None):
+    """Simule une bataille complète sans fenêtre, aussi vite que le CPU le permet.
+    
+    La configuration a le même format que Menu.get_game_config().
+    dt vaut par défaut le pas fixe de la simulation (1 / config['sim_hz']).
+    Retourne le dictionnaire game_stats de fin de partie.
+    """
+    simulation = BattleSimulation()
+    simulation.start_new_game(config)
+    dt = dt or simulation.sim_dt
+    
+    while simulation.state == GameState.PLAYING:
+        simulation.step(dt)
+    
+    return simulation.game_stats
+
+class Game(BattleSimulation):
+    def __init__(self):
+        super().__init__()
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption("🔥 ARENA COMBAT - Battle Royale! 🔥")
+        self.clock = pygame.time.Clock()
+        
+        # État du jeu
+        self.state = GameState.MENU
+        self.menu = Menu(self.screen)
+        self.game_over_screen = None
+        self.paused = False
+        
+        # Panneaux statiques pré-composés (créés au premier affichage)
+        self.legend_surface = None
+        self.pause_overlay = None
+        self.hud_surface = None
+        self.hud_position = (0, 0)
+        self.hud_key = None
+        
+        # Fond dégradé pré-calculé
+        self.background = GradientBackground(self.bg_color, 3, 2, 0.01)
+        
+        # Rendu par zones modifiées (F5): fond figé, seules les zones qui changent sont envoyées
+        self.dirty_rendering = False
+        self.renderer = DirtyRenderer(SCREEN_WIDTH, SCREEN_HEIGHT)
+        
+        # Statistiques des caches et du rendu par zones, dans le profil exporté (F4)
+        self.profiler.add_report('sprite_cache', sprite_cache.stats)
+        self.profiler.add_report('text_cache', text_cache.stats)
+        self.profiler.add_report('dirty_rendering', self.renderer.stats)
+        
+        # Niveau de détail adapté au temps de trame (F6 pour le désactiver)
+        self.quality = QualityGovernor()
+        
+        # Horloge des animations d'affichage (fond, pulsations, morphing): temps vidéo à l'export
+        self.display_time = time.time
+        
+    def govern_quality(self, work_ms):
+        """Ajuste le niveau de détail au temps de calcul de la trame écoulée"""
+        settings = self.quality.observe(work_ms)
+        self.particles.trail_rate = settings['trail_rate']
+        self.particles.burst_cap = settings['burst_cap']
+        
+    def end_game(self, elapsed_time):
+        """Terminer le jeu, afficher l'écran de fin et l'explosion finale"""
+        super().end_game(elapsed_time)
+        
+        # Créer l'écran de fin
+        self.game_over_screen = GameOverScreen(self.screen, self.game_stats, self.display_time)
+        
+        # Explosion finale
+        self.final_explosion()
+    
+    def hud_layers(self, elapsed_time):
+        """Couches d'interface dans l'ordre d'affichage: (nom, clé, surface, position).
+        
+        La clé change quand le contenu change: le rendu par zones ne redessine que ces couches.
+        """
         remaining_time = max(0, self.config['game_duration'] - elapsed_time)
         
         # Temps restant avec style
@@ -1300,17 +3409,76 @@ class Game:
             time_color = (255, 100, 100)  # Rouge pour l'urgence
         elif remaining_time < 20:
             time_color = (255, 200, 100)  # Orange pour l'avertissement
+        
+        # Panneau des statistiques, recomposé seulement quand une valeur affichée change
+        hud_key = (f"{remaining_time:.1f}s", time_color, len(self.balls), len(self.bonuses),
+                   int(200 * self.combat_intensity), self.arena.shape_type)
+        if hud_key != self.hud_key:
+            self.hud_surface, self.hud_position = self.build_hud_panel(*hud_key)
+            self.hud_key = hud_key
+        layers = [('hud', hud_key, self.hud_surface, self.hud_position)]
+        
+        # Indicateur de perturbation active
+        if self.disruptions:
+            for i, disruption in enumerate(self.disruptions):
+                name = DISRUPTION_NAMES.get(disruption.type, disruption.type.upper())
+                # Effet de pulsation
+                pulse = round(math.sin(self.display_time() * 8) * 0.1 + 0.9, 2)
+                scaled_surface = render_pulsed(name, 48, (255, 150, 150), pulse)
+                
+                scaled_rect = scaled_surface.get_rect(center=(SCREEN_WIDTH // 2, 200))
+                layers.append((f'disruption_{i}', (name, pulse), scaled_surface, scaled_rect.topleft))
+        
+        # Légende des types de balles (pré-composée une seule fois)
+        if self.legend_surface is None:
+            self.legend_surface = self.build_legend()
+        layers.append(('legend', None, self.legend_surface, (SCREEN_WIDTH - 280, 30)))
+        
+        # Effet de fin de jeu
+        if remaining_time < 10:
+            # Taille arrondie à 4 px: une quinzaine de rendus en cache au lieu d'une police par trame
+            warning_size = int(84 + math.sin(elapsed_time * 15) * 30) // 4 * 4
             
-        time_text = self.big_font.render(f"⏰ {remaining_time:.1f}s", True, time_color)
-        self.screen.blit(time_text, (30, 30))
+            if remaining_time < 5:
+                warning = "🚨 EXPLOSION IMMINENTE! 🚨"
+                warning_text = render_text(warning, warning_size, (255, 100, 100))
+                shadow_text = render_text(warning, warning_size, (100, 0, 0))
+            else:
+                warning = "⚠️ ATTENTION! ⚠️"
+                warning_text = render_text(warning, warning_size, (255, 200, 100))
+                shadow_text = render_text(warning, warning_size, (100, 50, 0))
+                
+            text_rect = warning_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 200))
+            
+            # Effet d'ombre
+            shadow_rect = shadow_text.get_rect(center=(text_rect.centerx + 3, text_rect.centery + 3))
+            layers.append(('warning_shadow', (warning, warning_size), shadow_text, shadow_rect.topleft))
+            layers.append(('warning', (warning, warning_size), warning_text, text_rect.topleft))
+        
+        # Panneau du profileur (F3)
+        profiler_layer = self.profiler.overlay_layer()
+        if profiler_layer:
+            surface, position = profiler_layer
+            layers.append(('profiler', id(surface), surface, position))
+        
+        return layers
+    
+    def build_hud_panel(self, time_text, time_color, ball_count, bonus_count, intensity_fill, shape_type):
+        """Statistiques du combat pré-composées, recadrées sur leur contenu"""
+        panel = pygame.Surface((SCREEN_WIDTH // 2, 360), pygame.SRCALPHA)
+        
+        # Préfixe en cache, chiffres assemblés à partir des glyphes en cache
+        time_prefix = render_text("⏰ ", 84, time_color)
+        panel.blit(time_prefix, (30, 30))
+        blit_glyphs(panel, time_text, 84, time_color, (30 + time_prefix.get_width(), 30))
         
         # Statistiques du combat
         stats_y = 120
-        ball_text = self.font.render(f"⚔️ Combattants: {len(self.balls)}", True, (255, 255, 255))
-        self.screen.blit(ball_text, (30, stats_y))
+        ball_text = render_text(f"⚔️ Combattants: {ball_count}", 48, (255, 255, 255))
+        panel.blit(ball_text, (30, stats_y))
         
-        bonus_text = self.small_font.render(f"💎 Bonus actifs: {len(self.bonuses)}", True, (200, 200, 255))
-        self.screen.blit(bonus_text, (30, stats_y + 50))
+        bonus_text = render_text(f"💎 Bonus actifs: {bonus_count}", 36, (200, 200, 255))
+        panel.blit(bonus_text, (30, stats_y + 50))
         
         # Indicateur d'intensité du combat
         intensity_bar_width = 200
@@ -1318,61 +3486,37 @@ class Game:
         intensity_x = 30
         intensity_y = stats_y + 90
         
-        pygame.draw.rect(self.screen, (50, 50, 50), 
+        pygame.draw.rect(panel, (50, 50, 50), 
                         (intensity_x, intensity_y, intensity_bar_width, intensity_bar_height))
         
-        intensity_fill = int(intensity_bar_width * self.combat_intensity)
+        intensity = intensity_fill / intensity_bar_width
         intensity_color = (
-            int(255 * self.combat_intensity),
-            int(255 * (1 - self.combat_intensity)),
+            int(255 * intensity),
+            int(255 * (1 - intensity)),
             100
         )
-        pygame.draw.rect(self.screen, intensity_color,
+        pygame.draw.rect(panel, intensity_color,
                         (intensity_x, intensity_y, intensity_fill, intensity_bar_height))
         
-        intensity_label = self.small_font.render("🔥 INTENSITÉ", True, (255, 255, 255))
-        self.screen.blit(intensity_label, (intensity_x, intensity_y - 25))
+        intensity_label = render_text("🔥 INTENSITÉ", 36, (255, 255, 255))
+        panel.blit(intensity_label, (intensity_x, intensity_y - 25))
         
         # Indicateur de forme d'arène
-        shape_name = self.arena.shape_type.upper()
-        shape_text = self.small_font.render(f"🏟️ ARÈNE: {shape_name}", True, (150, 200, 255))
-        self.screen.blit(shape_text, (30, stats_y + 130))
+        shape_text = render_text(f"🏟️ ARÈNE: {shape_type.upper()}", 36, (150, 200, 255))
+        panel.blit(shape_text, (30, stats_y + 130))
         
         # Pause instruction
-        pause_text = self.small_font.render("P: Pause  ESC: Menu", True, (180, 180, 180))
-        self.screen.blit(pause_text, (30, stats_y + 170))
+        pause_text = render_text("P: Pause  ESC: Menu", 36, (180, 180, 180))
+        panel.blit(pause_text, (30, stats_y + 170))
         
-        # Indicateur de perturbation active
-        if self.disruptions:
-            disruption_names = {
-                "gravity_flip": "🌀 GRAVITÉ INVERSÉE",
-                "magnetic_field": "🧲 CHAMP MAGNÉTIQUE", 
-                "speed_boost": "⚡ ACCÉLÉRATION",
-                "chaos": "💥 CHAOS TOTAL",
-                "shape_morph": "🔄 MORPHING ARÈNE"
-            }
-            
-            for disruption in self.disruptions:
-                name = disruption_names.get(disruption.type, disruption.type.upper())
-                disruption_text = self.font.render(name, True, (255, 150, 150))
-                text_rect = disruption_text.get_rect(center=(SCREEN_WIDTH // 2, 200))
-                
-                # Effet de pulsation
-                pulse = math.sin(time.time() * 8) * 0.1 + 0.9
-                scaled_surface = pygame.transform.scale(disruption_text, 
-                    (int(disruption_text.get_width() * pulse), 
-                     int(disruption_text.get_height() * pulse)))
-                
-                scaled_rect = scaled_surface.get_rect(center=text_rect.center)
-                self.screen.blit(scaled_surface, scaled_rect)
+        bounds = panel.get_bounding_rect()
+        return panel.subsurface(bounds).copy(), bounds.topleft
     
-    def draw_legend(self):
-        """Légende des types de balles"""
-        legend_x = SCREEN_WIDTH - 280
-        legend_y = 30
+    def build_legend(self):
+        legend = pygame.Surface((280, 460), pygame.SRCALPHA)
         
-        legend_title = self.small_font.render("🎯 TYPES DE COMBATTANTS", True, (255, 255, 255))
-        self.screen.blit(legend_title, (legend_x, legend_y))
+        legend_title = render_text("🎯 TYPES DE COMBATTANTS", 36, (255, 255, 255))
+        legend.blit(legend_title, (0, 0))
         
         ball_info = {
             BallType.FIRE: "🔥 FEU - Chasse la glace",
@@ -1387,19 +3531,18 @@ class Game:
             color = COLORS[ball_type]
             
             # Petit cercle coloré
-            pygame.draw.circle(self.screen, color.to_tuple(), 
-                             (legend_x + 10, legend_y + y_offset + 8), 8)
+            pygame.draw.circle(legend, color.to_tuple(), (10, y_offset + 8), 8)
             
             # Description
-            desc_text = self.small_font.render(description, True, (200, 200, 200))
-            self.screen.blit(desc_text, (legend_x + 30, legend_y + y_offset))
+            desc_text = render_text(description, 36, (200, 200, 200))
+            legend.blit(desc_text, (30, y_offset))
             
             y_offset += 35
         
         # Légende des bonus
-        bonus_legend_y = legend_y + y_offset + 30
-        bonus_title = self.small_font.render("💎 BONUS ÉPIQUES", True, (255, 255, 255))
-        self.screen.blit(bonus_title, (legend_x, bonus_legend_y))
+        bonus_legend_y = y_offset + 30
+        bonus_title = render_text("💎 BONUS ÉPIQUES", 36, (255, 255, 255))
+        legend.blit(bonus_title, (0, bonus_legend_y))
         
         bonus_info = {
             "💨 VITESSE": "Accélération +50%",
@@ -1412,88 +3555,129 @@ class Game:
         
         y_offset = 30
         for icon_desc, effect in bonus_info.items():
-            bonus_text = self.small_font.render(f"{icon_desc}: {effect}", True, (150, 255, 150))
-            self.screen.blit(bonus_text, (legend_x, bonus_legend_y + y_offset))
+            bonus_text = render_text(f"{icon_desc}: {effect}", 36, (150, 255, 150))
+            legend.blit(bonus_text, (0, bonus_legend_y + y_offset))
             y_offset += 25
+        
+        return legend
     
     def draw_background(self):
-        """Fond dégradé amélioré"""
-        for y in range(0, SCREEN_HEIGHT, 3):  # Optimisation
-            gradient_factor = y / SCREEN_HEIGHT
-            
-            # Effet de vague basé sur le temps
-            wave_effect = math.sin(time.time() * 2 + y * 0.01) * 0.1
-            
-            color_r = max(0, min(255, int(self.bg_color.r * (1 - gradient_factor * 0.4 + wave_effect))))
-            color_g = max(0, min(255, int(self.bg_color.g * (1 - gradient_factor * 0.3 + wave_effect))))
-            color_b = max(0, min(255, int(self.bg_color.b * (1 + gradient_factor * 0.6 + wave_effect))))
-            
-            pygame.draw.rect(self.screen, (color_r, color_g, color_b), (0, y, SCREEN_WIDTH, 3))
+        """Fond dégradé amélioré (colonnes pré-calculées, recalculées si bg_color change)"""
+        self.background.set_color(self.bg_color)
+        self.background.draw(self.screen, self.display_time())
+    
+    def build_static_layer(self, morph_step=MORPH_STEPS):
+        """Fond figé et arène: ce qui ne change qu'avec la forme de l'arène ou la couleur de fond"""
+        layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.background.draw(layer, 0.0)
+        self.arena.draw(layer, morph_step / MORPH_STEPS)
+        return layer
     
     def draw_game(self, elapsed_time):
-        """Dessiner le jeu en cours"""
+        """Dessiner le jeu en cours; retourne les zones à envoyer à l'écran (None: écran entier)"""
+        if self.dirty_rendering and not self.paused:
+            return self.draw_game_dirty(elapsed_time)
+        self.renderer.invalidate()
+        profiler = self.profiler
+        
         # Fond dégradé avec effet
-        self.draw_background()
+        with profiler.section('draw_background'):
+            self.draw_background()
         
         # Arène (dessiner en premier pour qu'elle soit derrière)
-        self.arena.draw(self.screen)
+        with profiler.section('draw_arena'):
+            self.arena.draw(self.screen)
+        
+        quality = self.quality.settings
         
         # Particules
-        for particle in self.particles:
-            particle.draw(self.screen)
+        with profiler.section('draw_particles'):
+            self.particles.draw(self.screen, quality['point_size'])
         
         # Bonus
-        for bonus in self.bonuses:
-            bonus.draw(self.screen)
+        with profiler.section('draw_bonuses'):
+            for bonus in self.bonuses:
+                bonus.draw(self.screen)
         
         # Balles (par-dessus tout)
-        for ball in self.balls:
-            ball.draw(self.screen)
+        with profiler.section('draw_balls'):
+            for ball in self.balls:
+                ball.draw(self.screen, self.render_alpha, quality['glow'])
         
         # Interface utilisateur
-        self.draw_hud(elapsed_time)
-        self.draw_legend()
-        
-        # Effet de fin de jeu
-        remaining_time = max(0, self.config['game_duration'] - elapsed_time)
-        if remaining_time < 10:
-            warning_size = int(84 + math.sin(elapsed_time * 15) * 30)
-            warning_font = pygame.font.Font(None, warning_size)
-            
-            if remaining_time < 5:
-                warning_text = warning_font.render("🚨 EXPLOSION IMMINENTE! 🚨", True, (255, 100, 100))
-                shadow_text = warning_font.render("🚨 EXPLOSION IMMINENTE! 🚨", True, (100, 0, 0))
-            else:
-                warning_text = warning_font.render("⚠️ ATTENTION! ⚠️", True, (255, 200, 100))
-                shadow_text = warning_font.render("⚠️ ATTENTION! ⚠️", True, (100, 50, 0))
-                
-            text_rect = warning_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 200))
-            
-            # Effet d'ombre
-            shadow_rect = shadow_text.get_rect(center=(text_rect.centerx + 3, text_rect.centery + 3))
-            self.screen.blit(shadow_text, shadow_rect)
-            self.screen.blit(warning_text, text_rect)
+        with profiler.section('draw_hud'):
+            self.screen.blits([(surface, position) for _, _, surface, position in self.hud_layers(elapsed_time)],
+                              False)
         
         # Indication de pause
         if self.paused:
-            pause_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            pause_surf.fill((0, 0, 0, 100))
-            self.screen.blit(pause_surf, (0, 0))
+            if self.pause_overlay is None:
+                self.pause_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+                self.pause_overlay.fill((0, 0, 0, 100))
+            self.screen.blit(self.pause_overlay, (0, 0))
             
-            pause_text = self.big_font.render("⏸️ PAUSE", True, (255, 255, 255))
+            pause_text = render_text("⏸️ PAUSE", 84, (255, 255, 255))
             pause_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             self.screen.blit(pause_text, pause_rect)
             
-            resume_text = self.font.render("Appuyez sur P pour reprendre", True, (200, 200, 200))
+            resume_text = render_text("Appuyez sur P pour reprendre", 48, (200, 200, 200))
             resume_rect = resume_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80))
             self.screen.blit(resume_text, resume_rect)
+        return None
+    
+    def draw_game_dirty(self, elapsed_time):
+        """Rendu par zones: seules les tuiles modifiées sont restaurées, redessinées et envoyées"""
+        profiler = self.profiler
+        renderer = self.renderer
+        screen = self.screen
+        alpha = self.render_alpha
+        
+        with profiler.section('draw_background'):
+            self.background.set_color(self.bg_color)
+            # Pendant un morphing, la couche statique change par paliers (trames complètes)
+            morph_step = int(self.arena.morph_progress() * MORPH_STEPS)
+            renderer.set_static((self.arena.version, self.background.rebuilds, morph_step),
+                                lambda: self.build_static_layer(morph_step))
+        
+        # Zones sales: objets de cette trame et de la précédente, couches d'interface modifiées.
+        # Trop d'objets ou objets précédents inconnus: trame complète sans finir le marquage
+        with profiler.section('dirty_tiles'):
+            objects = renderer.object_tiles(self.particles, self.bonuses, self.balls, alpha)
+            if objects is None or renderer.previous is None:
+                tiles = None
+            else:
+                tiles = objects | renderer.previous
+            renderer.previous = objects
+            
+            layers = self.hud_layers(elapsed_time)
+            redraw = renderer.select_layers(tiles, layers)
+            rects = renderer.prepare(screen, tiles)
+        
+        quality = self.quality.settings
+        with profiler.section('draw_particles'):
+            self.particles.draw(screen, quality['point_size'])
+        
+        with profiler.section('draw_bonuses'):
+            for bonus in self.bonuses:
+                bonus.draw(screen)
+        
+        with profiler.section('draw_balls'):
+            for ball in self.balls:
+                ball.draw(screen, alpha, quality['glow'])
+        
+        with profiler.section('draw_hud'):
+            screen.blits([(surface, position) for name, _, surface, position in layers
+                          if rects is None or name in redraw], False)
+        return rects
     
     def run(self):
         """Boucle principale du jeu"""
         running = True
         
         while running:
-            dt = self.clock.tick(FPS) / 1000.0
+            frame_time = self.clock.tick(FPS) / 1000.0
+            work_start = time.perf_counter()
+            profiler = self.profiler
             
             # Événements
             for event in pygame.event.get():
@@ -1509,6 +3693,24 @@ class Game:
                         
                     elif event.key == pygame.K_p and self.state == GameState.PLAYING:
                         self.paused = not self.paused
+                    
+                    # Instrumentation: panneau des temps (F3), export CSV/JSON (F4)
+                    elif event.key == pygame.K_F3:
+                        profiler.toggle()
+                    elif event.key == pygame.K_F4 and profiler.enabled:
+                        prefix = time.strftime("profile_%Y%m%d_%H%M%S")
+                        profiler.dump(prefix)
+                        print(f"Profil écrit dans {prefix}.csv et {prefix}.json")
+                    
+                    # Rendu par zones modifiées (fond figé) ou trames complètes
+                    elif event.key == pygame.K_F5:
+                        self.dirty_rendering = not self.dirty_rendering
+                        self.renderer.invalidate()
+                    
+                    # Niveau de détail automatique ou qualité maximale fixe
+                    elif event.key == pygame.K_F6:
+                        self.quality.toggle()
+                        self.govern_quality(0.0)
                 
                 # Gestion des événements selon l'état
                 if self.state == GameState.MENU:
@@ -1530,21 +3732,32 @@ class Game:
             
             # Mise à jour selon l'état
             if self.state == GameState.PLAYING and not self.paused:
-                current_time = time.time()
-                elapsed_time = current_time - self.start_time
-                self.update_game_logic(dt, elapsed_time)
+                with profiler.section('simulation'):
+                    self.advance(frame_time)
             
-            # Rendu selon l'état
-            if self.state == GameState.MENU:
-                self.menu.draw()
-            elif self.state == GameState.PLAYING:
-                current_time = time.time()
-                elapsed_time = current_time - self.start_time
-                self.draw_game(elapsed_time)
-            elif self.state == GameState.GAME_OVER and self.game_over_screen:
-                self.game_over_screen.draw()
+            # Rendu selon l'état (le jeu affiche lui-même le panneau du profileur)
+            dirty_rects = None
+            if self.state == GameState.PLAYING:
+                elapsed_time = self.sim_clock.now - self.start_time
+                dirty_rects = self.draw_game(elapsed_time)
+            else:
+                if self.state == GameState.MENU:
+                    self.menu.draw()
+                elif self.state == GameState.GAME_OVER and self.game_over_screen:
+                    self.game_over_screen.draw()
+                profiler.draw(self.screen)
+                self.renderer.invalidate()
             
-            pygame.display.flip()
+            with profiler.section('flip'):
+                if dirty_rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(dirty_rects)
+            if self.state == GameState.PLAYING and not self.paused:
+                self.govern_quality((time.perf_counter() - work_start) * 1000)
+            profiler.end_frame(balls=len(self.balls), particles=len(self.particles),
+                               bonuses=len(self.bonuses), disruptions=len(self.disruptions),
+                               quality=self.quality.level)
         
         pygame.quit()
 
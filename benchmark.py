@@ -0,0 +1,289 @@
+"""Banc d'essai des performances: scénarios canoniques à graine fixe, sans affichage.
+
+Chaque mesure tourne dans un processus neuf (pic de mémoire propre au scénario, pas de
+caches hérités). La simulation donne ticks/s, percentiles de latence par tick, pic de RSS
+et allocations par tick; le rendu est mesuré à part sur une surface hors écran.
+Les résultats sont écrits en JSON et comparés à une référence enregistrée.
+
+    python3 benchmark.py --save-baseline                 # enregistre la référence
+    python3 benchmark.py --render --threshold 0.15       # compare à la référence
+"""
+import argparse
+import gc
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import pygame
+
+from Main import DISRUPTION_TYPES, SCREEN_WIDTH, SCREEN_HEIGHT, BattleSimulation, Game, np
+
+# Scénarios figés: même graine et mêmes réglages à chaque exécution.
+# ticks: pas de simulation mesurés, frames: trames de rendu mesurées.
+# Sans intervalle précisé, perturbations et bonus aléatoires sont repoussés hors de la mesure.
+SCENARIOS = {
+    'arena_hexagon': {'shape': "hexagon", 'balls': 25, 'disruption_interval': 12.0, 'bonus_interval': 8.0,
+                      'ticks': 1800, 'frames': 300},
+    'arena_octagon': {'shape': "octagon", 'balls': 25, 'disruption_interval': 12.0, 'bonus_interval': 8.0,
+                      'ticks': 1800, 'frames': 300},
+    'arena_diamond': {'shape': "diamond", 'balls': 25, 'disruption_interval': 12.0, 'bonus_interval': 8.0,
+                      'ticks': 1800, 'frames': 300},
+    'multiply_500': {'shape': "hexagon", 'balls': 25, 'multiply_to': 500, 'ticks': 300, 'frames': 120},
+    'multiply_5000': {'shape': "hexagon", 'balls': 25, 'multiply_to': 5000, 'ticks': 12, 'frames': 12},
+    'particle_storm': {'shape': "hexagon", 'balls': 25, 'multiply_to': 500, 'final_explosion': True,
+                       'ticks': 300, 'frames': 120},
+    'all_disruptions': {'shape': "hexagon", 'balls': 25, 'disruptions': DISRUPTION_TYPES, 'ticks': 240, 'frames': 120},
+}
+SEED = 20240601
+ALLOCATION_TICKS = 20
+
+# Métriques comparées à la référence: (chemin, sens) avec +1 = plus grand est mieux
+SIMULATION_METRICS = (('ticks_per_s', +1), ('tick_ms.p95', -1), ('peak_rss_mb', -1), ('alloc_kb_per_tick', -1))
+RENDER_METRICS = (('fps', +1), ('frame_ms.p95', -1))
+
+def percentiles(values):
+    """p50/p95/p99/max, même règle que FrameProfiler"""
+    values = sorted(values)
+    last = len(values) - 1
+    result = {name: values[round(last * q)] for name, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))}
+    result['max'] = values[-1]
+    return result
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Ko sous Linux, octets sous macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def mass_multiply(simulation, count):
+    """Clonage en masse comme le bonus MULTIPLY, clones dispersés autour de l'original"""
+    rng = simulation.rng
+    while len(simulation.balls) < count:
+        for ball in list(simulation.balls):
+            if len(simulation.balls) >= count:
+                break
+            x = ball.x + rng.uniform(-30, 30)
+            y = ball.y + rng.uniform(-30, 30)
+            if not simulation.arena.is_point_inside(x, y):
+                x, y = ball.x, ball.y
+            clone = simulation.create_ball(x, y, ball.type)
+            clone.vx = -ball.vx * 0.8
+            clone.vy = -ball.vy * 0.8
+
+def setup_scenario(simulation, name, engine):
+    """Met simulation (BattleSimulation ou Game) dans l'état initial du scénario"""
+    scenario = SCENARIOS[name]
+    simulation.start_new_game({
+        'ball_count': scenario['balls'],
+        'game_duration': 3600.0,
+        'disruption_interval': scenario.get('disruption_interval', 3600.0),
+        'bonus_spawn_interval': scenario.get('bonus_interval', 3600.0),
+        'arena_shape': scenario['shape'],
+        'engine': engine,
+        'seed': SEED
+    })
+    if scenario.get('multiply_to'):
+        mass_multiply(simulation, scenario['multiply_to'])
+    if scenario.get('final_explosion'):
+        simulation.final_explosion()
+    for disruption_type in scenario.get('disruptions', ()):
+        simulation.add_disruption(disruption_type)
+
+def bench_simulation(name, engine, scale):
+    """Exécuté dans un processus neuf: ticks de simulation seuls"""
+    simulation = BattleSimulation()
+    setup_scenario(simulation, name, engine)
+    ticks = max(1, int(SCENARIOS[name]['ticks'] * scale))
+    dt = simulation.sim_dt
+
+    gc.collect()
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(ticks):
+        tick_start = time.perf_counter()
+        simulation.step(dt)
+        latencies.append((time.perf_counter() - tick_start) * 1000)
+    total = time.perf_counter() - start
+    # Empreinte de l'état final: change si le comportement du scénario change
+    checksum = hashlib.sha1(simulation.snapshot()).hexdigest()[:16]
+    balls, particles = len(simulation.balls), len(simulation.particles)
+
+    # Passe séparée sous tracemalloc (qui ralentit tout): octets alloués au pic de chaque tick
+    # et blocs encore vivants après le tick
+    allocation_ticks = max(1, min(ALLOCATION_TICKS, ticks // 4))
+    allocated = 0
+    blocks = 0
+    tracemalloc.start()
+    for _ in range(allocation_ticks):
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        simulation.step(dt)
+        _, peak = tracemalloc.get_traced_memory()
+        allocated += peak - current
+        blocks += sys.getallocatedblocks() - blocks_before
+    tracemalloc.stop()
+
+    return {
+        'ticks': ticks,
+        'ticks_per_s': ticks / total,
+        'tick_ms': percentiles(latencies),
+        'peak_rss_mb': peak_rss_mb(),
+        'alloc_kb_per_tick': allocated / allocation_ticks / 1024,
+        'blocks_per_tick': blocks / allocation_ticks,
+        'balls': balls,
+        'particles': particles,
+        'checksum': checksum
+    }
+
+def bench_render(name, engine, scale):
+    """Exécuté dans un processus neuf: rendu complet puis par zones, sur une surface hors écran"""
+    game = Game()
+    game.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    frames = max(1, int(SCENARIOS[name]['frames'] * scale))
+    results = {}
+
+    for mode in ("full", "dirty"):
+        setup_scenario(game, name, engine)
+        game.dirty_rendering = mode == "dirty"
+        game.renderer.invalidate()
+        latencies = []
+        for _ in range(frames):
+            game.step(game.sim_dt)
+            frame_start = time.perf_counter()
+            game.draw_game(game.sim_clock.now - game.start_time)
+            latencies.append((time.perf_counter() - frame_start) * 1000)
+        results[mode] = {
+            'frames': frames,
+            'fps': frames / (sum(latencies) / 1000),
+            'frame_ms': percentiles(latencies)
+        }
+    return results
+
+def run_task(task):
+    kind, name, engine, scale = task
+    if kind == "simulation":
+        return bench_simulation(name, engine, scale)
+    return bench_render(name, engine, scale)
+
+def run_benchmarks(args):
+    tasks = []
+    for name in args.scenarios:
+        for engine in args.engines:
+            tasks.append(("simulation", name, engine, args.scale))
+            if args.render:
+                tasks.append(("render", name, engine, args.scale))
+
+    # Une mesure à la fois (pas de concurrence sur le CPU), chacune dans un processus neuf
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for task in tasks:
+        kind, name, engine, _ = task
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(run_task, task).result()
+        if kind == "simulation":
+            key = f"simulation/{name}/{engine}"
+            results[key] = result
+            print(f"{key:<40} {result['ticks_per_s']:9.1f} ticks/s  p95 {result['tick_ms']['p95']:7.2f} ms  "
+                  f"{result['alloc_kb_per_tick']:8.1f} Ko/tick", file=sys.stderr)
+        else:
+            for mode, mode_result in result.items():
+                key = f"render/{name}/{engine}/{mode}"
+                results[key] = mode_result
+                print(f"{key:<40} {mode_result['fps']:9.1f} fps      p95 {mode_result['frame_ms']['p95']:7.2f} ms",
+                      file=sys.stderr)
+    return results
+
+def metric(result, path):
+    value = result
+    for part in path.split('.'):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+def compare(results, baseline, threshold):
+    """Régressions (pire que la référence de plus de threshold) et scénarios dont le comportement a changé"""
+    regressions = []
+    changed = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        if result.get('checksum') != reference.get('checksum'):
+            changed.append(key)
+        metrics = SIMULATION_METRICS if key.startswith("simulation/") else RENDER_METRICS
+        for path, direction in metrics:
+            value, expected = metric(result, path), metric(reference, path)
+            if not value or not expected:
+                continue
+            # Dégradation relative, positive quand c'est pire
+            degradation = (expected - value) / expected if direction > 0 else (value - expected) / expected
+            if degradation > threshold:
+                regressions.append((key, path, expected, value, degradation))
+    return regressions, changed
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__ if np is not None else None,
+        'pygame': pygame.version.ver
+    }
+
+def parse_args(argv=None):
+    default_engines = ["objects", "numpy"] if np is not None else ["objects"]
+    parser = argparse.ArgumentParser(description="Banc d'essai des performances (scénarios à graine fixe)")
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument('--engines', nargs='+', default=default_engines, choices=["objects", "numpy"])
+    parser.add_argument('--render', action='store_true', help="mesurer aussi le rendu (surface hors écran)")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiplie le nombre de ticks et de trames")
+    parser.add_argument('--out', default="benchmark_results.json")
+    parser.add_argument('--baseline', default="benchmark_baseline.json", help="référence à comparer")
+    parser.add_argument('--save-baseline', action='store_true', help="enregistre ces résultats comme référence")
+    parser.add_argument('--threshold', type=float, default=0.10, help="dégradation tolérée (0.10 = 10%%)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run_benchmarks(args)
+    report = {'environment': environment(), 'results': results}
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Référence enregistrée dans {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print(f"Pas de référence ({args.baseline}): lancez d'abord avec --save-baseline")
+        sys.exit(0)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('environment') != report['environment']:
+        print("Attention: référence mesurée dans un autre environnement")
+
+    regressions, changed = compare(results, baseline['results'], args.threshold)
+    for key in changed:
+        print(f"Comportement modifié (empreinte différente): {key}")
+    for key, path, expected, value, degradation in regressions:
+        print(f"RÉGRESSION {key} {path}: {expected:.2f} -> {value:.2f} ({degradation:+.0%})")
+    if regressions:
+        sys.exit(1)
+    print(f"Aucune régression au-delà de {args.threshold:.0%}")
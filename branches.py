@@ -0,0 +1,128 @@
+"""Analyse "et si": une bataille est jouée jusqu'à un instant donné puis bifurque en K suites.
+
+L'état est capturé une fois avec BattleSimulation.snapshot() (quelques Ko, sans surface
+ni police). Les processus de travail sont créés par fork après cette capture: ils héritent
+des octets en copie sur écriture, rien n'est sérialisé par branche. Chaque branche
+restaure l'état puis change de graine; la branche 0 garde la graine d'origine et doit
+retrouver exactement la bataille non bifurquée.
+
+    python3 branches.py --seed 42 --fork-at 20 --branches 16
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from Main import BattleSimulation, GameState
+from tournament import dominant_type
+
+# Instantané partagé avec les processus de travail (hérité par fork, ou copié une fois par processus)
+_fork_state = None
+
+def _init_worker(state):
+    global _fork_state
+    _fork_state = state
+
+def play_out(simulation):
+    """Termine une bataille sans affichage et résume le résultat"""
+    while simulation.state == GameState.PLAYING:
+        simulation.step(simulation.sim_dt)
+    stats = simulation.game_stats
+    survivor_types = {ball_type.value: count for ball_type, count in stats['survivor_types'].items()}
+    return {
+        'survivors': stats['survivors'],
+        'survivor_types': survivor_types,
+        'winner': dominant_type(survivor_types),
+        'bonuses_collected': stats['bonuses_collected'],
+        'disruptions_triggered': stats['disruptions_triggered']
+    }
+
+def run_branch(branch_seed):
+    """Exécuté dans un processus de travail: une suite de la bataille bifurquée"""
+    simulation = BattleSimulation()
+    simulation.restore(_fork_state)
+    if branch_seed is not None:
+        simulation.reseed(branch_seed)
+    record = play_out(simulation)
+    record['branch_seed'] = branch_seed
+    return record
+
+def run_branches(state, branch_seeds, workers=None):
+    """Joue une suite par graine (None = graine d'origine) à partir de l'instantané state"""
+    global _fork_state
+    workers = workers or os.cpu_count() or 1
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        _fork_state = state
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(state,))
+
+    with pool:
+        return list(pool.map(run_branch, branch_seeds))
+
+def fork_battle(config, fork_at, branches, workers=None):
+    """Joue config jusqu'à fork_at secondes puis la fait bifurquer en branches suites"""
+    simulation = BattleSimulation()
+    simulation.start_new_game(config)
+    while simulation.state == GameState.PLAYING and simulation.sim_clock.now - simulation.start_time < fork_at:
+        simulation.step(simulation.sim_dt)
+    state = simulation.snapshot()
+
+    # Graines des branches tirées d'une copie du hasard de la bataille à la bifurcation:
+    # l'analyse est reproductible et deux batailles ne partagent pas de branches
+    rng = random.Random()
+    rng.setstate(simulation.rng.getstate())
+    seeds = [None] + [rng.getrandbits(64) for _ in range(1, branches)]
+    return simulation, state, run_branches(state, seeds, workers)
+
+def summarize(records):
+    winners = Counter(record['winner'] for record in records)
+    return {
+        'branches': len(records),
+        'winners': {str(name): count for name, count in winners.most_common()},
+        'mean_survivors': sum(record['survivors'] for record in records) / len(records)
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bifurcation d'une bataille en suites parallèles")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--balls', type=int, default=17)
+    parser.add_argument('--shape', default="hexagon", choices=["hexagon", "octagon", "diamond"])
+    parser.add_argument('--duration', type=float, default=60.0)
+    parser.add_argument('--disruption-interval', type=float, default=12.0)
+    parser.add_argument('--bonus-interval', type=float, default=8.0)
+    parser.add_argument('--engine', default="objects", choices=["objects", "numpy"])
+    parser.add_argument('--fork-at', type=float, default=20.0, help="instant de la bifurcation (s)")
+    parser.add_argument('--branches', type=int, default=16, help="nombre de suites (branche 0 = graine d'origine)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--out', default=None, help="résultats par branche (JSON Lines)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    config = {
+        'ball_count': args.balls,
+        'game_duration': args.duration,
+        'disruption_interval': args.disruption_interval,
+        'bonus_spawn_interval': args.bonus_interval,
+        'arena_shape': args.shape,
+        'engine': args.engine,
+        'seed': args.seed
+    }
+    simulation, state, records = fork_battle(config, args.fork_at, args.branches, args.workers)
+    print(f"Bifurcation à {args.fork_at:g}s: {len(simulation.balls)} balles, instantané de {len(state)} octets",
+          file=sys.stderr)
+
+    if args.out:
+        with open(args.out, 'w') as out:
+            for record in records:
+                out.write(json.dumps(record) + "\n")
+    print(json.dumps(summarize(records), indent=2))
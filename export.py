@@ -0,0 +1,289 @@
+"""Export vidéo hors ligne: la bataille est calculée et dessinée trame par trame, sans temps réel.
+
+Chaque trame correspond à un instant fixe de la vidéo (trame n = n / fps secondes): la
+simulation avance au pas fixe jusqu'à cet instant, l'affichage est interpolé comme en jeu et
+les animations (fond, pulsations, morphing) suivent le temps vidéo au lieu de l'horloge murale.
+Une trame lente à dessiner retarde l'export, jamais la vidéo: aucune trame n'est perdue.
+
+Les pixels de la surface hors écran sont copiés directement (vue sur le tampon de la surface,
+sans passer par des bytes) dans une case de mémoire partagée; des processus lisent ces cases
+et écrivent des PNG en parallèle, ou envoient les trames dans l'ordre à un encodeur (ffmpeg).
+Quand toutes les cases sont occupées, le rendu attend les processus.
+
+    python3 export.py frames/ --seed 42 --workers 4     # frames/frame_000000.png ...
+    python3 export.py bataille.mp4 --seed 42            # via ffmpeg
+"""
+import argparse
+import os
+import queue
+import random
+import shutil
+import subprocess
+import sys
+import time
+import traceback
+import multiprocessing
+from multiprocessing import shared_memory
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from Main import FPS, SCREEN_WIDTH, SCREEN_HEIGHT, Game, GameState, np
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".webm")
+WORKER_POLL = 1.0  # Secondes entre deux vérifications des processus pendant l'attente
+
+def pixel_format(masks):
+    """Format ffmpeg des pixels 32 bits (ordre des octets en mémoire), ex. 'bgr0'"""
+    channels = {masks[0]: "r", masks[1]: "g", masks[2]: "b"}
+    return "".join(channels.get(0xFF << (8 * i), "0") for i in range(4))
+
+def encoder_command(encoder, output, size, fps, masks):
+    return [encoder, "-loglevel", "error", "-y",
+            "-f", "rawvideo", "-pix_fmt", pixel_format(masks), "-s", f"{size[0]}x{size[1]}", "-r", str(fps),
+            "-i", "-", "-c:v", "libx264", "-pix_fmt", "yuv420p", output]
+
+def _worker(tasks, done, memory_name, slot_size, size, masks, directory, command):
+    """Processus d'écriture: PNG dans directory, ou trames envoyées à l'entrée de command"""
+    memory = shared_memory.SharedMemory(name=memory_name)
+    process = None
+    try:
+        surface = pygame.Surface(size, 0, 32, masks)
+        if command:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            index, slot = task
+            pixels = memory.buf[slot * slot_size:(slot + 1) * slot_size]
+            try:
+                if process:
+                    process.stdin.write(pixels)
+                else:
+                    surface.get_buffer().write(bytes(pixels))
+                    pygame.image.save(surface, os.path.join(directory, f"frame_{index:06d}.png"))
+            finally:
+                pixels.release()
+            done.put(('done', index, slot))
+        if process:
+            process.stdin.close()
+            if process.wait():
+                done.put(('error', f"{command[0]} s'est arrêté avec le code {process.returncode}"))
+                return
+        done.put(('exit',))
+    except Exception:
+        if process:
+            process.kill()
+        done.put(('error', traceback.format_exc()))
+    finally:
+        memory.close()
+
+class FrameExporter:
+    """Trames d'une surface vers un pool de processus, par cases de mémoire partagée réutilisées"""
+    def __init__(self, surface, directory=None, command=None, workers=1, slots=None):
+        self.size = surface.get_size()
+        self.masks = surface.get_masks()[:3] + (0,)
+        if surface.get_bitsize() != 32 or surface.get_pitch() != self.size[0] * 4:
+            raise ValueError("Surface 32 bits sans marge de ligne attendue")
+        # L'encodeur reçoit les trames dans l'ordre: un seul processus d'écriture
+        self.workers = 1 if command else max(1, workers)
+        self.slot_size = surface.get_pitch() * self.size[1]
+        self.free = list(range(slots or self.workers * 2))
+        self.memory = shared_memory.SharedMemory(create=True, size=self.slot_size * len(self.free))
+        context = multiprocessing.get_context("spawn")
+        self.tasks = context.Queue()
+        self.done = context.Queue()
+        self.processes = [
+            context.Process(target=_worker, args=(self.tasks, self.done, self.memory.name, self.slot_size,
+                                                  self.size, self.masks, directory, command))
+            for _ in range(self.workers)
+        ]
+        for process in self.processes:
+            process.start()
+        self.frames = 0
+        self.written = 0
+        self.exited = 0
+        self.wait_time = 0.0
+
+    def collect(self):
+        """Attend un message d'un processus; une erreur ou un processus disparu arrête l'export"""
+        while True:
+            try:
+                message = self.done.get(timeout=WORKER_POLL)
+                break
+            except queue.Empty:
+                self.check_workers()
+        if message[0] == 'error':
+            self.abort()
+            raise RuntimeError(f"Échec de l'écriture des trames:\n{message[1]}")
+        if message[0] == 'exit':
+            self.exited += 1
+        else:
+            self.written += 1
+            self.free.append(message[2])
+
+    def check_workers(self):
+        """Un processus terminé sans son message de fin (tué, plantage) ne répondra plus"""
+        ended = [process.exitcode for process in self.processes if process.exitcode is not None]
+        # Le message de fin est envoyé avant la sortie: s'il existe, il est déjà dans la file
+        if len(ended) > self.exited and self.done.empty():
+            self.abort()
+            raise RuntimeError(f"Processus d'écriture arrêté sans rapport (codes de sortie {ended})")
+
+    def submit(self, surface):
+        """Copie la trame dans une case libre (attend si toutes sont occupées) et la confie au pool"""
+        if not self.free:
+            wait_start = time.perf_counter()
+            while not self.free:
+                self.collect()
+            self.wait_time += time.perf_counter() - wait_start
+        slot = self.free.pop()
+        view = surface.get_view('0')
+        self.memory.buf[slot * self.slot_size:(slot + 1) * self.slot_size] = memoryview(view)
+        del view  # Déverrouille la surface
+        self.tasks.put((self.frames, slot))
+        self.frames += 1
+
+    def close(self):
+        """Attend que toutes les trames soient écrites; retourne leur nombre"""
+        for _ in self.processes:
+            self.tasks.put(None)
+        while self.exited < len(self.processes):
+            self.collect()
+        for process in self.processes:
+            process.join()
+        self.release()
+        if self.written != self.frames:
+            raise RuntimeError(f"{self.frames - self.written} trames non écrites")
+        return self.written
+
+    def abort(self):
+        for process in self.processes:
+            process.kill()
+            process.join()
+        self.release()
+
+    def release(self):
+        if self.memory is None:
+            return
+        self.memory.close()
+        self.memory.unlink()
+        self.memory = None
+
+class FrameClock:
+    """Temps vidéo de la trame en cours (horloge des animations pendant l'export)"""
+    def __init__(self, fps):
+        self.fps = fps
+        self.frame = 0
+
+    def __call__(self):
+        return self.frame / self.fps
+
+def render_battle(config, exporter, surface, fps=FPS, tail=3.0, on_frame=None):
+    """Joue la bataille hors ligne et confie chaque trame à exporter; retourne le nombre de trames"""
+    game = Game()
+    game.screen = surface
+    clock = FrameClock(fps)
+    game.display_time = clock
+    game.arena.display_time = clock
+    # Qualité maximale fixe: le rendu ne dépend pas du temps de calcul
+    game.quality.enabled = False
+    game.quality.reset()
+    game.govern_quality(0.0)
+    # Hasard purement visuel (particules): même graine, même vidéo
+    if config.get('seed') is not None:
+        random.seed(config['seed'])
+        if np is not None:
+            np.random.seed(config['seed'] % 2**32)
+    game.start_new_game(config)
+
+    sim_hz = 1 / game.sim_dt
+    ticks = 0
+    tail_frames = None
+    while tail_frames is None or tail_frames > 0:
+        # Pas de simulation dus à l'instant de la trame; le reste sert à l'interpolation
+        due = clock.frame * sim_hz / fps
+        while game.state == GameState.PLAYING and ticks + 1 <= due + 1e-9:
+            game.step(game.sim_dt)
+            ticks += 1
+        if game.state == GameState.PLAYING:
+            game.render_alpha = min(1.0, due - ticks)
+            game.draw_game(game.sim_clock.now - game.start_time)
+        else:
+            if tail_frames is None:
+                tail_frames = round(tail * fps)
+                if tail_frames == 0:
+                    break
+            game.game_over_screen.draw()
+            tail_frames -= 1
+        exporter.submit(surface)
+        clock.frame += 1
+        if on_frame:
+            on_frame(clock.frame, game)
+    return clock.frame
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Export vidéo hors ligne (PNG ou encodeur), trame par trame")
+    parser.add_argument('output', help="dossier de PNG, ou fichier vidéo (.mp4, .mkv, .mov, .webm) via l'encodeur")
+    parser.add_argument('--fps', type=int, default=FPS)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="processus d'écriture des PNG")
+    parser.add_argument('--encoder', default="ffmpeg", help="encodeur vidéo (fichiers vidéo seulement)")
+    parser.add_argument('--tail', type=float, default=3.0, help="secondes d'écran de fin après la bataille")
+    parser.add_argument('--balls', type=int, default=17)
+    parser.add_argument('--shape', default="hexagon", choices=["hexagon", "octagon", "diamond"])
+    parser.add_argument('--duration', type=float, default=60.0)
+    parser.add_argument('--disruption-interval', type=float, default=12.0)
+    parser.add_argument('--bonus-interval', type=float, default=8.0)
+    parser.add_argument('--engine', default="objects", choices=["objects", "numpy"])
+    parser.add_argument('--seed', type=int, default=None)
+    return parser, parser.parse_args(argv)
+
+def main(argv=None):
+    parser, args = parse_args(argv)
+    config = {
+        'ball_count': args.balls,
+        'game_duration': args.duration,
+        'disruption_interval': args.disruption_interval,
+        'bonus_spawn_interval': args.bonus_interval,
+        'arena_shape': args.shape,
+        'engine': args.engine,
+        'seed': args.seed
+    }
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+
+    directory = command = None
+    if args.output.lower().endswith(VIDEO_EXTENSIONS):
+        encoder = shutil.which(args.encoder)
+        if encoder is None:
+            parser.error(f"encodeur introuvable: {args.encoder} (ou exportez des PNG dans un dossier)")
+        command = encoder_command(encoder, args.output, surface.get_size(), args.fps, surface.get_masks())
+    else:
+        directory = args.output
+        os.makedirs(directory, exist_ok=True)
+
+    exporter = FrameExporter(surface, directory, command, args.workers)
+    start = time.perf_counter()
+
+    def progress(frame, game):
+        if frame % args.fps == 0:
+            print(f"\r{frame} trames ({frame / args.fps:.0f} s de vidéo)", end="", file=sys.stderr)
+
+    try:
+        rendered = render_battle(config, exporter, surface, args.fps, args.tail, progress)
+    except BaseException:
+        exporter.abort()
+        raise
+    written = exporter.close()
+    elapsed = time.perf_counter() - start
+    print(f"\r{written}/{rendered} trames écrites dans {args.output} en {elapsed:.1f} s "
+          f"({written / elapsed:.1f} trames/s, attente des processus {exporter.wait_time:.1f} s)", file=sys.stderr)
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
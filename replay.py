@@ -0,0 +1,363 @@
+"""Replays: enregistrement binaire compact des batailles et relecture rapide.
+
+Un replay contient la configuration et la graine, puis une suite d'enregistrements
+horodatés: images clés (instantanés complets de la simulation, compressés),
+événements (bonus, perturbations, clones) et statistiques finales. La simulation
+étant déterministe, la relecture rejoue les pas fixes depuis l'image clé la plus
+proche; les événements enregistrés servent à vérifier qu'elle ne diverge pas.
+
+    python3 replay.py record replays/            # jouer en enregistrant chaque bataille
+    python3 replay.py play replays/xxx.arpl --speed 8 --seek 30
+    python3 replay.py info replays/xxx.arpl
+"""
+import argparse
+import bisect
+import json
+import os
+import struct
+import time
+import zlib
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from Main import (FPS, SCREEN_WIDTH, SCREEN_HEIGHT, MAX_CATCH_UP_STEPS, BattleSimulation, Game, GameState,
+                  render_text)
+
+MAGIC = b"ARPL"
+VERSION = 2
+FILE_HEADER = struct.Struct("<4sHI")   # magic, version, taille de l'en-tête JSON
+RECORD_HEADER = struct.Struct("<BdI")  # étiquette, temps de bataille, taille du contenu
+
+TAG_KEYFRAME = ord("K")
+TAG_EVENT = ord("E")
+TAG_END = ord("F")
+
+KEYFRAME_INTERVAL = 2.0
+MAX_SPEED = 32
+
+def encode_event(kind, values):
+    """Événement en octets: type puis valeurs étiquetées (d: réel, i: entier, s: texte)"""
+    parts = [struct.pack("<BB", kind, len(values))]
+    for value in values:
+        if isinstance(value, str):
+            data = value.encode()
+            parts.append(struct.pack("<cH", b"s", len(data)) + data)
+        elif isinstance(value, int):
+            parts.append(struct.pack("<ci", b"i", value))
+        else:
+            parts.append(struct.pack("<cd", b"d", value))
+    return b"".join(parts)
+
+def decode_event(data):
+    kind, count = struct.unpack_from("<BB", data)
+    offset = 2
+    values = []
+    for _ in range(count):
+        code = data[offset:offset + 1]
+        offset += 1
+        if code == b"s":
+            (length,) = struct.unpack_from("<H", data, offset)
+            offset += 2
+            values.append(data[offset:offset + length].decode())
+            offset += length
+        elif code == b"i":
+            values.append(struct.unpack_from("<i", data, offset)[0])
+            offset += 4
+        else:
+            values.append(struct.unpack_from("<d", data, offset)[0])
+            offset += 8
+    return kind, tuple(values)
+
+class ReplayRecorder:
+    """S'attache à une simulation déjà démarrée (simulation.recorder) et écrit le replay au fil des pas"""
+    def __init__(self, path, simulation, keyframe_interval=KEYFRAME_INTERVAL):
+        self.path = path
+        self.simulation = simulation
+        self.keyframe_interval = keyframe_interval
+        self.file = open(path, "wb")
+
+        config = dict(simulation.config)
+        config['seed'] = simulation.seed
+        header = json.dumps({
+            'config': config,
+            'sim_dt': simulation.sim_dt,
+            'keyframe_interval': keyframe_interval
+        }).encode()
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION, len(header)))
+        self.file.write(header)
+
+        # État initial (balles de spawn_initial_balls) = première image clé
+        self.next_keyframe = 0.0
+        self.write_keyframe(0.0)
+        simulation.recorder = self
+
+    def write_record(self, tag, elapsed_time, payload):
+        self.file.write(RECORD_HEADER.pack(tag, elapsed_time, len(payload)))
+        self.file.write(payload)
+
+    def write_keyframe(self, elapsed_time):
+        self.write_record(TAG_KEYFRAME, elapsed_time, zlib.compress(self.simulation.snapshot()))
+        self.next_keyframe += self.keyframe_interval
+
+    def record_event(self, elapsed_time, kind, values):
+        self.write_record(TAG_EVENT, elapsed_time, encode_event(kind, values))
+
+    def on_step(self, simulation):
+        elapsed_time = simulation.sim_clock.now - simulation.start_time
+        if simulation.state != GameState.PLAYING:
+            stats = dict(simulation.game_stats)
+            stats['survivor_types'] = {ball_type.value: count
+                                       for ball_type, count in stats['survivor_types'].items()}
+            self.write_record(TAG_END, elapsed_time, json.dumps(stats).encode())
+            self.close()
+        elif elapsed_time >= self.next_keyframe:
+            self.write_keyframe(elapsed_time)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+        if self.simulation.recorder is self:
+            self.simulation.recorder = None
+
+def record_battle(config, path, keyframe_interval=KEYFRAME_INTERVAL):
+    """Joue une bataille sans affichage en l'enregistrant; retourne game_stats"""
+    simulation = BattleSimulation()
+    simulation.start_new_game(config)
+    ReplayRecorder(path, simulation, keyframe_interval)
+    while simulation.state == GameState.PLAYING:
+        simulation.step(simulation.sim_dt)
+    return simulation.game_stats
+
+class Replay:
+    """Fichier de replay chargé: en-tête, images clés indexées par temps, événements, fin"""
+    def __init__(self, header, keyframes, events, end_stats):
+        self.config = header['config']
+        self.sim_dt = header['sim_dt']
+        self.keyframe_interval = header['keyframe_interval']
+        self.keyframes = keyframes                # [(temps, instantané compressé)]
+        self.keyframe_times = [t for t, _ in keyframes]
+        self.events = events                      # [(temps, type, valeurs)]
+        self.event_times = [t for t, _, _ in events]
+        self.end_stats = end_stats                # None si la bataille a été interrompue
+
+    @property
+    def duration(self):
+        if self.end_stats is not None:
+            return self.end_stats['duration']
+        return self.keyframe_times[-1]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, header_length = FILE_HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: pas un replay (ou version {version} non supportée)")
+        offset = FILE_HEADER.size
+        header = json.loads(data[offset:offset + header_length])
+        offset += header_length
+
+        keyframes, events, end_stats = [], [], None
+        while offset + RECORD_HEADER.size <= len(data):
+            tag, elapsed_time, length = RECORD_HEADER.unpack_from(data, offset)
+            offset += RECORD_HEADER.size
+            payload = data[offset:offset + length]
+            offset += length
+            if len(payload) < length:
+                break  # Enregistrement tronqué (partie interrompue)
+            if tag == TAG_KEYFRAME:
+                keyframes.append((elapsed_time, payload))
+            elif tag == TAG_EVENT:
+                events.append((elapsed_time,) + decode_event(payload))
+            elif tag == TAG_END:
+                end_stats = json.loads(payload)
+        if not keyframes:
+            raise ValueError(f"{path}: replay sans image clé")
+        return cls(header, keyframes, events, end_stats)
+
+class ReplayPlayer:
+    """Relecture: accès direct par image clé + pas fixes, vitesse x1 à x32 sans afficher chaque pas"""
+    def __init__(self, replay: Replay, simulation=None):
+        self.replay = replay
+        self.simulation = simulation or BattleSimulation()
+        self.speed = 1
+        self.accumulator = 0.0
+        self.event_index = 0
+        self.desyncs = 0
+        self.seek(0.0)
+
+    @property
+    def elapsed_time(self):
+        return self.simulation.sim_clock.now - self.simulation.start_time
+
+    def seek(self, target):
+        """Se place à target secondes: image clé précédente puis simulation jusqu'au temps voulu"""
+        replay = self.replay
+        target = max(0.0, min(target, replay.duration))
+        index = max(0, bisect.bisect_right(replay.keyframe_times, target) - 1)
+        keyframe_time, data = replay.keyframes[index]
+
+        simulation = self.simulation
+        simulation.recorder = None
+        simulation.restore(zlib.decompress(data))
+        simulation.recorder = self
+        self.event_index = bisect.bisect_right(replay.event_times, keyframe_time)
+        self.accumulator = 0.0
+
+        sim_dt = simulation.sim_dt
+        while simulation.state == GameState.PLAYING and self.elapsed_time + sim_dt * 0.5 <= target:
+            simulation.step(sim_dt)
+
+        # Particules émises pendant l'avance rapide: ni visibles ni utiles
+        simulation.particles.clear()
+
+    def set_speed(self, speed):
+        self.speed = max(1, min(MAX_SPEED, speed))
+
+    def advance(self, frame_time):
+        """Avance de frame_time x vitesse en pas fixes; une seule image affichée par appel"""
+        simulation = self.simulation
+        sim_dt = simulation.sim_dt
+        self.accumulator += frame_time * self.speed
+
+        steps = 0
+        max_steps = MAX_CATCH_UP_STEPS * self.speed
+        while self.accumulator >= sim_dt and simulation.state == GameState.PLAYING:
+            simulation.step(sim_dt)
+            self.accumulator -= sim_dt
+            steps += 1
+            if steps >= max_steps:
+                self.accumulator = 0.0
+                break
+
+        simulation.render_alpha = min(1.0, self.accumulator / sim_dt)
+        return steps
+
+    # Interface d'enregistreur: compare les événements rejoués à ceux du fichier
+    def record_event(self, elapsed_time, kind, values):
+        events = self.replay.events
+        if self.event_index < len(events):
+            expected_time, expected_kind, expected_values = events[self.event_index]
+            if (expected_time, expected_kind, expected_values) != (elapsed_time, kind, tuple(values)):
+                self.desyncs += 1
+        else:
+            self.desyncs += 1
+        self.event_index += 1
+
+    def on_step(self, simulation):
+        pass
+
+class RecordingGame(Game):
+    """Le jeu normal, chaque bataille étant enregistrée dans un fichier du dossier donné"""
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def start_new_game(self, config):
+        if self.recorder:
+            self.recorder.close()
+        super().start_new_game(config)
+        path = os.path.join(self.directory, time.strftime("battle_%Y%m%d_%H%M%S") + f"_{self.seed}.arpl")
+        ReplayRecorder(path, self)
+        print(f"Enregistrement dans {path}")
+
+def play(path, speed=1, seek=0.0):
+    """Visionneuse: ESPACE pause, ←→ ±5 s, ↑↓ vitesse x2 / ÷2, ESC quitter"""
+    replay = Replay.load(path)
+    game = Game()
+    player = ReplayPlayer(replay, game)
+    player.set_speed(speed)
+    if seek:
+        player.seek(seek)
+    paused = False
+    running = True
+
+    while running:
+        frame_time = game.clock.tick(FPS) / 1000.0
+        work_start = time.perf_counter()
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_LEFT:
+                    player.seek(player.elapsed_time - 5)
+                elif event.key == pygame.K_RIGHT:
+                    player.seek(player.elapsed_time + 5)
+                elif event.key == pygame.K_UP:
+                    player.set_speed(player.speed * 2)
+                elif event.key == pygame.K_DOWN:
+                    player.set_speed(player.speed // 2)
+                elif event.key == pygame.K_F3:
+                    game.profiler.toggle()
+                elif event.key == pygame.K_F6:
+                    game.quality.toggle()
+                    game.govern_quality(0.0)
+
+        if not paused:
+            player.advance(frame_time)
+
+        if game.state == GameState.GAME_OVER and game.game_over_screen:
+            game.game_over_screen.draw()
+            game.profiler.draw(game.screen)
+        else:
+            game.draw_game(player.elapsed_time)
+
+        # Bandeau du replay
+        status = "⏸" if paused else f"x{player.speed}"
+        line = f"REPLAY {status}  {player.elapsed_time:5.1f}s / {replay.duration:.1f}s"
+        if player.desyncs:
+            line += f"  ({player.desyncs} désynchronisations)"
+        text = render_text(line, 36, (255, 255, 255))
+        game.screen.blit(text, text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 40)))
+
+        pygame.display.flip()
+        if not paused:
+            game.govern_quality((time.perf_counter() - work_start) * 1000)
+        game.profiler.end_frame(balls=len(game.balls), particles=len(game.particles), quality=game.quality.level)
+
+    pygame.quit()
+
+def print_info(path):
+    replay = Replay.load(path)
+    config = replay.config
+    print(f"{path}: {os.path.getsize(path) // 1024} Ko")
+    print(f"  graine {config['seed']}, {config['ball_count']} balles, arène {config['arena_shape']}, "
+          f"pas de {replay.sim_dt * 1000:.2f} ms")
+    print(f"  {len(replay.keyframes)} images clés (toutes les {replay.keyframe_interval:g} s), "
+          f"{len(replay.events)} événements, durée {replay.duration:.1f} s")
+    if replay.end_stats is None:
+        print("  bataille interrompue (pas de statistiques finales)")
+    else:
+        stats = replay.end_stats
+        print(f"  {stats['survivors']} survivants {stats['survivor_types']}, "
+              f"{stats['bonuses_collected']} bonus, {stats['disruptions_triggered']} perturbations")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Enregistrement et relecture des batailles")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="jouer normalement en enregistrant chaque bataille")
+    record.add_argument("directory", nargs="?", default="replays")
+    player = commands.add_parser("play", help="revoir un replay")
+    player.add_argument("path")
+    player.add_argument("--speed", type=int, default=1, help=f"vitesse initiale (1-{MAX_SPEED})")
+    player.add_argument("--seek", type=float, default=0.0, help="temps de départ (s)")
+    info = commands.add_parser("info", help="résumé d'un replay")
+    info.add_argument("path")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "record":
+        RecordingGame(args.directory).run()
+    elif args.command == "play":
+        play(args.path, args.speed, args.seek)
+    else:
+        print_info(args.path)
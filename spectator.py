@@ -0,0 +1,605 @@
+"""Diffusion des batailles aux spectateurs distants: l'état du monde à chaque tick, pas la vidéo.
+
+Serveur asyncio sur une socket TCP locale. Chaque message est préfixé par sa longueur;
+le premier (HELLO) donne la fréquence de simulation et l'aire de jeu, les suivants sont
+des trames binaires quantifiées (positions au quart de pixel, vie et rayon sur un octet):
+
+- image clé: arène (sommets de Arena.walls), bonus, perturbations et toutes les balles
+- delta: seulement ce qui a changé depuis le tick précédent (balles apparues, disparues,
+  déplacées, blessées, changées de rayon ou de type; arène, bonus ou perturbations s'ils ont changé)
+
+Les deltas sont encodés une seule fois par tick pour tous les clients. Un client lent dont
+le tampon d'envoi dépasse high_water ne reçoit plus de deltas; dès que son tampon est
+redescendu sous low_water, il repart d'une image clé.
+
+    python3 spectator.py serve --port 8765 --loop
+    python3 spectator.py watch --port 8765
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import struct
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from Main import (FPS, SCREEN_WIDTH, SCREEN_HEIGHT, BALL_TYPE_ORDER, BONUS_TYPE_ORDER, DISRUPTION_NAMES,
+                  DISRUPTION_TYPES, Arena, Ball, BattleSimulation, Bonus, GameState, SimulationClock, render_text)
+
+MAGIC = b"ASPF"
+VERSION = 2
+HELLO = struct.Struct("<4sHHHH")          # magic, version, ticks/s, largeur, hauteur
+LENGTH = struct.Struct("<I")
+FRAME_HEADER = struct.Struct("<BIIfB")     # type, tick, tick de base du delta, temps écoulé, sections
+COUNT = struct.Struct("<H")
+VERTEX = struct.Struct("<hh")
+BONUS_RECORD = struct.Struct("<IBhh")      # identifiant, type, x, y
+DISRUPTION_RECORD = struct.Struct("<BH")   # type, fin (dixièmes de seconde de bataille)
+BALL_RECORD = struct.Struct("<IBhhBBB")    # identifiant, type, x, y, vie, rayon, effets
+DELTA_COUNTS = struct.Struct("<HHH")       # balles retirées, ajoutées, modifiées
+BALL_ID = struct.Struct("<I")
+CHANGE = struct.Struct("<BH")              # champs modifiés, écart d'identifiant avec la balle modifiée précédente
+WIDE_CHANGE = struct.Struct("<BI")
+SMALL_MOVE = struct.Struct("<bb")
+MOVE = struct.Struct("<hh")
+BYTE = struct.Struct("<B")
+
+KEYFRAME = 1
+DELTA = 2
+
+SECTION_ARENA = 1
+SECTION_BONUSES = 2
+SECTION_DISRUPTIONS = 4
+SECTION_GAME_OVER = 8
+
+CHANGE_SMALL_MOVE = 1
+CHANGE_MOVE = 2
+CHANGE_HEALTH = 4
+CHANGE_FLAGS = 8
+CHANGE_RADIUS = 16
+CHANGE_TYPE = 32
+CHANGE_WIDE_GAP = 0x80  # écart sur 32 bits
+
+FLAG_SHIELD = 1
+FLAG_SPEED = 2
+FLAG_RAGE = 4
+
+POSITION_SCALE = 4   # quart de pixel
+RADIUS_SCALE = 8
+
+def quantize_position(value):
+    return max(-32768, min(32767, round(value * POSITION_SCALE)))
+
+def quantize_ball(ball):
+    """(type, x, y, vie, rayon, effets) quantifiés"""
+    flags = 0
+    if ball.shield_strength > 0:
+        flags |= FLAG_SHIELD
+    if ball.speed_boost_time > 0:
+        flags |= FLAG_SPEED
+    if ball.rage_time > 0:
+        flags |= FLAG_RAGE
+    return (BALL_TYPE_ORDER.index(ball.type), quantize_position(ball.x), quantize_position(ball.y),
+            max(0, min(255, round(ball.health / ball.max_health * 255))),
+            max(0, min(255, round(ball.radius * RADIUS_SCALE))), flags)
+
+def frame(payload):
+    return LENGTH.pack(len(payload)) + payload
+
+class StateEncoder:
+    """État quantifié du dernier tick publié; produit le delta de chaque tick et, à la demande, l'image clé"""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.tick = 0
+        self.elapsed = 0.0
+        self.ball_ids = {}
+        self.bonus_ids = {}
+        self.next_id = 0
+        self.balls = {}
+        self.bonuses = ()
+        self.disruptions = ()
+        self.arena_version = None
+        self.vertices = ()
+        self.game_over = False
+
+    def identify(self, objects, previous):
+        """Identifiants stables par objet (balle ou bonus) tant qu'il reste en jeu"""
+        ids = {}
+        for obj in objects:
+            ident = previous.get(obj)
+            if ident is None:
+                ident = self.next_id
+                self.next_id += 1
+            ids[obj] = ident
+        return ids
+
+    def capture(self, simulation):
+        """Enregistre l'état du tick et retourne le delta par rapport au tick précédent"""
+        base_tick = self.tick
+        self.tick += 1
+        self.elapsed = simulation.sim_clock.now - simulation.start_time
+
+        self.ball_ids = self.identify(simulation.balls, self.ball_ids)
+        balls = {self.ball_ids[ball]: quantize_ball(ball) for ball in simulation.balls}
+
+        self.bonus_ids = self.identify(simulation.bonuses, self.bonus_ids)
+        bonuses = tuple((self.bonus_ids[bonus], BONUS_TYPE_ORDER.index(bonus.type),
+                         quantize_position(bonus.x), quantize_position(bonus.y)) for bonus in simulation.bonuses)
+        disruptions = tuple((DISRUPTION_TYPES.index(disruption.type),
+                             min(65535, round((disruption.start_time + disruption.duration - simulation.start_time) * 10)))
+                            for disruption in simulation.disruptions)
+
+        sections = 0
+        arena = simulation.arena
+        if arena.version != self.arena_version:
+            self.arena_version = arena.version
+            self.vertices = tuple((quantize_position(wall[0][0]), quantize_position(wall[0][1])) for wall in arena.walls)
+            sections |= SECTION_ARENA
+        if bonuses != self.bonuses:
+            self.bonuses = bonuses
+            sections |= SECTION_BONUSES
+        if disruptions != self.disruptions:
+            self.disruptions = disruptions
+            sections |= SECTION_DISRUPTIONS
+        self.game_over = simulation.state != GameState.PLAYING
+        if self.game_over:
+            sections |= SECTION_GAME_OVER
+
+        parts = [FRAME_HEADER.pack(DELTA, self.tick, base_tick, self.elapsed, sections)]
+        self.pack_sections(parts, sections)
+
+        # Balles: retirées, ajoutées (complètes), modifiées (seulement les champs changés)
+        previous = self.balls
+        removed = [ident for ident in previous if ident not in balls]
+        added = []
+        changed = []
+        for ident in sorted(balls):
+            record = balls[ident]
+            old = previous.get(ident)
+            if old is None:
+                added.append(BALL_RECORD.pack(ident, *record))
+                continue
+            if old == record:
+                continue
+            mask = 0
+            fields = []
+            dx, dy = record[1] - old[1], record[2] - old[2]
+            if dx or dy:
+                if -128 <= dx <= 127 and -128 <= dy <= 127:
+                    mask |= CHANGE_SMALL_MOVE
+                    fields.append(SMALL_MOVE.pack(dx, dy))
+                else:
+                    mask |= CHANGE_MOVE
+                    fields.append(MOVE.pack(record[1], record[2]))
+            if record[3] != old[3]:
+                mask |= CHANGE_HEALTH
+                fields.append(BYTE.pack(record[3]))
+            if record[4] != old[4]:
+                mask |= CHANGE_RADIUS
+                fields.append(BYTE.pack(record[4]))
+            if record[5] != old[5]:
+                mask |= CHANGE_FLAGS
+                fields.append(BYTE.pack(record[5]))
+            if record[0] != old[0]:
+                mask |= CHANGE_TYPE
+                fields.append(BYTE.pack(record[0]))
+            changed.append((ident, mask, b"".join(fields)))
+        self.balls = balls
+
+        parts.append(DELTA_COUNTS.pack(len(removed), len(added), len(changed)))
+        parts.extend(BALL_ID.pack(ident) for ident in removed)
+        parts.extend(added)
+        last = 0
+        for ident, mask, fields in changed:
+            # Identifiants croissants: l'écart tient presque toujours sur 16 bits
+            gap = ident - last
+            last = ident
+            if gap > 0xFFFF:
+                parts.append(WIDE_CHANGE.pack(mask | CHANGE_WIDE_GAP, gap))
+            else:
+                parts.append(CHANGE.pack(mask, gap))
+            parts.append(fields)
+        return frame(b"".join(parts))
+
+    def pack_sections(self, parts, sections):
+        if sections & SECTION_ARENA:
+            parts.append(COUNT.pack(len(self.vertices)))
+            parts.extend(VERTEX.pack(*vertex) for vertex in self.vertices)
+        if sections & SECTION_BONUSES:
+            parts.append(COUNT.pack(len(self.bonuses)))
+            parts.extend(BONUS_RECORD.pack(*bonus) for bonus in self.bonuses)
+        if sections & SECTION_DISRUPTIONS:
+            parts.append(COUNT.pack(len(self.disruptions)))
+            parts.extend(DISRUPTION_RECORD.pack(*disruption) for disruption in self.disruptions)
+
+    def keyframe(self):
+        """Image clé du dernier tick capturé (tout l'état)"""
+        sections = SECTION_ARENA | SECTION_BONUSES | SECTION_DISRUPTIONS
+        if self.game_over:
+            sections |= SECTION_GAME_OVER
+        parts = [FRAME_HEADER.pack(KEYFRAME, self.tick, 0, self.elapsed, sections)]
+        self.pack_sections(parts, sections)
+        parts.append(COUNT.pack(len(self.balls)))
+        parts.extend(BALL_RECORD.pack(ident, *record) for ident, record in self.balls.items())
+        return frame(b"".join(parts))
+
+class StateDecoder:
+    """État reconstruit côté spectateur; un delta n'est appliqué que sur le tick dont il part"""
+    def __init__(self):
+        self.tick = None
+        self.elapsed = 0.0
+        self.balls = {}
+        self.bonuses = []
+        self.disruptions = []
+        self.vertices = []
+        self.arena_version = 0
+        self.game_over = False
+        self.keyframes = 0
+        self.deltas = 0
+        self.skipped = 0
+
+    def apply(self, payload):
+        kind, tick, base_tick, elapsed, sections = FRAME_HEADER.unpack_from(payload)
+        if kind == DELTA and base_tick != self.tick:
+            self.skipped += 1  # Chaîne rompue: attendre la prochaine image clé
+            return False
+        offset = FRAME_HEADER.size
+
+        if sections & SECTION_ARENA:
+            (count,), offset = COUNT.unpack_from(payload, offset), offset + COUNT.size
+            self.vertices = [VERTEX.unpack_from(payload, offset + i * VERTEX.size) for i in range(count)]
+            offset += count * VERTEX.size
+            self.arena_version += 1
+        if sections & SECTION_BONUSES:
+            (count,), offset = COUNT.unpack_from(payload, offset), offset + COUNT.size
+            self.bonuses = [BONUS_RECORD.unpack_from(payload, offset + i * BONUS_RECORD.size) for i in range(count)]
+            offset += count * BONUS_RECORD.size
+        if sections & SECTION_DISRUPTIONS:
+            (count,), offset = COUNT.unpack_from(payload, offset), offset + COUNT.size
+            self.disruptions = [DISRUPTION_RECORD.unpack_from(payload, offset + i * DISRUPTION_RECORD.size)
+                                for i in range(count)]
+            offset += count * DISRUPTION_RECORD.size
+        self.game_over = bool(sections & SECTION_GAME_OVER)
+
+        if kind == KEYFRAME:
+            (count,), offset = COUNT.unpack_from(payload, offset), offset + COUNT.size
+            self.balls = {}
+            for _ in range(count):
+                ident, *record = BALL_RECORD.unpack_from(payload, offset)
+                offset += BALL_RECORD.size
+                self.balls[ident] = record
+            self.keyframes += 1
+        else:
+            removed, added, changed = DELTA_COUNTS.unpack_from(payload, offset)
+            offset += DELTA_COUNTS.size
+            for _ in range(removed):
+                (ident,) = BALL_ID.unpack_from(payload, offset)
+                offset += BALL_ID.size
+                del self.balls[ident]
+            for _ in range(added):
+                ident, *record = BALL_RECORD.unpack_from(payload, offset)
+                offset += BALL_RECORD.size
+                self.balls[ident] = record
+            ident = 0
+            for _ in range(changed):
+                mask, gap = CHANGE.unpack_from(payload, offset)
+                if mask & CHANGE_WIDE_GAP:
+                    mask, gap = WIDE_CHANGE.unpack_from(payload, offset)
+                    offset += WIDE_CHANGE.size
+                else:
+                    offset += CHANGE.size
+                ident += gap
+                record = self.balls[ident]
+                if mask & CHANGE_SMALL_MOVE:
+                    dx, dy = SMALL_MOVE.unpack_from(payload, offset)
+                    offset += SMALL_MOVE.size
+                    record[1] += dx
+                    record[2] += dy
+                if mask & CHANGE_MOVE:
+                    record[1], record[2] = MOVE.unpack_from(payload, offset)
+                    offset += MOVE.size
+                if mask & CHANGE_HEALTH:
+                    (record[3],) = BYTE.unpack_from(payload, offset)
+                    offset += BYTE.size
+                if mask & CHANGE_RADIUS:
+                    (record[4],) = BYTE.unpack_from(payload, offset)
+                    offset += BYTE.size
+                if mask & CHANGE_FLAGS:
+                    (record[5],) = BYTE.unpack_from(payload, offset)
+                    offset += BYTE.size
+                if mask & CHANGE_TYPE:
+                    (record[0],) = BYTE.unpack_from(payload, offset)
+                    offset += BYTE.size
+            self.deltas += 1
+
+        self.tick = tick
+        self.elapsed = elapsed
+        return True
+
+class Subscriber:
+    def __init__(self, writer):
+        self.writer = writer
+        self.needs_keyframe = True
+        self.task = asyncio.current_task()
+        self.sent = 0
+        self.keyframes = 0
+        self.dropped = 0
+
+class SpectatorServer:
+    """Publie l'état d'une BattleSimulation à tous les spectateurs connectés, à chaque tick"""
+    def __init__(self, simulation, high_water=256 * 1024, low_water=32 * 1024):
+        self.simulation = simulation
+        self.encoder = StateEncoder()
+        self.subscribers = set()
+        self.high_water = high_water
+        self.low_water = low_water
+        self.server = None
+        self.bytes_sent = 0
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Ouvre la socket d'écoute; retourne le port (0: choisi par le système)"""
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            subscriber.writer.close()
+        # Laisser chaque connexion voir sa fermeture avant l'arrêt de la boucle
+        await asyncio.gather(*(subscriber.task for subscriber in subscribers), return_exceptions=True)
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    def hello(self):
+        sim_hz = round(1 / self.simulation.sim_dt)
+        return frame(HELLO.pack(MAGIC, VERSION, sim_hz, self.simulation.arena.center_x * 2,
+                                self.simulation.arena.center_y * 2))
+
+    async def handle_client(self, reader, writer):
+        subscriber = Subscriber(writer)
+        writer.write(self.hello())
+        self.subscribers.add(subscriber)
+        try:
+            # Les spectateurs n'envoient rien: la lecture ne sert qu'à détecter la déconnexion
+            while await reader.read(1024):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.subscribers.discard(subscriber)
+            writer.close()
+
+    def publish(self):
+        """À appeler après chaque tick: delta pour les clients à jour, image clé pour les autres"""
+        delta = self.encoder.capture(self.simulation)
+        keyframe = None
+        for subscriber in list(self.subscribers):
+            writer = subscriber.writer
+            if writer.is_closing():
+                self.subscribers.discard(subscriber)
+                continue
+            buffered = writer.transport.get_write_buffer_size()
+            if subscriber.needs_keyframe:
+                if buffered > self.low_water:
+                    subscriber.dropped += 1
+                    continue
+                if keyframe is None:
+                    keyframe = self.encoder.keyframe()
+                data = keyframe
+                subscriber.needs_keyframe = False
+                subscriber.keyframes += 1
+            elif buffered > self.high_water:
+                # Client trop lent: plus de deltas, il repartira d'une image clé
+                subscriber.needs_keyframe = True
+                subscriber.dropped += 1
+                continue
+            else:
+                data = delta
+            writer.write(data)
+            subscriber.sent += 1
+            self.bytes_sent += len(data)
+
+    def new_battle(self, config):
+        self.simulation.start_new_game(config)
+        self.encoder.reset()
+        # Nouveaux identifiants: tout le monde repart d'une image clé
+        for subscriber in self.subscribers:
+            subscriber.needs_keyframe = True
+
+    async def serve_battles(self, config, loop=False, speed=1.0, pause=3.0):
+        """Joue les batailles en temps réel (speed: accéléré) et publie chaque tick"""
+        clock = asyncio.get_running_loop()
+        seed = config.get('seed')
+        while True:
+            self.new_battle(dict(config, seed=seed))
+            dt = self.simulation.sim_dt
+            next_tick = clock.time()
+            while self.simulation.state == GameState.PLAYING:
+                self.simulation.step(dt)
+                self.publish()
+                next_tick += dt / speed
+                await asyncio.sleep(max(0.0, next_tick - clock.time()))
+            if not loop:
+                break
+            await asyncio.sleep(pause)
+            seed = None if seed is None else seed + 1
+
+async def read_message(reader):
+    (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    return await reader.readexactly(length)
+
+class SpectatorClient:
+    """Client mince: reçoit les trames et tient un StateDecoder à jour"""
+    def __init__(self):
+        self.decoder = StateDecoder()
+        self.reader = None
+        self.writer = None
+        self.sim_hz = None
+        self.size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.bytes_received = 0
+
+    async def connect(self, host="127.0.0.1", port=8765):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        magic, version, self.sim_hz, width, height = HELLO.unpack(await read_message(self.reader))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Flux de spectateur inconnu ou version non prise en charge")
+        self.size = (width, height)
+
+    async def receive(self):
+        """Lit et applique une trame; False si le serveur a fermé la connexion"""
+        try:
+            payload = await read_message(self.reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return False
+        self.bytes_received += LENGTH.size + len(payload)
+        self.decoder.apply(payload)
+        return True
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+class SpectatorView:
+    """Affichage de l'état reçu avec le code de dessin du jeu (Arena, Bonus.draw, Ball.draw)"""
+    def __init__(self, size):
+        self.clock = SimulationClock()
+        self.arena = Arena(*size)
+        self.arena_version = 0
+        self.rng = random.Random(0)  # Tirages de Ball.__init__, aussitôt écrasés
+        self.balls = {}
+        self.bonuses = {}
+
+    def sync(self, decoder):
+        self.clock.now = decoder.elapsed
+        if decoder.arena_version != self.arena_version and len(decoder.vertices) >= 3:
+            self.arena.set_custom_shape([(x / POSITION_SCALE, y / POSITION_SCALE) for x, y in decoder.vertices])
+            self.arena_version = decoder.arena_version
+
+        glow = (math.sin(decoder.elapsed * 5) + 1) * 0.5
+        balls = {}
+        for ident, (type_index, x, y, health, radius, flags) in decoder.balls.items():
+            ball = self.balls.get(ident)
+            if ball is None:
+                ball = Ball(x / POSITION_SCALE, y / POSITION_SCALE, BALL_TYPE_ORDER[type_index], self.clock, self.rng)
+            ball.prev_x = ball.x = x / POSITION_SCALE
+            ball.prev_y = ball.y = y / POSITION_SCALE
+            ball.health = health / 255 * ball.max_health
+            ball.radius = radius / RADIUS_SCALE
+            ball.shield_strength = 1 if flags & FLAG_SHIELD else 0
+            ball.speed_boost_time = 1 if flags & FLAG_SPEED else 0
+            ball.rage_time = 1 if flags & FLAG_RAGE else 0
+            ball.glow_intensity = glow
+            balls[ident] = ball
+        self.balls = balls
+
+        bonuses = {}
+        for ident, type_index, x, y in decoder.bonuses:
+            bonus = self.bonuses.get(ident)
+            if bonus is None:
+                bonus = Bonus(x / POSITION_SCALE, y / POSITION_SCALE, BONUS_TYPE_ORDER[type_index], self.clock)
+            bonuses[ident] = bonus
+        self.bonuses = bonuses
+
+    def draw(self, screen, decoder):
+        screen.fill((15, 15, 30))
+        self.arena.draw(screen)
+        for bonus in self.bonuses.values():
+            bonus.draw(screen)
+        for ball in self.balls.values():
+            ball.draw(screen)
+
+        text = render_text(f"SPECTATEUR  {decoder.elapsed:5.1f}s  {len(self.balls)} balles", 48, (255, 255, 255))
+        screen.blit(text, (30, 30))
+        for i, (type_index, end) in enumerate(decoder.disruptions):
+            name = DISRUPTION_NAMES[DISRUPTION_TYPES[type_index]]
+            remaining = max(0.0, end / 10 - decoder.elapsed)
+            text = render_text(f"{name} {remaining:.0f}s", 40, (255, 150, 150))
+            screen.blit(text, (30, 100 + i * 50))
+        if decoder.game_over:
+            text = render_text("FIN DE LA BATAILLE", 84, (255, 255, 100))
+            screen.blit(text, text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2)))
+
+async def watch(host, port):
+    client = SpectatorClient()
+    await client.connect(host, port)
+    pygame.init()
+    screen = pygame.display.set_mode(client.size)
+    pygame.display.set_caption("🔥 ARENA COMBAT - Spectateur 🔥")
+    view = SpectatorView(client.size)
+
+    async def receive_loop():
+        while await client.receive():
+            pass
+
+    receiver = asyncio.create_task(receive_loop())
+    running = True
+    try:
+        while running and not receiver.done():
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    running = False
+            if client.decoder.tick is not None:
+                view.sync(client.decoder)
+                view.draw(screen, client.decoder)
+            pygame.display.flip()
+            await asyncio.sleep(1 / FPS)
+    finally:
+        receiver.cancel()
+        client.close()
+        pygame.quit()
+
+async def serve(args):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    server = SpectatorServer(BattleSimulation())
+    port = await server.start(args.host, args.port)
+    print(f"Spectateurs: {args.host}:{port}", file=sys.stderr)
+    config = {
+        'ball_count': args.balls,
+        'game_duration': args.duration,
+        'disruption_interval': args.disruption_interval,
+        'bonus_spawn_interval': args.bonus_interval,
+        'arena_shape': args.shape,
+        'engine': args.engine,
+        'seed': args.seed
+    }
+    try:
+        await server.serve_battles(config, loop=args.loop, speed=args.speed)
+    finally:
+        await server.close()
+    print(f"{server.bytes_sent // 1024} Ko envoyés", file=sys.stderr)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Diffusion des batailles aux spectateurs (état quantifié par tick)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="jouer des batailles et les diffuser")
+    serve_parser.add_argument('--host', default="127.0.0.1")
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--loop', action='store_true', help="enchaîner les batailles")
+    serve_parser.add_argument('--speed', type=float, default=1.0)
+    serve_parser.add_argument('--balls', type=int, default=17)
+    serve_parser.add_argument('--shape', default="hexagon", choices=["hexagon", "octagon", "diamond"])
+    serve_parser.add_argument('--duration', type=float, default=60.0)
+    serve_parser.add_argument('--disruption-interval', type=float, default=12.0)
+    serve_parser.add_argument('--bonus-interval', type=float, default=8.0)
+    serve_parser.add_argument('--engine', default="objects", choices=["objects", "numpy"])
+    serve_parser.add_argument('--seed', type=int, default=None)
+
+    watch_parser = commands.add_parser("watch", help="regarder une bataille diffusée")
+    watch_parser.add_argument('--host', default="127.0.0.1")
+    watch_parser.add_argument('--port', type=int, default=8765)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "serve":
+        asyncio.run(serve(args))
+    else:
+        asyncio.run(watch(args.host, args.port))
@@ -0,0 +1,194 @@
+"""Tournoi d'équilibrage: lance des milliers de batailles sans affichage sur tous les coeurs.
+
+Chaque bataille terminée est écrite immédiatement dans un fichier JSON Lines,
+et seuls des compteurs agrégés restent en mémoire, quelle que soit la taille du balayage.
+
+    python3 tournament.py --battles 200 --ball-counts 9 17 25 --shapes hexagon diamond
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from Main import BallType, run_headless_battle
+
+TYPE_NAMES = [ball_type.value for ball_type in BallType]
+
+def wilson_interval(wins, total, z=1.96):
+    """Intervalle de confiance de Wilson pour une proportion"""
+    if total == 0:
+        return 0.0, 0.0
+    p = wins / total
+    denominator = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+def dominant_type(survivor_types):
+    """Type le plus représenté parmi les survivants, None en cas d'égalité ou sans survivant"""
+    if not survivor_types:
+        return None
+    best = max(survivor_types.values())
+    leaders = [name for name, count in survivor_types.items() if count == best]
+    if len(leaders) > 1:
+        return None
+    return leaders[0]
+
+def run_battle(task):
+    """Exécuté dans un processus de travail: une bataille complète"""
+    config_key, config = task
+    stats = run_headless_battle(config)
+    survivor_types = {ball_type.value: count for ball_type, count in stats['survivor_types'].items()}
+    return {
+        'config': config_key,
+        'seed': stats['seed'],
+        'survivors': stats['survivors'],
+        'survivor_types': survivor_types,
+        'winner': dominant_type(survivor_types),
+        'bonuses_collected': stats['bonuses_collected'],
+        'disruptions_triggered': stats['disruptions_triggered']
+    }
+
+class TournamentStats:
+    """Agrégats en continu par configuration, sans garder les batailles en mémoire"""
+    def __init__(self):
+        self.groups = {}
+
+    def add(self, record):
+        group = self.groups.get(record['config'])
+        if group is None:
+            group = {
+                'battles': 0,
+                'draws': 0,
+                'wins': {name: 0 for name in TYPE_NAMES},
+                'survivors': {name: 0 for name in TYPE_NAMES},
+                'total_survivors': 0,
+                'bonuses_collected': 0,
+                'disruptions_triggered': 0
+            }
+            self.groups[record['config']] = group
+
+        group['battles'] += 1
+        if record['winner'] is None:
+            group['draws'] += 1
+        else:
+            group['wins'][record['winner']] += 1
+        for name, count in record['survivor_types'].items():
+            group['survivors'][name] += count
+        group['total_survivors'] += record['survivors']
+        group['bonuses_collected'] += record['bonuses_collected']
+        group['disruptions_triggered'] += record['disruptions_triggered']
+
+    def summary(self):
+        result = {}
+        for config_key, group in self.groups.items():
+            battles = group['battles']
+            types = {}
+            for name in TYPE_NAMES:
+                wins = group['wins'][name]
+                low, high = wilson_interval(wins, battles)
+                types[name] = {
+                    'wins': wins,
+                    'win_rate': wins / battles,
+                    'ci95': [low, high],
+                    'mean_survivors': group['survivors'][name] / battles
+                }
+            result[config_key] = {
+                'battles': battles,
+                'draws': group['draws'],
+                'types': types,
+                'mean_survivors': group['total_survivors'] / battles,
+                'mean_bonuses_collected': group['bonuses_collected'] / battles,
+                'mean_disruptions_triggered': group['disruptions_triggered'] / battles
+            }
+        return result
+
+def config_key(config):
+    return "balls={ball_count} shape={arena_shape} disruption={disruption_interval:g}s bonus={bonus_spawn_interval:g}s".format(**config)
+
+def generate_tasks(args):
+    """Génère les batailles une par une (jamais toute la liste en mémoire)"""
+    sweep = itertools.product(args.ball_counts, args.shapes, args.disruption_intervals, args.bonus_intervals)
+    seed = args.seed
+    for ball_count, shape, disruption_interval, bonus_interval in sweep:
+        config = {
+            'ball_count': ball_count,
+            'game_duration': args.duration,
+            'disruption_interval': disruption_interval,
+            'bonus_spawn_interval': bonus_interval,
+            'arena_shape': shape,
+            'engine': args.engine
+        }
+        key = config_key(config)
+        for _ in range(args.battles):
+            battle_config = dict(config)
+            if seed is not None:
+                battle_config['seed'] = seed
+                seed += 1
+            yield key, battle_config
+
+def run_tournament(args):
+    stats = TournamentStats()
+    tasks = generate_tasks(args)
+    workers = args.workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+    finished = 0
+
+    with open(args.out, 'w') as out, ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for task in itertools.islice(tasks, max_in_flight):
+            pending.add(pool.submit(run_battle, task))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                record = future.result()
+                out.write(json.dumps(record) + "\n")
+                stats.add(record)
+                finished += 1
+            out.flush()
+
+            # Garder un nombre borné de batailles en vol
+            for task in itertools.islice(tasks, len(done)):
+                pending.add(pool.submit(run_battle, task))
+
+            if finished % 100 < len(done):
+                print(f"{finished} batailles terminées", file=sys.stderr)
+
+    return stats.summary()
+
+def print_summary(summary):
+    for config_key, group in summary.items():
+        print(f"\n{config_key}  ({group['battles']} batailles, {group['draws']} sans vainqueur)")
+        for name, info in sorted(group['types'].items(), key=lambda item: -item[1]['win_rate']):
+            low, high = info['ci95']
+            print(f"  {name:<10} {info['win_rate']*100:5.1f}%  [{low*100:5.1f}% - {high*100:5.1f}%]  "
+                  f"survivants moyens: {info['mean_survivors']:.2f}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tournoi d'équilibrage sans affichage")
+    parser.add_argument('--battles', type=int, default=100, help="batailles par configuration")
+    parser.add_argument('--ball-counts', type=int, nargs='+', default=[8])
+    parser.add_argument('--shapes', nargs='+', default=["hexagon"], choices=["hexagon", "octagon", "diamond"])
+    parser.add_argument('--disruption-intervals', type=float, nargs='+', default=[12.0])
+    parser.add_argument('--bonus-intervals', type=float, nargs='+', default=[8.0])
+    parser.add_argument('--duration', type=float, default=60.0, help="durée de chaque bataille (s)")
+    parser.add_argument('--seed', type=int, default=None, help="première graine (incrémentée à chaque bataille)")
+    parser.add_argument('--engine', default="objects", choices=["objects", "numpy"], help="moteur physique")
+    parser.add_argument('--workers', type=int, default=None, help="processus (défaut: tous les coeurs)")
+    parser.add_argument('--out', default="tournament_results.jsonl", help="résultats bruts, une bataille par ligne")
+    parser.add_argument('--summary', default="tournament_summary.json", help="taux de victoire agrégés")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    summary = run_tournament(args)
+    with open(args.summary, 'w') as f:
+        json.dump(summary, f, indent=2)
+    print_summary(summary)
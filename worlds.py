@@ -0,0 +1,374 @@
+"""Mode serveur: beaucoup de batailles simultanées (une par salon/stream) dans un même processus.
+
+Chaque monde est une BattleSimulation indépendante (arène, balles, horloge, hasard).
+WorldScheduler fait avancer les mondes en temps réel, un tick à la fois et à tour de rôle:
+chaque monde doit sim_hz ticks par seconde, sa dette est plafonnée (tick_budget) et le
+budget de temps d'une tournée est partagé équitablement. En surcharge, tous les mondes
+ralentissent de la même façon au lieu que certains s'arrêtent; ajouter ou retirer un monde
+ne crée ni rafale de rattrapage ni accélération des autres. WorldPool répartit les mondes
+sur plusieurs processus, chacun avec son propre WorldScheduler.
+
+    python3 worlds.py --worlds 200 --seconds 30 --workers 4 --churn
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from Main import MAX_CATCH_UP_STEPS, SCREEN_WIDTH, SCREEN_HEIGHT, BattleSimulation, GameState
+from tournament import dominant_type
+
+# Particules d'un monde sans affichage: personne ne les voit, le pool reste petit
+WORLD_PARTICLES = 2048
+
+class World:
+    """Une bataille sans affichage et sa comptabilité de ticks"""
+    def __init__(self, world_id, config, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.id = world_id
+        self.simulation = BattleSimulation(width, height, WORLD_PARTICLES)
+        self.simulation.start_new_game(config)
+        self.debt = 0.0        # Ticks dus (temps réel écoulé non simulé)
+        self.ticks = 0
+        self.tick_ms = 0.0     # Coût moyen d'un tick (moyenne glissante)
+        self.dropped = 0.0     # Ticks abandonnés quand la dette dépasse le budget (ralenti)
+
+    @property
+    def finished(self):
+        return self.simulation.state != GameState.PLAYING
+
+    def step(self):
+        start = time.perf_counter()
+        self.simulation.step(self.simulation.sim_dt)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.tick_ms += (elapsed - self.tick_ms) * 0.1
+        self.ticks += 1
+        self.debt -= 1
+        return elapsed
+
+    def result(self):
+        stats = self.simulation.game_stats
+        survivor_types = {ball_type.value: count for ball_type, count in stats['survivor_types'].items()}
+        return {
+            'world': self.id,
+            'seed': stats['seed'],
+            'ticks': self.ticks,
+            'dropped_ticks': round(self.dropped),
+            'survivors': stats['survivors'],
+            'survivor_types': survivor_types,
+            'winner': dominant_type(survivor_types)
+        }
+
+class WorldScheduler:
+    """Fait avancer des centaines de mondes en temps réel, à tour de rôle.
+
+    Une tournée (period secondes) crédite chaque monde du temps écoulé, plafonné à
+    tick_budget ticks, puis enchaîne des passes où chaque monde endetté fait un seul tick,
+    tant que le budget de temps de la tournée le permet. La tournée suivante reprend au
+    monde qui suit le dernier servi: aucun monde n'est toujours en tête ni toujours oublié.
+    """
+    def __init__(self, period=1 / 60, tick_budget=MAX_CATCH_UP_STEPS, clock=time.perf_counter):
+        self.period = period
+        self.tick_budget = tick_budget
+        self.clock = clock
+        self.worlds = {}
+        self.order = []
+        self.cursor = 0
+        self.last_round = None
+        self.finished = []
+        self.ticks = 0
+        self.busy = 0.0
+        self.ids = itertools.count()
+
+    def __len__(self):
+        return len(self.worlds)
+
+    def add(self, config, world_id=None, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        """Ajoute un monde; il ne doit rien pour le temps écoulé avant son arrivée"""
+        if world_id is None:
+            world_id = next(self.ids)
+        world = World(world_id, config, width, height)
+        self.worlds[world_id] = world
+        self.order.append(world)
+        return world
+
+    def remove(self, world_id):
+        world = self.worlds.pop(world_id, None)
+        if world is None:
+            return None
+        index = self.order.index(world)
+        del self.order[index]
+        if index < self.cursor:
+            self.cursor -= 1
+        return world
+
+    def run_round(self):
+        """Une tournée; retourne le nombre de ticks joués"""
+        now = self.clock()
+        elapsed = 0.0 if self.last_round is None else now - self.last_round
+        self.last_round = now
+        deadline = now + self.period
+
+        for world in self.order:
+            owed = world.debt + elapsed / world.simulation.sim_dt
+            if owed > self.tick_budget:
+                world.dropped += owed - self.tick_budget
+                owed = self.tick_budget
+            world.debt = owed
+
+        ticks = 0
+        count = len(self.order)
+        if count:
+            self.cursor %= count
+            served = None
+            pending = True
+            while pending and self.clock() < deadline:
+                pending = False
+                for offset in range(count):
+                    index = (self.cursor + offset) % count
+                    world = self.order[index]
+                    if world.debt < 1:
+                        continue
+                    world.step()
+                    ticks += 1
+                    served = index
+                    pending = True
+                    if self.clock() >= deadline:
+                        break
+            if served is not None:
+                self.cursor = served + 1
+
+        # Batailles terminées: résultat conservé, monde retiré
+        for world in [world for world in self.order if world.finished]:
+            self.remove(world.id)
+            self.finished.append(world.result())
+
+        self.ticks += ticks
+        self.busy += self.clock() - now
+        return ticks
+
+    def run(self, seconds, on_round=None):
+        """Tournées à la période fixée pendant seconds secondes (temps réel)"""
+        end = self.clock() + seconds
+        next_round = self.clock()
+        while self.clock() < end:
+            self.run_round()
+            if on_round:
+                on_round(self)
+            next_round += self.period
+            delay = next_round - self.clock()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_round = self.clock()  # En retard: pas de rafale pour rattraper
+
+    def lag(self):
+        """Dette moyenne en ticks (0: tous les mondes suivent le temps réel)"""
+        if not self.order:
+            return 0.0
+        return sum(world.debt for world in self.order) / len(self.order)
+
+def _worker(index, commands, events, period, tick_budget, report_every):
+    """Processus de travail: un WorldScheduler piloté par des commandes"""
+    scheduler = WorldScheduler(period, tick_budget)
+    last_report = time.perf_counter()
+    last_ticks = 0
+    running = True
+    while running:
+        # Commandes en attente (ajout, retrait, arrêt), sans bloquer la simulation
+        while True:
+            try:
+                command = commands.get_nowait() if scheduler.worlds else commands.get(timeout=period)
+            except queue.Empty:
+                break
+            if command[0] == 'add':
+                _, world_id, config = command
+                scheduler.add(config, world_id)
+            elif command[0] == 'remove':
+                scheduler.remove(command[1])
+            elif command[0] == 'stop':
+                running = False
+                break
+        if not running:
+            break
+
+        started = time.perf_counter()
+        scheduler.run_round()
+        for result in scheduler.finished:
+            events.put(('finished', result))
+        scheduler.finished = []
+
+        now = time.perf_counter()
+        if now - last_report >= report_every:
+            events.put(('load', index, len(scheduler), (scheduler.ticks - last_ticks) / (now - last_report),
+                        scheduler.lag()))
+            last_report, last_ticks = now, scheduler.ticks
+        delay = period - (now - started)
+        if delay > 0:
+            time.sleep(delay)
+    events.put(('stopped', index, scheduler.ticks))
+
+class WorldPool:
+    """Mondes répartis sur plusieurs processus (le moins chargé reçoit le nouveau monde)"""
+    def __init__(self, workers=None, period=1 / 60, tick_budget=MAX_CATCH_UP_STEPS, report_every=1.0):
+        workers = workers or os.cpu_count() or 1
+        self.events = multiprocessing.Queue()
+        self.commands = []
+        self.processes = []
+        self.placement = {}
+        self.loads = [0] * workers
+        self.ids = itertools.count()
+        for index in range(workers):
+            commands = multiprocessing.Queue()
+            process = multiprocessing.Process(target=_worker,
+                                              args=(index, commands, self.events, period, tick_budget, report_every),
+                                              daemon=True)
+            process.start()
+            self.commands.append(commands)
+            self.processes.append(process)
+
+    def add(self, config):
+        world_id = next(self.ids)
+        worker = min(range(len(self.loads)), key=self.loads.__getitem__)
+        self.commands[worker].put(('add', world_id, config))
+        self.placement[world_id] = worker
+        self.loads[worker] += 1
+        return world_id
+
+    def remove(self, world_id):
+        worker = self.placement.pop(world_id, None)
+        if worker is not None:
+            self.commands[worker].put(('remove', world_id))
+            self.loads[worker] -= 1
+
+    def poll(self, timeout=None):
+        """Événements des processus: ('finished', résultat) ou ('load', processus, mondes, ticks/s, retard)"""
+        events = []
+        try:
+            events.append(self.events.get(timeout=timeout))
+            while True:
+                events.append(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        for event in events:
+            if event[0] == 'finished':
+                worker = self.placement.pop(event[1]['world'], None)
+                if worker is not None:
+                    self.loads[worker] -= 1
+        return events
+
+    def close(self, timeout=1.0):
+        """Arrête les processus; retourne les derniers événements (résultats compris) reçus avant leur arrêt.
+        
+        La file est vidée jusqu'au ('stopped', ...) de chaque processus avant join: un processus
+        ne se termine pas tant que ses messages n'ont pas été lus.
+        """
+        for commands in self.commands:
+            commands.put(('stop',))
+        events = []
+        stopped = set()
+        while len(stopped) < len(self.processes):
+            batch = self.poll(timeout)
+            for event in batch:
+                if event[0] == 'stopped':
+                    stopped.add(event[1])
+            events.extend(batch)
+            if not batch and not any(process.is_alive() for index, process in enumerate(self.processes)
+                                     if index not in stopped):
+                break  # Processus disparus sans message: plus rien à attendre
+        for process in self.processes:
+            process.join()
+        return events
+
+def battle_config(args, seed):
+    return {
+        'ball_count': args.balls,
+        'game_duration': args.duration,
+        'disruption_interval': args.disruption_interval,
+        'bonus_spawn_interval': args.bonus_interval,
+        'arena_shape': args.shape,
+        'engine': args.engine,
+        'seed': seed
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serveur de batailles simultanées sans affichage")
+    parser.add_argument('--worlds', type=int, default=100, help="batailles simultanées")
+    parser.add_argument('--seconds', type=float, default=30.0, help="durée du service (temps réel)")
+    parser.add_argument('--workers', type=int, default=1, help="processus (1: tout dans ce processus)")
+    parser.add_argument('--churn', action='store_true', help="remplacer chaque bataille terminée par une nouvelle")
+    parser.add_argument('--balls', type=int, default=9)
+    parser.add_argument('--shape', default="hexagon", choices=["hexagon", "octagon", "diamond"])
+    parser.add_argument('--duration', type=float, default=60.0)
+    parser.add_argument('--disruption-interval', type=float, default=12.0)
+    parser.add_argument('--bonus-interval', type=float, default=8.0)
+    parser.add_argument('--engine', default="objects", choices=["objects", "numpy"])
+    parser.add_argument('--seed', type=int, default=1, help="première graine (une par bataille)")
+    parser.add_argument('--out', default=None, help="résultats des batailles terminées (JSON Lines)")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    seeds = itertools.count(args.seed)
+    out = open(args.out, 'w') if args.out else None
+    finished = 0
+
+    def record(result):
+        global finished
+        finished += 1
+        if out:
+            out.write(json.dumps(result) + "\n")
+
+    if args.workers <= 1:
+        scheduler = WorldScheduler()
+        for _ in range(args.worlds):
+            scheduler.add(battle_config(args, next(seeds)))
+        state = {'report': time.perf_counter(), 'ticks': 0}
+
+        def on_round(scheduler):
+            for result in scheduler.finished:
+                record(result)
+                if args.churn:
+                    scheduler.add(battle_config(args, next(seeds)))
+            scheduler.finished = []
+            now = time.perf_counter()
+            if now - state['report'] >= 1.0:
+                rate = (scheduler.ticks - state['ticks']) / (now - state['report'])
+                print(f"{len(scheduler)} mondes  {rate:8.0f} ticks/s  retard moyen {scheduler.lag():.2f} tick",
+                      file=sys.stderr)
+                state['report'], state['ticks'] = now, scheduler.ticks
+
+        scheduler.run(args.seconds, on_round)
+    else:
+        pool = WorldPool(args.workers)
+        for _ in range(args.worlds):
+            pool.add(battle_config(args, next(seeds)))
+        end = time.perf_counter() + args.seconds
+        next_report = time.perf_counter() + 1.0
+        loads = {}
+        while time.perf_counter() < end:
+            for event in pool.poll(timeout=0.2):
+                if event[0] == 'finished':
+                    record(event[1])
+                    if args.churn:
+                        pool.add(battle_config(args, next(seeds)))
+                elif event[0] == 'load':
+                    loads[event[1]] = event[2:]
+            if loads and time.perf_counter() >= next_report:
+                worlds = sum(load[0] for load in loads.values())
+                rate = sum(load[1] for load in loads.values())
+                print(f"{worlds} mondes sur {len(loads)} processus  {rate:8.0f} ticks/s", file=sys.stderr)
+                next_report += 1.0
+        for event in pool.close():
+            if event[0] == 'finished':
+                record(event[1])
+
+    if out:
+        out.close()
+    print(f"{finished} batailles terminées")